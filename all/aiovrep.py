@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# title           :aiovrep.py
+# description     :asyncio front-end for the remote api calls, to run observation, control and command dispatch of
+#                  several cars as coroutines in one thread instead of one thread per task
+# usage           :python3 aiovrep.py (demo against the fake simulator)
+# notes           :Python 3.5+ only (async/await), the rest of the package stays Python 2 compatible
+
+import asyncio
+import math
+import random
+
+import vrep
+from handles import get_registry
+from streaming import get_manager
+
+
+class AsyncVrep(object):
+    '''
+
+    This class wraps the remote api calls of a client for coroutines. Nothing in it blocks the event loop: commands
+    are sent in oneshot mode (the remote api thread sends them in the background), reads are requested in oneshot or
+    streaming mode and their replies are polled from the local input buffer, awaiting asyncio.sleep(period) between
+    two polls so that the other coroutines run meanwhile.
+
+    Streams are shared with the blocking code through the stream manager of the connection (see streaming.py), e.g.
+    an ImageSource grabbing its images from the same stream.
+
+    '''
+
+    def __init__(self, clientID, period=0.002):
+        self.ID = clientID
+        self.period = period # time between two polls of the input buffer in s
+        self.streams = get_manager(clientID)
+        self.handles = get_registry(clientID)
+
+    def send(self, function, *args):
+        '''
+
+        Sends a command without waiting for its reply, e.g. send(vrep.simxSetJointTargetVelocity, handle, 1.0)
+        :param function: remote api function, called with the client ID, args and simx_opmode_oneshot
+        :return: return code (simx_return_novalue_flag as the reply is not awaited)
+
+        '''
+        return function(self.ID, *args, vrep.simx_opmode_oneshot)
+
+    async def request(self, function, *args, timeout=5.0):
+        '''
+
+        Reads a value once: requests it in oneshot mode and awaits the reply in the input buffer
+        :param function: remote api getter, called with the client ID, args and the operation mode
+        :return: the result of the function, e.g. (return code, position) for simxGetObjectPosition
+
+        '''
+        result = function(self.ID, *args, vrep.simx_opmode_oneshot)
+        deadline = asyncio.get_event_loop().time() + timeout
+        while _code(result) & vrep.simx_return_novalue_flag:
+            if asyncio.get_event_loop().time() > deadline:
+                break
+            await asyncio.sleep(self.period)
+            result = function(self.ID, *args, vrep.simx_opmode_buffer)
+        # free the reply in the input buffer
+        function(self.ID, *args, vrep.simx_opmode_remove)
+        return result
+
+    async def handle(self, name):
+        '''
+
+        Returns the handle of an object (see handles.HandleRegistry), reading the scene without blocking on first use
+
+        '''
+        registry = self.handles
+        if not registry.loaded:
+            ret, handles, ints, floats, names = await self.request(vrep.simxGetObjectGroupDataArray,
+                                                                   vrep.sim_appobj_object_type, 0)
+            if ret == vrep.simx_return_ok:
+                registry.handles.update(zip(names, handles.tolist()))
+            registry.loaded = True
+        if name not in registry.handles:
+            ret, handle = await self.request(vrep.simxGetObjectHandle, name)
+            if ret != vrep.simx_return_ok:
+                return ret, handle
+            registry.handles[name] = handle
+        return vrep.simx_return_ok, registry.handles[name]
+
+    async def wait(self, keys, timeout=5.0):
+        '''
+
+        Awaits the first valid value of the given streams (see StreamManager.wait)
+        :return: True if all streams are ready, False on timeout
+
+        '''
+        deadline = asyncio.get_event_loop().time() + timeout
+        while True:
+            for key in keys:
+                if not self.streams.ready(key):
+                    self.streams.latest(key)
+            if all(self.streams.ready(key) for key in keys):
+                return True
+            if asyncio.get_event_loop().time() > deadline:
+                return False
+            await asyncio.sleep(self.period)
+
+    async def next(self, key, after=None, timeout=5.0):
+        '''
+
+        Awaits a value of a stream newer than the one with serial after
+        :param key: key of the stream (see StreamManager.subscribe)
+        :param after: serial of the last value processed (see StreamManager.serial), None for any valid value
+        :return: value, its serial (None, None on timeout)
+
+        '''
+        deadline = asyncio.get_event_loop().time() + timeout
+        while True:
+            ret, value = self.streams.latest(key)
+            serial = self.streams.serial(key)
+            if value is not None and (after is None or serial != after):
+                return value, serial
+            if asyncio.get_event_loop().time() > deadline:
+                return None, None
+            await asyncio.sleep(self.period)
+
+    async def pose(self, objecthandle, after=None):
+        '''
+
+        Awaits the next streamed position and orientation of an object
+        :return: (position, orientation), serial
+
+        '''
+        return await self.next(self.streams.subscribe_pose(objecthandle), after)
+
+    async def grab(self, source):
+        '''
+
+        Awaits the next image of an image source in vrep simulation (ImageSource, VrepObserver..) and grabs it, the
+        source reading it from the same stream without blocking
+        :return: result of source.grab_image()
+
+        '''
+        key = self.streams.subscribe_image(source.visionhandle, 1 if source.grayscale else 0)
+        await self.next(key, source.frameid)
+        return source.grab_image()
+
+
+def _code(result):
+    return result[0] if isinstance(result, tuple) else result
+
+
+async def drive_to(aio, carname, goal, speed=6.0, tolerance=0.1):
+    '''
+
+    Example controller coroutine: drives a car to a goal (x, y) in the scene with a proportional heading controller,
+    acting on every new pose of the car
+
+    '''
+    # joints are named like the car, before its suffix: 'Pioneer_p3dx_leftMotor#0' for 'Pioneer_p3dx#0'
+    name, sep, suffix = carname.partition('#')
+    _, car = await aio.handle(carname)
+    _, left = await aio.handle(name + '_leftMotor' + sep + suffix)
+    _, right = await aio.handle(name + '_rightMotor' + sep + suffix)
+    serial = None
+    position = None
+    while True:
+        pose, serial = await aio.pose(car, serial)
+        if serial is None:
+            break
+        position, orientation = pose
+        dx, dy = goal[0] - position[0], goal[1] - position[1]
+        if math.hypot(dx, dy) < tolerance:
+            break
+        error = math.atan2(dy, dx) - orientation[2]
+        error = math.atan2(math.sin(error), math.cos(error))
+        # slow down when close or facing away, so that the goal is never inside the turning circle
+        v = speed * min(1.0, 2.0 * math.hypot(dx, dy)) * max(0.0, math.cos(error))
+        w = 3.0 * error
+        aio.send(vrep.simxSetJointTargetVelocity, left, v - w)
+        aio.send(vrep.simxSetJointTargetVelocity, right, v + w)
+    aio.send(vrep.simxSetJointTargetVelocity, left, 0.0)
+    aio.send(vrep.simxSetJointTargetVelocity, right, 0.0)
+    return position and position[:2]
+
+
+if __name__ == '__main__':
+    # several cars driven to random goals concurrently, in one thread, against the fake simulator
+    import vrepfake
+    from client import VrepClient
+    vrep.useBackend('fake')
+    vrepfake.addSimulator(19999, vrepfake.FakeSimulator(cars=4, dt=0.01))
+    client = VrepClient()
+    ID = client.start()
+    aio = AsyncVrep(ID)
+    names = ['Pioneer_p3dx'] + ['Pioneer_p3dx#%d' % i for i in range(3)]
+    goals = [(random.uniform(-1.5, 1.5), random.uniform(-1.5, 1.5)) for name in names]
+    loop = asyncio.get_event_loop()
+    reached = loop.run_until_complete(asyncio.gather(*[drive_to(aio, n, g) for n, g in zip(names, goals)]))
+    for name, goal, position in zip(names, goals, reached):
+        print (name, 'goal', goal, 'reached', position)
+    client.stop()
@@ -0,0 +1,460 @@
+#!/usr/bin/env python
+# title           :benchmark.py
+# description     :Measures the per-frame cost of the image acquisition and processing stages
+# usage           :python benchmark.py
+# notes           :needs no simulator, frames are synthetic
+
+import ctypes as ct
+import time
+
+import cv2
+import numpy as np
+
+import instrumentation
+import vrep
+import vrepfake
+from car import VrepCar
+from client import VrepClient
+from frames import vrep_to_bgr
+from observerv2 import ImageSource, Observer
+from segmentation import HAVE_COMPONENTS, MaskFilter, find_blobs, label_blobs, largest_blob, ndimage
+
+RESOLUTIONS = [(640, 480), (1024, 768), (1920, 1080)] # (width, height) of the vision sensor
+
+
+def timeit(fn, repeat=100):
+    '''
+
+    Calls fn repeat times (after one warm up call) and returns the average time per call in milliseconds
+
+    '''
+    fn()
+    start = time.time()
+    for i in range(repeat):
+        fn()
+    return (time.time() - start) * 1000.0 / repeat
+
+
+def bench_frame_conversion():
+    '''
+
+    Compares the ways of turning a vision sensor image (rgb, bottom-left origin) into a bgr image with top-left origin
+
+    '''
+    print ('--- vision sensor image -> bgr frame (ms per frame) ---')
+    for w, h in RESOLUTIONS:
+        raw = np.random.randint(0, 256, (h, w, 3)).astype(np.uint8)
+        c_image = (ct.c_ubyte * raw.size).from_buffer_copy(raw.tobytes())
+        out = np.empty_like(raw)
+        scratch = np.empty_like(raw)
+
+        def list_path():
+            # what simxGetVisionSensorImage + grab_image did before: per pixel list, np.array, resize, flip, cvtColor
+            image = [None] * raw.size
+            for i in range(raw.size):
+                image[i] = c_image[i]
+            img = np.array(image, dtype='uint8')
+            img.resize([h, w, 3])
+            return cv2.cvtColor(cv2.flip(img, 0), cv2.COLOR_RGB2BGR)
+
+        def copy_path():
+            # array from the buffer, then np.array, flip and cvtColor, each allocating a new frame
+            return cv2.cvtColor(cv2.flip(np.array(raw), 0), cv2.COLOR_RGB2BGR)
+
+        def pooled_path():
+            return vrep_to_bgr(raw, out, scratch)
+
+        def numpy_fused_path():
+            np.copyto(out, raw[::-1, :, ::-1])
+            return out
+
+        def view_path():
+            out[...] = raw
+            return vrep_to_bgr(out)
+
+        print ('%4dx%-4d list: %8.2f  copies: %6.3f  pooled: %6.3f  numpy one pass: %6.3f  memcpy+view: %6.3f'
+               % (w, h, timeit(list_path, repeat=1), timeit(copy_path), timeit(pooled_path),
+                  timeit(numpy_fused_path), timeit(view_path)))
+
+
+def bench_noisy_masks(noise=(0, 100, 1000, 5000)):
+    '''
+
+    Segments masks holding a car blob and a growing number of noise blobs (as under lighting changes) with the
+    contour loop the observers used before, with find_blobs on contours, with find_blobs on connected components,
+    with the labelling of scipy used with OpenCV 2.4 and with the mask filter of the observers, which picks contours
+    or connected components per frame (see segmentation.COMPONENTS_CROSSOVER)
+
+    '''
+    print ('--- segmentation of noisy masks ---')
+    rng = np.random.RandomState(0)
+
+    def contour_loop(mask):
+        conts = cv2.findContours(mask.copy(), cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_NONE)[-2]
+        areas = np.array([cv2.contourArea(c) for c in conts])
+        centers = []
+        for c in conts:
+            x, y, w, h = cv2.boundingRect(c)
+            centers.append((x + w / 2, y + h / 2))
+        return centers[np.argmax(areas)]
+
+    for n in noise:
+        mask = np.zeros((480, 640), dtype=np.uint8)
+        mask[rng.randint(0, 480, n), rng.randint(0, 640, n)] = 255
+        mask = cv2.dilate(mask, np.ones((2, 2), dtype=np.uint8))
+        mask[200:240, 300:360] = 255
+        line = '%5d noise blobs: contour loop %7.3f ms, find_blobs contours %7.3f ms' % (
+            n, timeit(lambda: contour_loop(mask), 20), timeit(lambda: largest_blob(find_blobs(mask, False)[0]), 20))
+        if HAVE_COMPONENTS:
+            line += ', find_blobs components %7.3f ms' % timeit(lambda: largest_blob(find_blobs(mask, True)[0]), 20)
+        if ndimage is not None:
+            line += ', scipy labelling %7.3f ms' % timeit(lambda: largest_blob(label_blobs(mask)[0]), 20)
+        maskfilter = MaskFilter()
+        line += ', mask filter %7.3f ms' % timeit(lambda: largest_blob(maskfilter.find_blobs(mask)[0]), 20)
+        print (line)
+
+
+def make_subtractor(kind):
+    '''
+
+    Returns the background subtractor of the observers available with the running OpenCV: 'MOG2' as in observer.py
+    (history=2, varThreshold=2, with shadows), 'MOG' as in observerv1.py and observerv2.py. From OpenCV 3.0 on, MOG
+    is only part of the contrib modules, without them MOG2 with its default parameters is returned instead
+    :return: subtractor, description of the subtractor
+
+    '''
+    legacy = not hasattr(cv2, 'createBackgroundSubtractorMOG2') # OpenCV 2.4
+    if kind == 'MOG2':
+        if legacy:
+            return cv2.BackgroundSubtractorMOG2(history=2, varThreshold=2, bShadowDetection=True), 'MOG2'
+        return cv2.createBackgroundSubtractorMOG2(history=2, varThreshold=2, detectShadows=True), 'MOG2'
+    if legacy:
+        return cv2.BackgroundSubtractorMOG(), 'MOG'
+    if hasattr(cv2, 'bgsegm'):
+        return cv2.bgsegm.createBackgroundSubtractorMOG(), 'MOG'
+    return cv2.createBackgroundSubtractorMOG2(), 'MOG2 (no MOG)'
+
+
+def bench_mask_allocations(frames=50):
+    '''
+
+    Measures the allocations per frame of the whole segmentation stage of the observers after a warm up frame
+    (background subtraction, mask filters, blob detection): the former stage with new arrays per step, and the mask
+    filters of observer.py (threshold, hole filling) and observerv2.py (closing) with their work buffers. It counts
+    the different buffers the masks of the frames are in and, with Python 3, the peak memory allocated (tracemalloc,
+    which traces numpy arrays)
+
+    '''
+    try:
+        import tracemalloc
+    except ImportError:
+        tracemalloc = None # Python 2
+    print ('--- allocations of the segmentation stage ---')
+    rng = np.random.RandomState(0)
+    background = rng.randint(0, 256, (480, 640, 3)).astype(np.uint8)
+    images = []
+    for i in range(4):
+        img = background.copy()
+        img[200:240, 300 + 4 * i:360 + 4 * i] = (0, 0, 255) # car
+        img[215:225, 320 + 4 * i:330 + 4 * i] = background[215:225, 320:330] # hole
+        images.append(img)
+
+    def former(fgbg, img):
+        mask = fgbg.apply(img, learningRate=0.1)
+        _, thresh = cv2.threshold(mask, 100, 255, cv2.THRESH_BINARY)
+        im_floodfill = thresh.copy()
+        mask_floodfill = np.zeros((thresh.shape[0] + 2, thresh.shape[1] + 2), np.uint8)
+        cv2.floodFill(im_floodfill, mask_floodfill, (0, 0), 255)
+        finalmask = cv2.bitwise_or(thresh.copy(), cv2.bitwise_not(im_floodfill)).copy()
+        find_blobs(finalmask)
+        return mask, finalmask
+
+    def stage(maskfilter):
+        def run(fgbg, img):
+            mask = maskfilter.subtract(fgbg, img, 0, 0.1)
+            finalmask = maskfilter.apply(mask)
+            maskfilter.find_blobs(finalmask)
+            return mask, finalmask
+        return run
+
+    stages = [('former stage', 'MOG2', former),
+              ('observer.py filter', 'MOG2', stage(MaskFilter(threshold=100, fillholes=True))),
+              ('observerv2.py filter', 'MOG', stage(MaskFilter(kernel=(3, 3), iterations=2)))]
+    for name, kind, run in stages:
+        fgbg, subtractor = make_subtractor(kind)
+        run(fgbg, background)
+        # the masks are kept, so that the memory of a freed mask cannot be handed out again for the next one
+        masks = [run(fgbg, images[i % len(images)]) for i in range(frames)]
+        buffers = len(set(id(m.base if m.base is not None else m) for pair in masks for m in pair))
+        del masks
+        line = '%-21s %-13s %7.3f ms per frame, %3d mask buffers over %d frames' % (
+            name, subtractor, timeit(lambda: run(fgbg, images[0]), 20), buffers, frames)
+        if tracemalloc is not None:
+            tracemalloc.start()
+            for i in range(frames):
+                run(fgbg, images[i % len(images)])
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            # a mask is 307200 bytes, the rest are the blob arrays and the small python objects returned by the cv2
+            # calls
+            line += ', peak memory allocated %8d bytes' % peak
+        print (line)
+
+
+def bench_closed_loop(frames=200):
+    '''
+
+    Runs the whole loop (image acquisition, observer, car command) against the in-process fake simulator, which
+    advances one time step per image read, and reports the end to end throughput
+
+    '''
+    print ('--- closed loop against the fake simulator ---')
+    vrep.useBackend('fake')
+    vrepfake.addSimulator(19999, vrepfake.FakeSimulator(realtime=False))
+    client = VrepClient()
+    ID = client.start()
+    pioneer = VrepCar(clientID=ID, leftjoint_name='Pioneer_p3dx_leftMotor', rightjoint_name='Pioneer_p3dx_rightMotor')
+    source = ImageSource('simulation', ID=ID, visionsensor_name='Vision_sensor')
+    obs = Observer()
+    source.grab_image()
+
+    def acquisition():
+        source.grab_image()
+        pioneer.command((1, 1.2))
+
+    def closed_loop():
+        obs.get_position(source.grab_image(), source.frameid)
+        pioneer.command((1, 1.2))
+
+    print ('acquisition + command: %6.3f ms per frame' % timeit(acquisition, repeat=frames))
+    print ('acquisition + observer + command: %6.3f ms per frame' % timeit(closed_loop, repeat=frames))
+    # grey images: one byte per pixel from the vision sensor, single channel background model
+    source.grayscale = True
+    obs = Observer()
+    print ('grey acquisition + command: %6.3f ms per frame' % timeit(acquisition, repeat=frames))
+    print ('grey acquisition + observer + command: %6.3f ms per frame' % timeit(closed_loop, repeat=frames))
+    client.stop()
+    vrep.useBackend('remote')
+
+
+def bench_lockstep(frames=200):
+    '''
+
+    Runs the closed loop in synchronous mode against the fake simulator, one simulation step per frame, and checks
+    that simulated time advanced by exactly one time step per frame
+
+    '''
+    print ('--- lockstep closed loop against the fake simulator ---')
+    vrep.useBackend('fake')
+    vrepfake.addSimulator(19998, vrepfake.FakeSimulator(realtime=True))
+    client = VrepClient(port=19998, synchronous=True)
+    ID = client.start()
+    pioneer = VrepCar(clientID=ID, leftjoint_name='Pioneer_p3dx_leftMotor', rightjoint_name='Pioneer_p3dx_rightMotor')
+    source = ImageSource('simulation', ID=ID, visionsensor_name='Vision_sensor')
+    obs = Observer()
+    source.grab_image()
+    start = client.step()
+
+    def closed_loop():
+        client.step()
+        obs.get_position(source.grab_image(), source.frameid)
+        pioneer.command((1, 1.2))
+
+    print ('step + acquisition + observer + command: %6.3f ms per frame' % timeit(closed_loop, repeat=frames))
+    print ('simulated time per frame: %6.3f ms' % ((client.step() - start) / (frames + 2.0)))
+    client.stop()
+    vrep.useBackend('remote')
+
+
+def bench_duplicate_frames(polls=200):
+    '''
+
+    Polls a real time fake simulator much faster than it renders and compares the cost of a poll returning an image
+    processed already with the cost of a fresh one
+
+    '''
+    print ('--- polling faster than the simulator renders ---')
+    vrep.useBackend('fake')
+    vrepfake.addSimulator(19996, vrepfake.FakeSimulator(realtime=True, dt=0.05))
+    client = VrepClient(port=19996)
+    ID = client.start()
+    # the car drives, images of a scene at rest are all the same image
+    car = VrepCar(ID, 'Pioneer_p3dx_leftMotor', 'Pioneer_p3dx_rightMotor')
+    car.command((1.0, 2.0))
+    source = ImageSource('simulation', ID=ID, visionsensor_name='Vision_sensor')
+    obs = Observer()
+    fresh = [0.0, 0] # time spent on fresh images in s, number of fresh images
+    stale = [0.0, 0]
+    for i in range(polls):
+        start = time.time()
+        previous = source.frameid
+        obs.get_position(source.grab_image(), source.frameid)
+        counter = fresh if source.frameid != previous else stale
+        counter[0] += time.time() - start
+        counter[1] += 1
+        time.sleep(0.002)
+    print ('%d fresh images: %6.3f ms per poll, %d stale polls: %6.3f ms per poll'
+           % (fresh[1], fresh[0] * 1000.0 / max(fresh[1], 1), stale[1], stale[0] * 1000.0 / max(stale[1], 1)))
+    client.stop()
+    vrep.useBackend('remote')
+
+
+def bench_server_blobs(frames=200):
+    '''
+
+    Tracks a car driving in circles with the blobs detected on the server (see blobs.BlobSource) and with the images,
+    and compares the payload per frame, the time per frame and the positions found
+
+    '''
+    print ('--- server side blob detection vs images ---')
+    vrep.useBackend('fake')
+    sim = vrepfake.FakeSimulator(realtime=False)
+    vrepfake.addSimulator(19995, sim)
+    client = VrepClient(port=19995)
+    ID = client.start()
+    car = VrepCar(ID, 'Pioneer_p3dx_leftMotor', 'Pioneer_p3dx_rightMotor')
+    car.command((1.0, 2.0))
+    source = ImageSource('simulation', ID=ID, visionsensor_name='Vision_sensor')
+    obs = Observer()
+    blobobs = Observer()
+    blobobs.serverblobs = True
+    blobobs.set_blobsource(source)
+    streams = client.streams
+    start = time.time()
+    for i in range(frames):
+        obs.get_position(source.grab_image(), source.frameid)
+    imagetime = (time.time() - start) / frames
+    imagebytes = streams.latest(streams.subscribe_image(source.visionhandle))[1].nbytes
+    start = time.time()
+    error = 0.0
+    for i in range(frames):
+        position, found = blobobs.get_position()
+        x, y = sim.poses[0, :2] * sim.ppm
+        error = max(error, np.hypot(position[0] - (x + 320), position[1] - (240 - y)))
+    blobtime = (time.time() - start) / frames
+    detectionstate, packets = streams.latest(streams.subscribe_vision(source.visionhandle))[1]
+    blobbytes = sum(packet.nbytes for packet in packets)
+    print ('images: %8d bytes, %6.3f ms per frame' % (imagebytes, imagetime * 1000.0))
+    print ('blobs:  %8d bytes, %6.3f ms per frame, largest position error %.1f px' % (blobbytes, blobtime * 1000.0,
+                                                                                     error))
+    client.stop()
+    vrep.useBackend('remote')
+
+
+def bench_roi_tracking(frames=200):
+    '''
+
+    Tracks a car driving in circles with the observer searching full frames and in roi tracking mode (see
+    tracking.RoiTracker), and compares the observer time per frame and the positions found with the true ones
+
+    '''
+    print ('--- full frame vs roi tracking ---')
+    vrep.useBackend('fake')
+    for roitracking in (False, True):
+        sim = vrepfake.FakeSimulator(realtime=False)
+        vrepfake.addSimulator(19994, sim)
+        client = VrepClient(port=19994)
+        ID = client.start()
+        car = VrepCar(ID, 'Pioneer_p3dx_leftMotor', 'Pioneer_p3dx_rightMotor')
+        car.command((2.0, 3.0))
+        source = ImageSource('simulation', ID=ID, visionsensor_name='Vision_sensor')
+        obs = Observer()
+        obs.roitracking = roitracking
+        times = []
+        errors = []
+        for i in range(frames):
+            img = source.grab_image()
+            start = time.time()
+            position, found = obs.get_position(img, source.frameid)
+            times.append(time.time() - start)
+            if found and i >= frames // 4:
+                x, y = sim.poses[0, :2] * sim.ppm
+                errors.append(np.hypot(position[0] - (x + 320), position[1] - (240 - y)))
+        # the median is the steady state, the mean includes the full frame searches
+        print ('%-11s observer %6.3f ms per frame (median %6.3f ms), found in %d of %d frames, median position '
+               'error %.1f px' % ('roi:' if roitracking else 'full frame:', np.mean(times) * 1000.0,
+                                  np.median(times) * 1000.0, len(errors), frames - frames // 4,
+                                  np.median(errors) if errors else np.nan))
+        client.stop()
+    vrep.useBackend('remote')
+
+
+def bench_pyramid(frames=100, resolutions=((640, 480), (1280, 960)), levels=(0, 1, 2)):
+    '''
+
+    Tracks a car driving in circles with the observer at full resolution and in pyramid mode (background subtraction
+    and blob detection on downscaled images), at several vision sensor resolutions
+
+    '''
+    print ('--- pyramid detection ---')
+    vrep.useBackend('fake')
+    for resolution in resolutions:
+        for pyramidlevels in levels:
+            sim = vrepfake.FakeSimulator(resolution=resolution, realtime=False)
+            vrepfake.addSimulator(19992, sim)
+            client = VrepClient(port=19992)
+            ID = client.start()
+            car = VrepCar(ID, 'Pioneer_p3dx_leftMotor', 'Pioneer_p3dx_rightMotor')
+            car.command((2.0, 3.0))
+            source = ImageSource('simulation', ID=ID, visionsensor_name='Vision_sensor')
+            obs = Observer()
+            obs.pyramidlevels = pyramidlevels
+            times = []
+            errors = []
+            for i in range(frames):
+                img = source.grab_image()
+                start = time.time()
+                position, found = obs.get_position(img, source.frameid)
+                times.append(time.time() - start)
+                if found and i >= frames // 4:
+                    x, y = sim.poses[0, :2] * sim.ppm
+                    errors.append(np.hypot(position[0] - (x + resolution[0] / 2.0),
+                                           position[1] - (resolution[1] / 2.0 - y)))
+            print ('%4dx%-4d %d levels: observer %7.3f ms per frame, found in %d of %d frames, median position error '
+                   '%.1f px' % (resolution[0], resolution[1], pyramidlevels, np.median(times) * 1000.0, len(errors),
+                                frames - frames // 4, np.median(errors) if errors else np.nan))
+            client.stop()
+    vrep.useBackend('remote')
+
+
+def profile_calls(frames=200):
+    '''
+
+    Runs the closed loop against the fake simulator with the remote api instrumentation enabled, prints where the
+    time goes per function and the overhead of the instrumentation
+
+    '''
+    print ('--- remote api calls of the closed loop against the fake simulator ---')
+    vrep.useBackend('fake')
+    vrepfake.addSimulator(19997, vrepfake.FakeSimulator(realtime=False))
+    client = VrepClient(port=19997)
+    ID = client.start()
+    pioneer = VrepCar(clientID=ID, leftjoint_name='Pioneer_p3dx_leftMotor', rightjoint_name='Pioneer_p3dx_rightMotor')
+    source = ImageSource('simulation', ID=ID, visionsensor_name='Vision_sensor')
+    source.grab_image()
+
+    def acquisition():
+        source.grab_image()
+        pioneer.command((1, 1.2))
+
+    plain = timeit(acquisition, repeat=frames)
+    stats = instrumentation.enable(messages=True)
+    instrumented = timeit(acquisition, repeat=frames)
+    instrumentation.disable()
+    print (stats.summary())
+    print ('acquisition + command: %6.3f ms per frame, %6.3f ms instrumented' % (plain, instrumented))
+    client.stop()
+    vrep.useBackend('remote')
+
+
+if __name__ == '__main__':
+    bench_frame_conversion()
+    bench_noisy_masks()
+    bench_mask_allocations()
+    bench_closed_loop()
+    bench_lockstep()
+    bench_duplicate_frames()
+    bench_server_blobs()
+    bench_roi_tracking()
+    bench_pyramid()
+    profile_calls()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+
+import numpy as np
+
+import vrep
+from streaming import get_manager
+
+BLOBVALUES = 6 # values per blob: size, orientation, position x, position y, width, height
+
+
+def parse_blobs(packet):
+    '''
+
+    Splits the packet of auxiliary values of a blob detection filter into one row per blob
+    :param packet: float array: blob count, values per blob, then the values of every blob
+    :return: float32 array of shape (blob count, 6): relative size, orientation in rad, relative position x and y
+    (origin at the bottom left of the image), relative width and height
+
+    '''
+    if len(packet) < 2:
+        return np.zeros((0, BLOBVALUES), dtype=np.float32)
+    n, k = int(packet[0]), int(packet[1])
+    return np.asarray(packet[2:2 + n * k], dtype=np.float32).reshape(n, k)[:, :BLOBVALUES]
+
+
+class BlobSource(object):
+    '''
+
+    This class acquires the blobs found by a blob detection filter of a vision sensor in vrep simulation. The filter
+    runs on the server, on every image the vision sensor renders, and only its results (a few floats per blob) are
+    streamed to the client with simxReadVisionSensor instead of the image.
+
+    The filter is part of the scene: the filters of the vision sensor (e.g. 'Original image to work image', a colour
+    selection or threshold on the work image, then 'Blob detection on work image') cannot be set with the remote api.
+    The packet of the blob detection filter is packet 1 when it is the only filter returning values, packet 0 holds
+    the image statistics every vision sensor returns.
+
+    '''
+
+    def __init__(self, clientID, sensorhandle, packet=1):
+        self.ID = clientID
+        self.visionhandle = sensorhandle
+        self.packet = packet # index of the packet of auxiliary values holding the blobs
+        self.blobs = np.zeros((0, BLOBVALUES), dtype=np.float32) # blobs of the last read, see parse_blobs
+        self.frameid = None # serial of the blobs in their stream (see streaming.StreamManager.serial)
+        self.axis = None # orientation of the major axis of the largest blob in degrees w.r.t. +X axis in the image (-90 to 90)
+        _, w = vrep.simxGetObjectIntParameter(self.ID, sensorhandle, vrep.sim_visionintparam_resolution_x,
+                                              vrep.simx_opmode_oneshot_wait)
+        _, h = vrep.simxGetObjectIntParameter(self.ID, sensorhandle, vrep.sim_visionintparam_resolution_y,
+                                              vrep.simx_opmode_oneshot_wait)
+        self.resolution = (w, h) # resolution of the vision sensor, to convert relative values to pixels
+
+    def get_blobs(self):
+        '''
+
+        Returns the blobs of the latest image of the vision sensor, waiting for the first one to arrive
+        :return: float32 array of shape (blob count, 6), see parse_blobs
+
+        '''
+        streams = get_manager(self.ID)
+        key = streams.subscribe_vision(self.visionhandle)
+        streams.wait([key]) # returns right away once the first result has arrived
+        err, value = streams.latest(key)
+        if err != vrep.simx_return_ok:
+            print ('Blobs not acquired from vision sensor')
+        if value is None or streams.serial(key) == self.frameid:
+            return self.blobs
+        self.frameid = streams.serial(key)
+        detectionstate, packets = value
+        if len(packets) > self.packet:
+            self.blobs = parse_blobs(packets[self.packet])
+        else:
+            self.blobs = parse_blobs([])
+        return self.blobs
+
+    def get_position(self, minarea=20):
+        '''
+
+        Returns the position of the largest blob in pixels, in the image co-ordinates of the observers (origin at the
+        top left corner)
+        :param minarea: blobs smaller than minarea pixels are noise
+        :return: position (x,y) co-ordinate (None if there is no blob), found
+
+        '''
+        blobs = self.get_blobs()
+        w, h = self.resolution
+        areas = blobs[:, 0] * (w * h)
+        if not np.any(areas >= minarea):
+            return None, False
+        largest = blobs[np.argmax(areas)]
+        # the blob orientation is anticlockwise with the image y axis upwards
+        self.axis = -np.degrees(largest[1])
+        return (int(largest[2] * w), int((1.0 - largest[3]) * h)), True
@@ -1,6 +1,8 @@
 #!/usr/bin/env python
 
 import vrep
+from client import batch
+from handles import get_registry
 
 class Car(object):
     '''
@@ -41,34 +43,37 @@ class VrepCar(Car):
         self.leftjoint = leftjoint_name #name of the left joint of corresponding mobile car in vrep
         self.rightjoint = rightjoint_name #name of the left joint of corresponding mobile car in vrep
 
-        #leftjointhandle, rightjointhandle are left and right joint handles (references) to mobile car respectively
-        _, self.leftjointhandle = vrep.simxGetObjectHandle(self.ID, self.leftjoint, vrep.simx_opmode_oneshot_wait)
-        _, self.rightjointhandle = vrep.simxGetObjectHandle(self.ID, self.rightjoint,
-                                                            vrep.simx_opmode_oneshot_wait)
+        #leftjointhandle, rightjointhandle are left and right joint handles (references) to mobile car respectively,
+        #from the handle registry of the connection (all names of the scene are read in one round trip)
+        handles = get_registry(self.ID)
+        _, self.leftjointhandle = handles.get(self.leftjoint)
+        _, self.rightjointhandle = handles.get(self.rightjoint)
 
     def command(self, u):
         '''
 
-        This function sends command to wheeled robot in vrep
+        This function sends command to wheeled robot in vrep. Both joint targets are sent without waiting for the
+        reply, in one packet (see client.batch), hence they are applied in the same simulation step. Commands of
+        several cars issued inside a common 'with client.batch():' block share that packet.
         :param u: u is control command to left wheel and right wheel as a tuple. u[0]=leftwheel, u[1]=rightwheel
         :return: None
 
         '''
-        vrep.simxSetJointTargetVelocity(self.ID, self.leftjointhandle, u[0], vrep.simx_opmode_oneshot_wait)
-        vrep.simxSetJointTargetVelocity(self.ID, self.rightjointhandle, u[1], vrep.simx_opmode_oneshot_wait)
+        with batch(self.ID):
+            vrep.simxSetJointTargetVelocity(self.ID, self.leftjointhandle, u[0], vrep.simx_opmode_oneshot)
+            vrep.simxSetJointTargetVelocity(self.ID, self.rightjointhandle, u[1], vrep.simx_opmode_oneshot)
 
 
     def command_v_w(self, v, w):
         '''
 
-        This function allows to implement commands as a differential drive.
+        This function allows to implement commands as a differential drive, sent like command()
         :param v: linear command
         :param w: angular command
         :return: None
 
         '''
-        vrep.simxSetJointTargetVelocity(self.ID, self.leftjointhandle, v-w, vrep.simx_opmode_oneshot_wait)
-        vrep.simxSetJointTargetVelocity(self.ID, self.rightjointhandle, v+w, vrep.simx_opmode_oneshot_wait)
+        self.command((v-w, v+w))
 
 
 class RealCar(Car):
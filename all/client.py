@@ -1,6 +1,45 @@
 #!/usr/bin/env python
 
+import threading
+import time
+from contextlib import contextmanager
+
 import vrep
+from handles import get_registry, registries
+from pacing import Pacer
+from streaming import get_manager, managers
+
+pauses = {} # clientID -> nesting depth of batch()
+pauseslock = threading.Lock() # guards pauses, batch() may be entered from several threads
+
+
+@contextmanager
+def batch(clientID):
+    '''
+
+    Context manager grouping the commands sent inside the with block into a single packet: communication with the
+    server is paused (simxPauseCommunication) on entry and resumed on exit, so that all commands queued in between
+    reach the server, and take effect, in the same simulation step. Blocks may be nested, communication is resumed
+    when the outermost one exits. Only non-blocking operation modes (oneshot, streaming, buffer) may be used inside.
+    The pause applies to the whole connection: blocks of several threads nest as well, and a blocking call of
+    another thread meanwhile waits until communication is resumed.
+    :param clientID: ID of the connection
+
+    '''
+    with pauseslock:
+        depth = pauses.get(clientID, 0)
+        if depth == 0:
+            vrep.simxPauseCommunication(clientID, True)
+        pauses[clientID] = depth + 1
+    try:
+        yield
+    finally:
+        with pauseslock:
+            pauses[clientID] -= 1
+            if pauses[clientID] == 0:
+                del pauses[clientID]
+                vrep.simxPauseCommunication(clientID, False)
+
 
 class Client(object):
 
@@ -17,8 +56,17 @@ class VrepClient(Client):
     port=19999
 
 
-    def __init__(self):
+    def __init__(self, IP=None, port=None, synchronous=False):
         super(VrepClient, self).__init__()
+        if IP is not None:
+            self.IP = IP # address of the server, defaults to the class attribute
+        if port is not None:
+            self.port = port # port of the remote api server of the simulator instance
+        self.synchronous = synchronous # lockstep mode: the simulation only advances by one step on every step()
+        self.dt = None # simulation time step in s, read on start
+        self.streams = None # StreamManager of the connection, streamed reads are served from the local buffer
+        self.pacer = None # Pacer of the control loop in free-running mode, see tick()
+        self.handles = None # HandleRegistry of the connection, resolves object names to handles
 
 
     def start(self):
@@ -28,6 +76,16 @@ class VrepClient(Client):
         self.ID=vrep.simxStart(self.IP, self.port, True, True, 5000, 5)
         if self.ID != -1:
             print ('Connected to V-REP server')
+            self.streams = get_manager(self.ID)
+            self.handles = get_registry(self.ID)
+            if self.synchronous:
+                vrep.simxSynchronous(self.ID, True)
+                # streams waiting for their first reply have to step the simulation to get it
+                self.streams.step = self.step
+            _, self.dt = vrep.simxGetFloatingParameter(self.ID, vrep.sim_floatparam_simulation_time_step,
+                                                       vrep.simx_opmode_oneshot_wait)
+            self.pacer = Pacer(self.ID, self.dt)
+            self.pacer.ping()
             _ = vrep.simxStartSimulation(clientID=self.ID, operationMode=vrep.simx_opmode_oneshot_wait)
             if _ == vrep.simx_return_ok:
                 print ('Simulation started..')
@@ -44,4 +102,51 @@ class VrepClient(Client):
         if _ == vrep.simx_return_ok:
             print ('Simulation stopped')
         _ = vrep.simxFinish(self.ID)
+        managers.pop(self.ID, None)
+        registries.pop(self.ID, None)
+        self.streams = None
+        self.handles = None
+        self.pacer = None
+
+
+    def step(self):
+
+        '''Executes one simulation step in synchronous mode and returns once it is done, i.e. once the replies of the
+        streamed reads for this step (e.g. the matching image) are in the local buffer. Returns the simulation time
+        of the step in ms'''
+
+        vrep.simxSynchronousTrigger(self.ID)
+        # the ping round trip only completes after the server has processed the trigger and executed the step
+        vrep.simxGetPingTime(self.ID)
+        return vrep.simxGetLastCmdTime(self.ID)
+
+
+    def wait(self, seconds):
+
+        '''Lets the simulation run for the given time: executes the matching number of steps in synchronous mode,
+        sleeps otherwise'''
+
+        if self.synchronous:
+            for i in range(max(1, int(round(seconds / self.dt)))):
+                self.step()
+        else:
+            time.sleep(seconds)
+
+
+    def tick(self):
+
+        '''Paces a control loop to the simulation: returns once the next simulation step is available, stepping it in
+        synchronous mode and waiting for it otherwise (see Pacer, needs a streamed read such as the image). Calling
+        it once per iteration processes every frame exactly once'''
+
+        if self.synchronous:
+            self.step()
+        elif not self.pacer.wait():
+            print ('No new simulation step, is any data streamed?')
+
+
+    def batch(self):
+
+        '''Returns a context manager sending the commands issued inside the with block in one packet, see batch()'''
 
+        return batch(self.ID)
\ No newline at end of file
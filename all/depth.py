@@ -0,0 +1,168 @@
+#!/usr/bin/env python
+
+import numpy as np
+
+import vrep
+from streaming import get_manager
+
+
+class DepthProjector(object):
+    '''
+
+    This class projects depth buffers of a perspective vision sensor in vrep into point clouds, expressed in the
+    vision sensor frame (as in vrep: z along the viewing direction, x decreasing from the left to the right column
+    of the image, y increasing from the bottom to the top row).
+
+    The vrep depth buffer holds values in [0, 1] between the near and far clipping planes and the perspective angle
+    applies to the larger image dimension. The ray through every pixel only depends on the resolution, hence the rays
+    are computed once per resolution and cached, pre-scaled with the clipping planes, so that a point cloud costs a
+    single multiply-add per frame.
+
+    '''
+
+    def __init__(self, perspective_angle, near, far):
+        self.perspective_angle = perspective_angle # perspective angle of the vision sensor in radians
+        self.near = near # near clipping plane in m
+        self.far = far # far clipping plane in m
+        self.rays = {} # (scale, offset) ray tables of shape (h*w, 3), cached per resolution (w, h)
+
+    def get_rays(self, resolution):
+        '''
+
+        Returns the ray tables for the given resolution, computing them on first use.
+        A point is scale * depthvalue + offset, where scale = (far-near) * ray and offset = near * ray
+        :param resolution: (w, h) of the depth buffer
+        :return: scale, offset, float32 arrays of shape (h*w, 3)
+
+        '''
+        resolution = tuple(resolution)
+        if resolution not in self.rays:
+            w, h = resolution
+            t = np.tan(self.perspective_angle / 2.0)
+            if w >= h:
+                tx, ty = t, t * h / float(w)
+            else:
+                tx, ty = t * w / float(h), t
+            # ray through the pixel centers at unit depth (z=1)
+            x = tx * (1.0 - (2.0 * np.arange(w) + 1.0) / w)
+            y = ty * ((2.0 * np.arange(h) + 1.0) / h - 1.0)
+            ray = np.empty((h, w, 3), dtype=np.float32)
+            ray[:, :, 0] = x[np.newaxis, :]
+            ray[:, :, 1] = y[:, np.newaxis]
+            ray[:, :, 2] = 1.0
+            ray = ray.reshape(-1, 3)
+            self.rays[resolution] = ((self.far - self.near) * ray, self.near * ray)
+        return self.rays[resolution]
+
+    def project(self, depth, out=None):
+        '''
+
+        Projects a depth buffer into a point cloud
+        :param depth: float32 array of shape (h, w), as returned by vrep.simxGetVisionSensorDepthBufferArray
+        :param out: optional float32 array of shape (h*w, 3) receiving the points
+        :return: points, float32 array of shape (h*w, 3), one row per pixel in depth buffer order
+
+        '''
+        h, w = depth.shape
+        scale, offset = self.get_rays((w, h))
+        if out is None:
+            out = np.empty(scale.shape, dtype=np.float32)
+        np.multiply(depth.reshape(-1, 1), scale, out)
+        out += offset
+        return out
+
+
+class DepthSource(object):
+    '''
+
+    This class acquires depth buffers from a vision sensor in vrep simulation and turns them into point clouds,
+    e.g. for obstacle detection alongside the rgb tracking of the observer using the same vision sensor.
+
+    '''
+
+    def __init__(self, clientID, visionhandle):
+        self.ID = clientID
+        self.visionhandle = visionhandle
+        self.depth = None # last acquired depth buffer, values in [0, 1], first row is the bottom of the image
+        self.points = None # last point cloud, (h*w, 3) in the vision sensor frame
+        # perspective angle and clipping planes of the vision sensor
+        _, angle = vrep.simxGetObjectFloatParameter(self.ID, self.visionhandle,
+                                                    vrep.sim_visionfloatparam_perspective_angle,
+                                                    vrep.simx_opmode_oneshot_wait)
+        _, near = vrep.simxGetObjectFloatParameter(self.ID, self.visionhandle,
+                                                   vrep.sim_visionfloatparam_near_clipping,
+                                                   vrep.simx_opmode_oneshot_wait)
+        _, far = vrep.simxGetObjectFloatParameter(self.ID, self.visionhandle,
+                                                  vrep.sim_visionfloatparam_far_clipping,
+                                                  vrep.simx_opmode_oneshot_wait)
+        self.projector = DepthProjector(angle, near, far)
+
+    def grab_depth(self):
+        '''
+
+        Acquires a depth buffer from the vision sensor and updates the attribute depth
+        :return: depth buffer, float32 array of shape (h, w)
+
+        '''
+        streams = get_manager(self.ID)
+        key = streams.subscribe_depth(self.visionhandle)
+        streams.wait([key]) # returns right away once the first depth buffer has arrived
+        err, depth = streams.latest(key)
+        if err != vrep.simx_return_ok or depth is None:
+            print ('Depth buffer not acquired from vision sensor')
+            return self.depth
+        if self.depth is None or self.depth.shape != depth.shape:
+            self.depth = np.empty(depth.shape, dtype=np.float32)
+        self.depth[...] = depth
+        return self.depth
+
+    def get_pointcloud(self):
+        '''
+
+        Acquires a depth buffer and projects it into a point cloud
+        :return: points, float32 array of shape (h*w, 3) in the vision sensor frame
+
+        '''
+        depth = self.grab_depth()
+        if depth is None:
+            return None
+        if self.points is None or self.points.shape[0] != depth.size:
+            self.points = np.empty((depth.size, 3), dtype=np.float32)
+        return self.projector.project(depth, out=self.points)
+
+    def get_obstacles(self, maxdistance):
+        '''
+
+        Returns the points of a freshly acquired point cloud that are closer to the vision sensor (along its
+        viewing direction) than maxdistance, e.g. anything standing on the floor for a top-down sensor
+        :param maxdistance: distance in m, typically a bit less than the distance between sensor and floor
+        :return: points, float32 array of shape (N, 3) in the vision sensor frame
+
+        '''
+        points = self.get_pointcloud()
+        if points is None:
+            return np.zeros((0, 3), dtype=np.float32)
+        return points[points[:, 2] < maxdistance]
+
+
+class DepthObstacles(object):
+    '''
+
+    This class adds obstacle detection from the depth buffer to an image source of vrep simulation (ImageSource,
+    VrepObserver..), which provides the attributes ID and visionhandle of its vision sensor and the attribute
+    depthsource (None until the DepthSource of the vision sensor is created on first use).
+
+    '''
+
+    def get_obstacles(self, maxdistance):
+        '''
+
+        Returns the points seen by the vision sensor which are closer to it than maxdistance, from the depth buffer
+        of the same vision sensor (see DepthSource.get_obstacles). Only for images from vrep simulation.
+        :param maxdistance: distance in m along the viewing direction of the vision sensor
+        :return: points, array of shape (N, 3) in the vision sensor frame
+
+        '''
+        if self.depthsource is None:
+            self.depthsource = DepthSource(self.ID, self.visionhandle)
+        return self.depthsource.get_obstacles(maxdistance)
@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+
+import cv2
+import numpy as np
+
+
+class FramePool(object):
+    '''
+
+    This class keeps a small ring of preallocated frame buffers which an image source rotates through, so that
+    acquiring frames at steady state allocates no memory. All buffers are (re)allocated only when the requested
+    shape or dtype changes. A frame handed out by get() is not overwritten before 'size' further calls, hence
+    'size' must be larger than the number of frames a caller holds on to at a time.
+
+    '''
+
+    def __init__(self, size=3):
+        self.size = size # number of buffers in the ring
+        self.buffers = [] # preallocated buffers, allocated on first use
+        self.index = 0 # index of the buffer handed out by the next call to get()
+
+    def get(self, shape, dtype=np.uint8):
+        '''
+
+        Returns the next buffer of the ring, allocating the ring if it does not match shape and dtype
+        :param shape: shape of the frame, tuple
+        :param dtype: numpy dtype of the frame
+        :return: numpy array (uninitialised content)
+
+        '''
+        shape = tuple(shape)
+        if len(self.buffers) == 0 or self.buffers[0].shape != shape or self.buffers[0].dtype != dtype:
+            self.buffers = [np.empty(shape, dtype=dtype) for i in range(self.size)]
+            self.index = 0
+        buf = self.buffers[self.index]
+        self.index = (self.index + 1) % self.size
+        return buf
+
+
+def vrep_to_bgr(image, out=None, scratch=None):
+    '''
+
+    Converts an image as delivered by a V-REP vision sensor (rgb, first row is the bottom of the image) into a
+    bgr image with top-left origin.
+
+    Without out, a strided view on image is returned: no pixel is touched, but the result is not contiguous and
+    only suits consumers which accept that (numpy yes, OpenCV no). With out, the contiguous result is written into
+    out by cv2.flip followed by cv2.cvtColor, using scratch as intermediate buffer if given. A single numpy copy
+    through the strided view would touch every pixel only once, but it is about ten times slower than the two
+    vectorised OpenCV passes (see benchmark.py).
+
+    :param image: rgb image of shape (h, w, 3), bottom-left origin
+    :param out: optional contiguous uint8 array of the same shape receiving the result
+    :param scratch: optional uint8 array of the same shape used for the intermediate flipped image
+    :return: bgr image with top-left origin
+
+    '''
+    if out is None:
+        return image[::-1, :, ::-1]
+    flipped = cv2.flip(image, 0, scratch)
+    return cv2.cvtColor(flipped, cv2.COLOR_RGB2BGR, out)
+
+
+def vrep_to_gray(image, out=None):
+    '''
+
+    Converts a grey image as delivered by a V-REP vision sensor with options=1 (one byte per pixel, first row is the
+    bottom of the image) into a single channel image with top-left origin. Only the rows are flipped, there is no
+    colour conversion. Without out, a strided view on image is returned (see vrep_to_bgr).
+
+    :param image: grey image of shape (h, w, 1) or (h, w), bottom-left origin
+    :param out: optional contiguous uint8 array of shape (h, w) receiving the result
+    :return: grey image of shape (h, w) with top-left origin
+
+    '''
+    image = image.reshape(image.shape[0], image.shape[1])
+    if out is None:
+        return image[::-1]
+    return cv2.flip(image, 0, out)
+
+
+def bgr_to_vrep(image, out=None, scratch=None):
+    '''
+
+    Converts a bgr (or single channel grey) image with top-left origin into the layout of V-REP vision sensor
+    images (rgb, first row is the bottom of the image), e.g. to set it with vrep.simxSetVisionSensorImage. Flipping
+    the rows and swapping the channels are their own inverse, hence this is vrep_to_bgr (or vrep_to_gray) the other
+    way round.
+
+    :param image: bgr image of shape (h, w, 3) or grey image of shape (h, w), top-left origin
+    :param out: optional contiguous uint8 array of the same shape receiving the result
+    :param scratch: optional uint8 array of the same shape used for the intermediate flipped image
+    :return: image in vision sensor layout
+
+    '''
+    if image.ndim == 2:
+        return vrep_to_gray(image, out)
+    return vrep_to_bgr(image, out, scratch)
@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+
+import vrep
+
+
+class HandleRegistry(object):
+    '''
+
+    This class resolves object names of the vrep scene to handles. On first use, the names and handles of all objects
+    of the scene are read in a single call of simxGetObjectGroupData (all scene objects, data type 0: object names),
+    one round trip however many cars, joints and sensors are looked up, and kept for the session. Names not found
+    in the scene read (e.g. objects added to the scene since) are resolved one by one with simxGetObjectHandle.
+
+    Use get_registry to obtain the registry of a client, so that all objects sharing a connection share it.
+
+    '''
+
+    def __init__(self, clientID):
+        self.ID = clientID
+        self.handles = {} # object name -> handle
+        self.loaded = False # True once the scene has been read
+
+    def load(self):
+        '''
+
+        Reads the names and handles of all objects of the scene
+        :return: return code of simxGetObjectGroupData
+
+        '''
+        ret, handles, ints, floats, names = vrep.simxGetObjectGroupDataArray(self.ID, vrep.sim_appobj_object_type, 0,
+                                                                            vrep.simx_opmode_oneshot_wait)
+        if ret == vrep.simx_return_ok:
+            self.handles.update(zip(names, handles.tolist()))
+        # if the bulk read failed, names are resolved one by one
+        self.loaded = True
+        return ret
+
+    def get(self, name):
+        '''
+
+        Returns the handle of an object, like simxGetObjectHandle
+        :param name: name of the object in the scene
+        :return: return code, handle
+
+        '''
+        if not self.loaded:
+            self.load()
+        if name not in self.handles:
+            ret, handle = vrep.simxGetObjectHandle(self.ID, name, vrep.simx_opmode_oneshot_wait)
+            if ret != vrep.simx_return_ok:
+                return ret, handle
+            self.handles[name] = handle
+        return vrep.simx_return_ok, self.handles[name]
+
+    def invalidate(self):
+        '''
+
+        Forgets all handles, e.g. after the scene was changed, they are read again on next use
+
+        '''
+        self.handles = {}
+        self.loaded = False
+
+
+registries = {} # clientID -> HandleRegistry
+
+
+def get_registry(clientID):
+    '''
+
+    Returns the handle registry of a client, created on first use
+
+    '''
+    if clientID not in registries:
+        registries[clientID] = HandleRegistry(clientID)
+    return registries[clientID]
@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+
+import vrep
+from frames import FramePool, vrep_to_bgr, vrep_to_gray
+from streaming import get_manager
+
+
+class ImageReader(object):
+    '''
+
+    This class adds image acquisition into preallocated buffers to an image source (ImageSource, Observer,
+    VrepObserver..). setup_images() creates its attributes. A camera or video file is read from the attribute cap, the
+    vision sensor of vrep simulation from the attributes ID and visionhandle.
+
+    '''
+
+    def setup_images(self):
+        '''
+
+        Sets the attributes of the acquired image, the buffers it is written into and the acquisition options
+
+        '''
+        self.img = None # last acquired image
+        self.frameid = None # id of the current image: serial of the vision sensor image in its stream (see streaming.StreamManager.serial), else a frame counter
+        self.framepool = FramePool() # buffers for the bgr images returned by grab_image
+        self.rgbpool = FramePool(size=1) # buffer for the flipped rgb image, intermediate result of grab_image
+        self.contiguous = True # if False, simulation images are returned as strided views (see frames.vrep_to_bgr)
+        self.grayscale = False # if True, simulation images are acquired with one byte per pixel (vision sensor options=1)
+        self.imagekey = None # key of the image stream read by grab_image, see streaming.StreamManager
+
+    def read_capture(self):
+        '''
+
+        Reads the next frame of a camera or video file into the next buffer of the frame pool (once the frame size
+        is known), updates the attributes img and frameid
+        :return: a bgr image
+
+        '''
+        frame = None
+        if self.img is not None:
+            frame = self.framepool.get(self.img.shape)
+        _, self.img = self.cap.read(frame)
+        # print error msg if image not acquired
+        if _ != True:
+            print ('Image not acquired from image source')
+        else:
+            self.frameid = 0 if self.frameid is None else self.frameid + 1
+        return self.img
+
+    def read_simulation(self):
+        '''
+
+        Reads the latest image of the vision sensor from its stream, updates the attribute frameid
+        :return: the image as returned by vrep (rgb, bottom-left origin), a view on the remote api buffer which must be
+        consumed right away. None if there is no new image: the image is not available, or it is the image read last
+        time (polled faster than the simulator renders) and self.img is converted already
+
+        '''
+
+        # the image is read from the input buffer of its stream, waiting for the first one to arrive instead of
+        # sleeping a fixed time
+        streams = get_manager(self.ID)
+        key = streams.subscribe_image(self.visionhandle, 1 if self.grayscale else 0)
+        if key != self.imagekey:
+            # grayscale was switched: the stream of the other mode is stopped on the server, and its last image must
+            # not be taken for an image of the new stream with the same simulation time
+            if self.imagekey is not None:
+                streams.unsubscribe(self.imagekey)
+            self.imagekey = key
+            self.frameid = None
+        streams.wait([key]) # returns right away once the first image has arrived
+        err, img_rgb = streams.latest(key)
+        # print error msg if image not acquired
+        if err != vrep.simx_return_ok:
+            print ('Image not acquired from image source')
+        if img_rgb is None:
+            return None
+        if self.img is not None and streams.serial(key) == self.frameid:
+            return None
+        self.frameid = streams.serial(key)
+        return img_rgb
+
+    def convert_simulation(self, img_rgb):
+        '''
+
+        Converts an image read by read_simulation into a bgr image with top-left origin (grey with grayscale), in
+        preallocated buffers of the frame pools, and updates the attribute img
+        :param img_rgb: image as returned by vrep
+        :return: a bgr image, a strided view if contiguous is False (see frames.vrep_to_bgr)
+
+        '''
+        if self.grayscale:
+            # one byte per pixel, only the rows are flipped
+            self.img = vrep_to_gray(img_rgb, self.framepool.get(img_rgb.shape[:2]))
+        elif self.contiguous:
+            self.img = vrep_to_bgr(img_rgb, self.framepool.get(img_rgb.shape), self.rgbpool.get(img_rgb.shape))
+        else:
+            # copy out of the remote api buffer (plain memcpy) and keep a strided bgr view on the copy
+            raw = self.framepool.get(img_rgb.shape)
+            raw[...] = img_rgb
+            self.img = vrep_to_bgr(raw)
+        return self.img
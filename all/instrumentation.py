@@ -0,0 +1,224 @@
+#!/usr/bin/env python
+
+import inspect
+import json
+import time
+
+import numpy as np
+
+import vrep
+
+BINS = 32 # latency histogram bins, bin b holds calls which took less than 2**b microseconds (and at least 2**(b-1))
+NOCODE = ('simxFinish', 'simxGetLastCmdTime', 'simxGetConnectionId') # functions not returning a return code
+EXCLUDED = ('simxGetInMessageInfo', 'simxGetOutMessageInfo') # used by the instrumentation itself
+
+
+class CallStats(object):
+    '''
+
+    This class accumulates the statistics of one remote api function: number of calls, return codes, wall clock
+    latency histogram and estimated payload sizes (bytes of the arguments sent and of the values returned)
+
+    '''
+
+    def __init__(self, name):
+        self.name = name
+        self.count = 0 # number of calls
+        self.returncodes = {} # return code -> number of calls
+        self.histogram = [0] * BINS # number of calls per log2 latency bin in microseconds
+        self.totaltime = 0.0 # total wall clock time in s
+        self.maxtime = 0.0 # longest call in s
+        self.bytesout = 0 # estimated payload of the arguments in bytes
+        self.bytesin = 0 # estimated payload of the returned values in bytes
+        self.messages = 0 # messages sent to the server during the calls (if message info is recorded)
+
+    def add(self, latency, code, bytesout, bytesin):
+        self.count += 1
+        self.totaltime += latency
+        if latency > self.maxtime:
+            self.maxtime = latency
+        self.histogram[min(int(latency * 1e6).bit_length(), BINS - 1)] += 1
+        self.returncodes[code] = self.returncodes.get(code, 0) + 1
+        self.bytesout += bytesout
+        self.bytesin += bytesin
+
+    def percentile(self, q):
+        '''
+
+        Returns an upper bound of the q-th percentile of the latency in s, from the histogram
+
+        '''
+        if self.count == 0:
+            return 0.0
+        rank = np.searchsorted(np.cumsum(self.histogram), q / 100.0 * self.count)
+        return min(2 ** rank * 1e-6, self.maxtime)
+
+    def errors(self):
+        # the novalue flag alone is no error: non-blocking commands do not wait for replies, buffers may be empty
+        ok = (None, vrep.simx_return_ok, vrep.simx_return_novalue_flag)
+        return sum(n for code, n in self.returncodes.items() if code not in ok)
+
+    def todict(self):
+        return {'count': self.count, 'returncodes': dict((str(c), n) for c, n in self.returncodes.items()),
+                'histogram_us_log2': list(self.histogram), 'totaltime': self.totaltime, 'maxtime': self.maxtime,
+                'bytesout': self.bytesout, 'bytesin': self.bytesin, 'messages': self.messages}
+
+
+class Instrumentation(object):
+    '''
+
+    This class records statistics of every simx* function of vrep.py called while it is enabled. Enabling it
+    replaces the functions in the vrep module by timing wrappers, disabling it puts the originals back, hence there
+    is no overhead at all when it is disabled. Enable it after selecting the backend (vrep.useBackend).
+
+    With messages=True the number of messages sent to the server during every call is recorded as well, from the
+    message ids of simxGetOutMessageInfo (the remote api does not expose the size of the messages, the byte counts
+    are estimates of the payload from the arguments and returned values). With period, a summary is printed every
+    period seconds from the instrumented calls.
+
+    '''
+
+    def __init__(self, messages=False, period=None):
+        self.messages = messages
+        self.period = period # time between two printed summaries in s, None for no periodic summary
+        self.stats = {} # function name -> CallStats
+        self.originals = {} # function name -> original function
+        self.wrappers = {} # function name -> wrapper installed in vrep
+        self.lastsummary = time.time()
+
+    def enable(self):
+        for name in dir(vrep):
+            function = getattr(vrep, name)
+            if not name.startswith('simx') or name in EXCLUDED or not inspect.isfunction(function):
+                continue
+            self.originals[name] = function
+            self.wrappers[name] = self.wrap(name, function)
+            setattr(vrep, name, self.wrappers[name])
+        self.lastsummary = time.time()
+
+    def disable(self):
+        for name, function in self.originals.items():
+            # leave functions replaced meanwhile (e.g. by vrep.useBackend) alone
+            if getattr(vrep, name) is self.wrappers[name]:
+                setattr(vrep, name, function)
+        self.originals = {}
+        self.wrappers = {}
+
+    def wrap(self, name, function):
+        stats = self.stats.setdefault(name, CallStats(name))
+        hasclient = _arguments(function)[:1] == ['clientID']
+        returnscode = hasclient and name not in NOCODE
+        messages = self.messages and hasclient
+        getmessageid = vrep.simxGetOutMessageInfo
+
+        def wrapper(*args, **kwargs):
+            if messages:
+                clientID = args[0] if args else kwargs['clientID']
+                ret, firstid = getmessageid(clientID, vrep.simx_headeroffset_message_id)
+            start = time.time()
+            result = function(*args, **kwargs)
+            end = time.time()
+            if messages:
+                ret2, lastid = getmessageid(clientID, vrep.simx_headeroffset_message_id)
+                if ret != -1 and ret2 != -1:
+                    stats.messages += lastid - firstid
+            code = None
+            if returnscode:
+                code = result[0] if isinstance(result, tuple) else result
+            bytesout = _payload(args[1:]) + (_payload(tuple(kwargs.values())) if kwargs else 0)
+            stats.add(end - start, code, bytesout, _payload(result))
+            if self.period is not None and end - self.lastsummary > self.period:
+                self.lastsummary = end
+                print (self.summary())
+            return result
+        wrapper.__name__ = name
+        wrapper.__doc__ = function.__doc__
+        return wrapper
+
+    def reset(self):
+        for name in self.stats:
+            self.stats[name].__init__(name)
+
+    def summary(self):
+        '''
+
+        Returns a table of the called functions, sorted by total time
+        :return: string
+
+        '''
+        lines = ['%-36s %8s %10s %9s %9s %9s %7s %11s %11s' % ('function', 'calls', 'total ms', 'mean ms', 'p50 ms',
+                                                                'p99 ms', 'errors', 'bytes out', 'bytes in')]
+        for s in sorted(self.stats.values(), key=lambda s: -s.totaltime):
+            if s.count == 0:
+                continue
+            lines.append('%-36s %8d %10.2f %9.3f %9.3f %9.3f %7d %11d %11d'
+                         % (s.name, s.count, s.totaltime * 1e3, s.totaltime * 1e3 / s.count, s.percentile(50) * 1e3,
+                            s.percentile(99) * 1e3, s.errors(), s.bytesout, s.bytesin))
+        return '\n'.join(lines)
+
+    def dump(self, filename=None):
+        '''
+
+        Returns the statistics of all called functions as a dict, and writes them as json to filename if given
+
+        '''
+        data = dict((name, s.todict()) for name, s in self.stats.items() if s.count > 0)
+        if filename is not None:
+            with open(filename, 'w') as f:
+                json.dump(data, f, indent=1, sort_keys=True)
+        return data
+
+
+def _arguments(function):
+    try:
+        return inspect.getfullargspec(function).args
+    except AttributeError:
+        return inspect.getargspec(function).args
+
+
+def _payload(value):
+    # estimated size in bytes of arguments / returned values, numbers and list items counting as 4 bytes
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (bytes, bytearray, str)):
+        return len(value)
+    if isinstance(value, list):
+        if len(value) > 0 and isinstance(value[0], (list, tuple, np.ndarray, bytes, bytearray, str)):
+            return sum(_payload(v) for v in value)
+        return 4 * len(value)
+    if isinstance(value, tuple):
+        return sum(_payload(v) for v in value)
+    if isinstance(value, (int, float)):
+        return 4
+    return 0
+
+
+instrumentation = None # Instrumentation enabled by enable()
+
+
+def enable(messages=False, period=None):
+    '''
+
+    Starts recording statistics of the remote api calls
+    :param messages: also record the number of messages sent per call
+    :param period: print a summary every period seconds
+    :return: the Instrumentation holding the statistics
+
+    '''
+    global instrumentation
+    disable()
+    instrumentation = Instrumentation(messages, period)
+    instrumentation.enable()
+    return instrumentation
+
+
+def disable():
+    '''
+
+    Stops recording statistics and restores the original remote api functions, the statistics are kept
+    :return: the disabled Instrumentation, None if none was enabled
+
+    '''
+    if instrumentation is not None:
+        instrumentation.disable()
+    return instrumentation
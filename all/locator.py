@@ -0,0 +1,195 @@
+#!/usr/bin/env python
+
+import cv2
+import numpy as np
+
+from blobs import BlobSource
+from segmentation import box_axis, box_center, heading, largest_blob, refine_blob
+from tracking import RoiTracker
+
+
+class Locator(object):
+    '''
+
+    This class finds the position and orientation of the foreground object(car) in the images of an observer
+    (Observer, VrepObserver..), see Observer for the image co-ordinates. setup_locator() creates its attributes, the
+    observer provides the segmentation of its own: the foreground background model fgbg, its learning rate
+    learningrate and the mask filter maskfilter (see segmentation.MaskFilter).
+
+    '''
+
+    def setup_locator(self):
+        '''
+
+        Sets the attributes of the position, the orientation and the options of the processing
+
+        '''
+        self.position = None # position (x,y) co-ordinate is the center of bounding box around the object in the image
+        self.previousposition = None # position in the image processed before the last one, for get_orientation
+        self.orientation = None # orientation of the object w.r.t +X axis (0 to 180 deg, 3rd and 4th quadrant) (0 to -180 deg, 1st and 2nd quadrant)
+        self.processedid = None # frameid of the last image processed by get_position
+        self.found = False # whether the object was found in the last processed image
+        self.debug = False
+        self.roitracking = False # if True, the object is tracked in a window around its predicted position once found (see tracking.RoiTracker)
+        self.tracker = RoiTracker() # window tracking of the object, used with roitracking
+        self.pyramidlevels = 0 # number of times images are halved for background subtraction and blob detection, the largest blob is measured again at full resolution
+        self.axis = None # orientation of the major axis of the blob of the object in degrees (-90 to 90), see segmentation.blob_axis
+        self.serverblobs = False # if True, positions are read from a blob detection filter of the vision sensor instead of images (see blobs.BlobSource)
+        self.blobsource = None # blob acquisition from the vision sensor, used with serverblobs, created on first use
+        self.videowriter=cv2.VideoWriter('video.avi', fourcc=cv2.cv.CV_FOURCC('M','J','P','G'), fps=10,
+                                         frameSize=(640, 480))
+
+    def process_image(self, frameid):
+        '''
+
+        Obtains the position of the object in the image self.img: tracked in a window with roitracking, else from
+        the largest blob of the foreground mask
+        :param frameid: id of the image. An image processed already is not processed again, the cached result is
+        returned (and the background model does not learn the same image twice)
+        :return: position (x,y) co-ordinate, found
+
+        '''
+        if frameid is not None and frameid == self.processedid:
+            return self.position, self.found
+        self.processedid = frameid
+        self.previousposition = self.position
+
+        if self.roitracking:
+            box = self.tracker.track(self.img)
+            if box is not None:
+                return self.set_tracked(box)
+        mask = self.maskfilter.subtract(self.fgbg, self.img, self.pyramidlevels, self.learningrate) #apply operator returns 8 bit binary image
+        return self.locate(mask)
+
+    def locate(self, mask):
+        '''
+
+        Updates the position from the largest blob of a foreground mask of the image self.img
+        :param mask: foreground mask, returned by maskfilter.subtract
+        :return: position (x,y) co-ordinate, found
+
+        '''
+
+        # processing of the mask, in place in the work buffers of the mask filter (see segmentation.MaskFilter)
+        finalmask = self.maskfilter.apply(mask)
+
+        # blobs of the mask labelled and measured in one pass, as arrays
+        areas, boxes, centroids = self.maskfilter.find_blobs(finalmask)
+
+        # blobs smaller than the threshold are noise. The threshold value is approximately 0.04 or 0.05 times minimum
+        # size of car blob seen (case when car is farthest in simulation from the camera), in full resolution pixels
+        scale = 2 ** self.pyramidlevels
+        max_index = largest_blob(areas, 20.0 / scale ** 2)
+
+        # if there is no blob above the threshold (the foreground object has not moved, or there is only noise in the
+        # image), do not update the position
+        box = None
+        if max_index is not None:
+            box = boxes[max_index]
+            if scale > 1:
+                # bounding box on the full resolution grid, from the patch of the mask around the blob
+                box, centroid, self.axis = refine_blob(finalmask, box, scale)
+            else:
+                self.axis = box_axis(finalmask, box)
+            # center of the bounding box of the largest blob
+            self.position = box_center(box)
+
+        if self.roitracking:
+            # the whole object is tracked from the blob on, in windows of the next frames
+            tracked = self.tracker.learn(self.img, box)
+            if tracked is not None:
+                self.position = box_center(tracked)
+                self.axis = self.tracker.axis
+
+        if self.debug:
+            # copies, the work buffers of the mask filter are overwritten by the next frame
+            self.seeinitialmask = mask.copy()
+            self.seefinalmask = finalmask.copy()
+            # write the image to video to view later (the video is in colour, grey images are converted)
+            self.videowriter.write(self.img if self.img.ndim == 3 else cv2.cvtColor(self.img, cv2.COLOR_GRAY2BGR))
+            # draw bounding rectangle of the largest blob
+            if max_index is not None:
+                x1,y1,w1,h1 = [int(v) for v in box]
+                cv2.rectangle(self.img, (x1,y1), (x1+w1, y1+h1), color=(255,0,0), thickness=3)
+                cv2.circle(self.img, (self.position[0], self.position[1]), 5,
+                           color=(255, 0, 0), thickness=3)
+            else:
+                # plot the previously known position when no blobs are seen or when no blob areas are greater
+                # than threshold
+                if self.position != None:
+                    cv2.circle(self.img, (self.position[0],self.position[1]), 5,
+                               color=(255,0,0), thickness=3)
+
+        self.found = max_index is not None or (self.roitracking and self.tracker.box is not None)
+        return self.position, self.found
+
+    def set_tracked(self, box):
+        '''
+
+        Updates the position from the bounding box of the object tracked in a window (see tracking.RoiTracker)
+        :return: position (x,y) co-ordinate, found
+
+        '''
+        self.position = box_center(box)
+        self.axis = self.tracker.axis
+        self.found = True
+        if self.debug:
+            # draw the window searched and write the image to video
+            x0, y0, x1, y1 = self.tracker.window
+            cv2.rectangle(self.img, (int(x0), int(y0)), (int(x1), int(y1)), color=(0, 255, 0), thickness=1)
+            self.videowriter.write(self.img if self.img.ndim == 3 else cv2.cvtColor(self.img, cv2.COLOR_GRAY2BGR))
+        return self.position, self.found
+
+    def get_position_blobs(self):
+        '''
+
+        Returns the position of the largest blob found by the blob detection filter of the vision sensor, the
+        segmentation running on the server. No image is transferred, self.img is not updated. The blob source is
+        created on first use from the attributes ID and visionhandle of the vision sensor of the observer, or set
+        before (see observerv2.Observer.set_blobsource)
+        :return: position (x,y) co-ordinate, found
+
+        '''
+        if self.blobsource is None:
+            self.blobsource = BlobSource(self.ID, self.visionhandle)
+        position, found = self.blobsource.get_position()
+        if self.blobsource.frameid == self.processedid:
+            return self.position, self.found
+        self.processedid = self.blobsource.frameid
+        self.previousposition = self.position
+        if found:
+            self.position = position
+            self.axis = self.blobsource.axis
+        self.found = found
+        return self.position, self.found
+
+    def update_orientation(self):
+        '''
+
+        Calculates the angle in degrees of the object with respect to +X axis from the last processed image. The
+        major axis of the blob of the car gives its orientation up to 180 deg, the last orientation selects the front
+        (the car turns less than 90 deg between two images, also when driving backward), or the direction of motion
+        from the position in the image processed before the first time. Without blob axis, the direction of motion
+        is the orientation.
+        :return: angle w.r.t. +X axis in the image. (0 to 180 deg, 3rd and 4th quadrant, clockwise)
+        (0 to -180 deg, 1st and 2nd quadrant, anticlockwise)
+
+        '''
+        pos1 = self.previousposition # position in the image before
+        pos2 = self.position
+
+        # displacement between both positions, if known
+        motion = None
+        if pos1 is not None and pos2 is not None:
+            motion = np.array(pos2, dtype=float) - np.array(pos1, dtype=float)
+
+        if self.axis is not None:
+            self.orientation = heading(self.axis, motion, self.orientation)
+        elif motion is not None and any(motion != 0):
+            self.orientation = np.arctan2(motion[1], motion[0]) * (180 / np.pi)
+
+        if self.debug:
+            self.pos1 = np.array(pos1)
+            self.pos2 = np.array(pos2)
+
+        return self.orientation
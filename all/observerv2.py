@@ -5,9 +5,14 @@ import numpy as np
 import time
 
 import vrep
-
-
-class ImageSource(object):
+from blobs import BlobSource
+from depth import DepthObstacles
+from handles import get_registry
+from images import ImageReader
+from locator import Locator
+from segmentation import MaskFilter
+
+class ImageSource(ImageReader, DepthObstacles):
     '''
     This class is used to acquire image from camera, video or vrep simulation.
 
@@ -21,12 +26,13 @@ class ImageSource(object):
 
     def __init__(self, imagesource, **kwargs):
         self.imagesource = imagesource  # 'imagesource' can be '0' (webcam), 'simulation' or 'file'. optional parameters must be provided according to 'imagesource'
+        self.setup_images()
+        self.depthsource = None # depth buffer acquisition from the vision sensor, created on first use
         if self.imagesource == 'simulation':
             if ('ID', 'visionsensor_name' in kwargs):
                 self.ID = kwargs['ID']
                 self.visionsensor = kwargs['visionsensor_name']
-                _, self.visionhandle = vrep.simxGetObjectHandle(self.ID, self.visionsensor,
-                                                                vrep.simx_opmode_oneshot_wait)
+                _, self.visionhandle = get_registry(self.ID).get(self.visionsensor)
                 if _ != vrep.simx_return_ok:
                     print (' !!!!!! Vision sensor handle not obtained !!!!!!')
                 else:
@@ -59,31 +65,16 @@ class ImageSource(object):
         '''
 
         if self.imagesource == 'camera' or self.imagesource == 'file':
-            _, self.img = self.cap.read()
-            # print error msg if image not acquired
-            if _ != True:
-                print ('Image not acquired from image source')
+            self.read_capture()
         elif self.imagesource == 'simulation':
-            if self.img == None:
-                err, res, self.img = vrep.simxGetVisionSensorImage(self.ID, self.visionhandle, 0,
-                                                                   vrep.simx_opmode_streaming)
-                time.sleep(1)
-                err, res, self.img = vrep.simxGetVisionSensorImage(self.ID, self.visionhandle, 0,
-                                                                   vrep.simx_opmode_buffer)
-            else:
-                err, res, self.img = vrep.simxGetVisionSensorImage(self.ID, self.visionhandle, 0,
-                                                                   vrep.simx_opmode_buffer)
-                # print error msg if image not acquired
-                if err != vrep.simx_return_ok:
-                    print ('Image not acquired from image source')
-            img_rgb = np.array(self.img, dtype='uint8')
-            img_rgb.resize([res[1], res[0], 3])
-            img_rgb = cv2.flip(img_rgb, 0)
-            img_bgr = cv2.cvtColor(img_rgb, cv2.cv.CV_RGB2BGR)
-            self.img = img_bgr
+            # the image read is a view on the remote api buffer (no copy), converted right away into the buffers of
+            # the frame pools (see images.ImageReader)
+            img_rgb = self.read_simulation()
+            if img_rgb is not None:
+                self.convert_simulation(img_rgb)
         return self.img
 
-class Observer(object):
+class Observer(Locator):
     '''
 
     This class determines the position and orientation of a foreground object(car) in an image as seen by observer.
@@ -106,118 +97,59 @@ class Observer(object):
     '''
 
     def __init__(self, imagesource = 0, **kwargs):
-        self.position = None # position (x,y) co-ordinate is the center of bounding box around the object in the image
-        self.orientation = None # orientation of the object w.r.t +X axis (0 to 180 deg, 3rd and 4th quadrant) (0 to -180 deg, 1st and 2nd quadrant)
+        self.setup_locator()
         self.fgbg = cv2.BackgroundSubtractorMOG()
+        self.maskfilter = MaskFilter(kernel=(3, 3), iterations=2) # segmentation stage with its work buffers
         self.img = None # image as seen by observer
-        self.debug = False
         self.learningrate = 0.1 # learning rate of foreground background model
-        self.videowriter=cv2.VideoWriter('video.avi', fourcc=cv2.cv.CV_FOURCC('M','J','P','G'), fps=10,
-                                         frameSize=(640, 480))
 
-    def get_position(self, img):
+    def set_blobsource(self, source):
+        '''
+
+        Sets the vision sensor of an image source in vrep simulation as the source of the blobs used with serverblobs
+        :param source: ImageSource of 'simulation' type
+
+        '''
+        self.blobsource = BlobSource(source.ID, source.visionhandle)
+
+    def get_position(self, img=None, frameid=None):
         '''
 
         Returns the position of the foreground object(car). It acquires the image by itself and
         processes it to obtain position
 
+        :param img: bgr image, e.g. from ImageSource.grab_image. Not used with serverblobs, it can be None
+        :param frameid: optional id of the image (ImageSource.frameid). An image processed already is not processed
+        again, the cached result is returned (and the background model does not learn the same image twice)
         :return: position (x,y) co-ordinate, tuple of length 2
 
         '''
 
-        # if image acquired for first time allow the foreground background model to initialize
+        if self.serverblobs:
+            return self.get_position_blobs()
         self.img = img
-        mask = self.fgbg.apply(self.img, learningRate=self.learningrate) #apply operator returns 8 bit binary image
-
-        finalmask = cv2.morphologyEx(mask.copy(), cv2.cv.CV_MOP_CLOSE, (3, 3), iterations=2)
-        conts, _ = cv2.findContours(finalmask.copy(), cv2.cv.CV_RETR_EXTERNAL, cv2.cv.CV_CHAIN_APPROX_NONE)
-
-        #find areas and centers of all contours (if any contours are present)
-        centers=[] #empty list initialized to append all centers calculated from contours
-
-        if len(conts) > 0:
-            areas = np.array([cv2.contourArea(c) for c in conts])
-            areas = np.array(areas)
-            np.putmask(areas,areas < 20, 0) # masking areas less than threshold value to eliminate noise
-            # The threshold value is approximately 0.04 or 0.05 times minimum size of car blob seen (case when car is
-            # farthest in simulation from the camera)
-
-            for c in conts:
-                x, y, w, h = cv2.boundingRect(c)
-                center = (x+w/2, y+h/2)
-                centers.append(center)
-
-            # if all elements in areas array is zero, taking max will still return an index. This should not be
-            # the case when there are no areas above a certain threshold (i.e. there is only noise in image)
-            # Hence update the position only if any areas are greater than zero.
-
-            if any(areas) != 0:
-                # largest contour and corresponding center
-                max_index = np.argmax(areas)
-                #update position attribute
-                self.position = centers[max_index]
-        else:
-            # if conts not seen then the foreground object has not moved, hence donot update the position
-            # areas = np.zeros(1) assigned when no contours seen (used in debug to plot previous known position
-            # in absence of any contours and no contour areas greater than threshold)
-            areas=np.zeros(1)
-
-        if self.debug:
-            self.seeinitialmask = mask
-            self.seefinalmask = finalmask
-            self.videowriter.write(self.img) # write the image to video to view later
-            # draw largest contour and bounding rectangle
-            if any(areas) != 0:
-                # cv2.drawContours(self.img, conts[max_index], -1, (0, 255, 0), thickness=2)
-                x1,y1,w1,h1 = cv2.boundingRect(conts[max_index])
-                cv2.rectangle(self.img, (x1,y1), (x1+w1, y1+h1), color=(255,0,0), thickness=3)
-                cv2.circle(self.img, (self.position[0], self.position[1]), 5,
-                           color=(255, 0, 0), thickness=3)
-            else:
-                # plot the previously known position when no contours are seen or when no contour areas are greater
-                # than threshold
-                if self.position != None:
-                    cv2.circle(self.img, (self.position[0],self.position[1]), 5,
-                               color=(255,0,0), thickness=3)
-
-        return self.position, any(areas) > 0
+        return self.process_image(frameid)
 
-    def get_orientation(self):
+    def get_orientation(self, img=None, frameid=None):
 
         '''
 
-        calculates the angle in degrees of foreground object(car) with respect to +X axis in 2D.
-        It reads the last known position (reads position attribute) and obtains the current position (calls
-        get_position method and updates position attribute). These two positions are used to determine angle.
+        calculates the angle in degrees of foreground object(car) with respect to +X axis in 2D from a single image.
+        It obtains the current position first (calls get_position with the given image, or reads the server-side
+        blobs with serverblobs) and uses it with the position found in the image processed before.
+        The major axis of the blob of the car gives its orientation up to 180 deg, the last orientation selects the
+        front (the car turns less than 90 deg between two images, also when driving backward), or the direction of
+        motion between both positions the first time. Without blob axis, the direction of motion is the orientation.
 
+        :param img: bgr image, e.g. from ImageSource.grab_image. Without image (and without serverblobs) the last
+        two positions found by get_position are used, no position is obtained
+        :param frameid: optional id of the image (ImageSource.frameid), see get_position
         :return: angle w.r.t. +X axis
 
         '''
 
-        if self.orientation == None:
-            if self.position == None:
-                self.get_position()
-                pos1 = self.position
-            else:
-                pos1 = self.position
-        else:
-            pos1 = self.position #get last known position
-
         # get the current position
-        self.get_position()
-        pos2 = self.position
-
-        # calculate angle if position has changed
-        pos1 = np.array(pos1)
-        pos2 = np.array(pos2)
-        if any(pos1 != pos2):
-            u = pos2 - pos1
-            unorm = np.linalg.norm(u)
-            u = u / unorm
-            self.orientation = np.arctan2(u[1], u[0]) * (180 / np.pi)
-
-        if self.debug:
-            self.pos1 = pos1
-            self.pos2 = pos2
-
-        return self.orientation
\ No newline at end of file
+        if img is not None or self.serverblobs:
+            self.get_position(img, frameid)
+
+        return self.update_orientation()
\ No newline at end of file
@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+
+import time
+
+import vrep
+
+
+class Pacer(object):
+    '''
+
+    This class paces a control loop running against a free-running simulation, so that every iteration processes
+    exactly one fresh simulation step instead of polling faster than the simulator produces frames or sleeping
+    longer than it does.
+
+    New steps are detected with simxGetLastCmdTime, the simulation time of the last reply received from the server,
+    which is a local call. It advances once per simulation step as long as at least one read is streamed (e.g. the
+    image of the vision sensor). The wall clock time between steps is measured and smoothed, wait() sleeps until
+    shortly before the next step is expected and then polls. The round trip time to the server, measured with
+    simxGetPingTime, sets how early it wakes up, as replies arrive with its jitter.
+
+    '''
+
+    def __init__(self, clientID, dt=None, smoothing=0.1, pollperiod=0.001):
+        self.ID = clientID
+        self.dt = dt # simulation time step in s, if known, to count the steps missed between two iterations
+        self.smoothing = smoothing # weight of a new measurement in the smoothed period and round trip time
+        self.pollperiod = pollperiod # time between two polls of the last command time in s
+        self.rtt = None # smoothed round trip time to the server in s
+        self.period = None # smoothed wall clock time between two simulation steps in s
+        self.simtime = None # simulation time in ms of the last step seen
+        self.arrival = None # wall clock time at which the last step was seen
+        self.missed = 0 # steps which arrived while the loop was busy, i.e. were not processed
+
+    def smooth(self, average, value):
+        if average is None:
+            return value
+        return (1 - self.smoothing) * average + self.smoothing * value
+
+    def ping(self):
+        '''
+
+        Measures the round trip time to the server (blocking) and updates the attribute rtt
+        :return: round trip time in s
+
+        '''
+        ret, ms = vrep.simxGetPingTime(self.ID)
+        if ret == vrep.simx_return_ok:
+            self.rtt = self.smooth(self.rtt, ms / 1000.0)
+        return self.rtt
+
+    def poll(self):
+        '''
+
+        Checks without blocking whether a new simulation step arrived since the last call
+        :return: True if there is a new step
+
+        '''
+        simtime = vrep.simxGetLastCmdTime(self.ID)
+        if self.simtime is not None and simtime == self.simtime:
+            return False
+        now = time.time()
+        if self.simtime is not None and simtime > self.simtime:
+            steps = 1
+            if self.dt:
+                steps = max(1, int(round((simtime - self.simtime) / (self.dt * 1000.0))))
+            self.missed += steps - 1
+            self.period = self.smooth(self.period, (now - self.arrival) / steps)
+        # else first step seen, or the simulation was restarted
+        self.simtime = simtime
+        self.arrival = now
+        return True
+
+    def wait(self, timeout=1.0):
+        '''
+
+        Blocks until a new simulation step has arrived
+        :param timeout: maximum time to wait in s
+        :return: True if a new step arrived, False on timeout
+
+        '''
+        if self.poll():
+            return True
+        deadline = time.time() + timeout
+        if self.period is not None:
+            margin = max(self.rtt or 0.0, 0.1 * self.period)
+            remaining = min(self.arrival + self.period - margin, deadline) - time.time()
+            if remaining > 0:
+                time.sleep(remaining)
+        while not self.poll():
+            if time.time() > deadline:
+                return False
+            time.sleep(self.pollperiod)
+        return True
+
+    def rate(self):
+        '''
+
+        Returns the measured rate at which the simulator produces steps (frames) in Hz, None before two steps
+
+        '''
+        if not self.period:
+            return None
+        return 1.0 / self.period
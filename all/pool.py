@@ -0,0 +1,150 @@
+#!/usr/bin/env python
+
+import itertools
+import multiprocessing
+
+import numpy as np
+
+import vrep
+import vrepfake
+from car import VrepCar
+from client import VrepClient
+
+worker = {} # state of the current worker process: endpoint, backend, synchronous
+
+
+class ClientPool(object):
+    '''
+
+    This class runs independent episodes in parallel on several simulator instances, one worker process per
+    instance. Every instance is a remote api endpoint (IP, port), i.e. a vrep started with its own remote api server
+    port, or an in-process fake simulator (see vrepfake) per worker with fake=True.
+
+    An episode is a function episode(client, params) returning a result; it has to be defined at module level so
+    that it can be sent to the workers. For every episode the worker connects a VrepClient to its instance, which
+    starts the simulation, and stops it afterwards, so episodes always start from the initial scene.
+
+    '''
+
+    def __init__(self, endpoints, synchronous=False, fake=False, simulator=None):
+        '''
+
+        :param endpoints: list of (IP, port) of the simulator instances, see ports()
+        :param synchronous: run the clients in lockstep mode (see VrepClient)
+        :param fake: use the fake backend instead of the remoteApi library
+        :param simulator: with fake=True, function returning the FakeSimulator of a worker (default scene if None)
+
+        '''
+        self.endpoints = list(endpoints)
+        self.synchronous = synchronous
+        self.fake = fake
+        self.simulator = simulator
+
+    @staticmethod
+    def ports(n, first=19999, IP='127.0.0.1'):
+        '''
+
+        Returns the endpoints of n instances on one host listening on consecutive ports
+        :return: list of (IP, port)
+
+        '''
+        return [(IP, first + i) for i in range(n)]
+
+    def run(self, episode, params):
+        '''
+
+        Runs one episode per element of params, spread over the instances
+        :param episode: episode(client, params) returning the result of an episode
+        :param params: list of parameters, one per episode
+        :return: list of results, in the order of params
+
+        '''
+        endpoints = multiprocessing.Queue()
+        for endpoint in self.endpoints:
+            endpoints.put(endpoint)
+        processes = min(len(self.endpoints), len(params))
+        pool = multiprocessing.Pool(processes, initializer=_init_worker,
+                                    initargs=(endpoints, self.synchronous, self.fake, self.simulator))
+        try:
+            results = pool.map(_run_episode, [(episode, p) for p in params], chunksize=1)
+        finally:
+            pool.close()
+            pool.join()
+        return results
+
+    def sweep(self, episode, grid, repeat=1):
+        '''
+
+        Runs episodes for every combination of parameter values (parameter sweep)
+        :param episode: episode(client, params) with params a dict name -> value
+        :param grid: dict name -> list of values
+        :param repeat: number of episodes per combination
+        :return: list of (params, results) with the list of the repeat results of every combination
+
+        '''
+        names = sorted(grid.keys())
+        combinations = [dict(zip(names, values)) for values in itertools.product(*[grid[n] for n in names])]
+        results = self.run(episode, [c for c in combinations for i in range(repeat)])
+        return [(c, results[i * repeat:(i + 1) * repeat]) for i, c in enumerate(combinations)]
+
+
+def aggregate(results):
+    '''
+
+    Summarises the numeric results of a parameter sweep
+    :param results: list of (params, results) as returned by ClientPool.sweep, results being numbers or arrays
+    :return: list of (params, mean, std, min, max) over the repeats of every combination
+
+    '''
+    summary = []
+    for params, values in results:
+        values = np.asarray(values, dtype=float)
+        summary.append((params, values.mean(axis=0), values.std(axis=0), values.min(axis=0), values.max(axis=0)))
+    return summary
+
+
+def _init_worker(endpoints, synchronous, fake, simulator):
+    # every worker process takes one instance for its lifetime
+    worker['endpoint'] = endpoints.get()
+    worker['synchronous'] = synchronous
+    if fake:
+        vrep.useBackend('fake')
+        if simulator is not None:
+            vrepfake.addSimulator(worker['endpoint'][1], simulator())
+
+
+def _run_episode(task):
+    episode, params = task
+    IP, port = worker['endpoint']
+    client = VrepClient(IP, port, synchronous=worker['synchronous'])
+    if client.start() == -1:
+        raise IOError('Unable to connect to V-REP server at %s:%d' % (IP, port))
+    try:
+        return episode(client, params)
+    finally:
+        client.stop()
+
+
+def drive(client, params):
+    '''
+
+    Example episode: drives the car with constant wheel velocities for a given simulated time and returns where it
+    ended up
+    :param params: dict with 'u' (left, right wheel velocity) and 'duration' in s
+    :return: final (x, y) of the car
+
+    '''
+    pioneer = VrepCar(client.ID, 'Pioneer_p3dx_leftMotor', 'Pioneer_p3dx_rightMotor')
+    _, carhandle = client.handles.get('Pioneer_p3dx')
+    pioneer.command(params['u'])
+    client.wait(params['duration'])
+    _, position = vrep.simxGetObjectPosition(client.ID, carhandle, -1, vrep.simx_opmode_oneshot_wait)
+    return position[:2]
+
+
+if __name__ == '__main__':
+    # parameter sweep over the wheel velocities on four fake simulator instances in lockstep mode
+    pool = ClientPool(ClientPool.ports(4), synchronous=True, fake=True)
+    grid = {'u': [(1, 1), (1, 1.2), (1, 1.5), (1, 2)], 'duration': [1.0, 2.0]}
+    for params, mean, std, lo, hi in aggregate(pool.sweep(drive, grid, repeat=2)):
+        print (params, mean)
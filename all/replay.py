@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+# title           :replay.py
+# description     :Replays a recorded video into a vision sensor of the simulation (hardware-in-the-loop replay), so
+#                  that the observer and controller can be run on recorded frames
+# usage           :python replay.py [path to video] [vision sensor name]
+# notes           :the vision sensor should be passive (not rendering the scene itself), frames are resized to
+#                  its resolution if needed
+# python_version  :2.7.6
+
+import sys
+import time
+
+import cv2
+
+import vrep
+from client import VrepClient
+from frames import FramePool, bgr_to_vrep
+
+videofile = sys.argv[1] if len(sys.argv) > 1 else 'Results/2_Thresh_floodfill/video.avi'
+visionsensor_name = sys.argv[2] if len(sys.argv) > 2 else 'Vision_sensor'
+realtime = True # replay at the frame rate of the video, else as fast as possible
+
+# Initialize communication, obtain ID and start simulation
+client = VrepClient()
+ID = client.start()
+
+_, visionhandle = client.handles.get(visionsensor_name)
+_, w = vrep.simxGetObjectIntParameter(ID, visionhandle, vrep.sim_visionintparam_resolution_x,
+                                      vrep.simx_opmode_oneshot_wait)
+_, h = vrep.simxGetObjectIntParameter(ID, visionhandle, vrep.sim_visionintparam_resolution_y,
+                                      vrep.simx_opmode_oneshot_wait)
+
+cap = cv2.VideoCapture(videofile)
+fps = cap.get(cv2.cv.CV_CAP_PROP_FPS) or 10.0
+
+# preallocated buffers: the frame in vision sensor layout is passed to the remote api without any copy
+framepool = FramePool(size=1)
+scratchpool = FramePool(size=1)
+resized = None
+
+count = 0
+start = time.time()
+while True:
+    _, frame = cap.read()
+    if _ != True:
+        break
+    if frame.shape[:2] != (h, w):
+        resized = cv2.resize(frame, (w, h), resized)
+        frame = resized
+    image = bgr_to_vrep(frame, framepool.get(frame.shape), scratchpool.get(frame.shape))
+    vrep.simxSetVisionSensorImage(ID, visionhandle, image, 0, vrep.simx_opmode_oneshot)
+    count += 1
+    if realtime:
+        delay = start + count / fps - time.time()
+        if delay > 0:
+            time.sleep(delay)
+
+elapsed = time.time() - start
+print ('%d frames replayed in %.2f s (%.1f fps)' % (count, elapsed, count / max(elapsed, 1e-9)))
+
+cap.release()
+
+# disconnect communication and stop simulation
+client.stop()
@@ -10,15 +10,17 @@
 # python_version  :2.7.6
 
 import cv2
-import time
 
 from matplotlib import pyplot as plt
 from all.client import VrepClient
 from all.car import VrepCar
 from all.observer import VrepObserver
 
-# Initialize communication, obtain ID and start simulation
-client = VrepClient()
+# Initialize communication, obtain ID and start simulation. In synchronous (lockstep) mode the simulation only
+# advances when the script steps it, so the experiment runs as fast as processing allows and is reproducible. Set
+# synchronous to True for a scene set up for it (the scene must not step on its own, e.g. no real time mode)
+synchronous = False
+client = VrepClient(synchronous=synchronous)
 ID = client.start()
 
 # Initialize observer
@@ -42,7 +44,7 @@ if obs.position == None:
 
     #start to rotate the car on the same position for some fixed time
     pioneer.command((-1, 1))
-    time.sleep(2)
+    client.wait(2)
 
     obs.get_position() #get the position
 
@@ -58,23 +60,13 @@ if obs.position == None:
 #obtain initial orientation
 if obs.orientation == None:
 
-    # move the car backward for some fixed time
-    pioneer.command((-1, -1))
-    time.sleep(2)
-
-    # get the position
-    obs.get_position()
-
-    # save the processed image used to identify position 1 for orientation
-    if obs.debug == True:
-        cv2.imwrite ('initial_ort_pos1_mask.jpg', obs.seefinalmask)
-
-    # move the car forward for same fixed time
+    # the blob of the car gives its orientation up to 180 deg from a single image, a short move forward selects
+    # the front
     pioneer.command((1, 1))
-    time.sleep(2)
+    client.wait(0.5)
 
-    # now since the position 1 was obtained earlier, get orientation would also obtain current position and
-    # use both of these position to identify initial orientation orientation
+    # get orientation obtains the current position and orientation, with the direction of motion from the
+    # initial position
     obs.get_orientation()
 
     # stop the car
@@ -85,17 +77,17 @@ if obs.orientation == None:
 
     print ('Initial orientation', obs.orientation)
 
-    # save the processed image used to identify current position (position 2) for orientation
+    # save the processed image used to identify the orientation
     if obs.debug == True:
         cv2.imwrite('initial_ort_pos2_mask.jpg', obs.seefinalmask)
 
 
 pioneer.command((0, 0))
-time.sleep(0.5)
+client.wait(0.5)
 
 # obtain position and orientation continuously
 while True:
-    time.sleep(0.3)
+    client.wait(0.3)
 
     # get orientation method uses previous known position and also updates current position of car. Hence using
     # only get orientation method in a loop would be sufficient to obtain current position and orientation
@@ -42,23 +42,17 @@ if imagesource == 'simulation':
     #obtain initial position
     if obs.position == None:
         pioneer.command((-1, 1))
-        time.sleep(0.5)
+        client.wait(0.5)
         obs.get_position()
         pioneer.command((0, 0))
         if obs.debug:
             cv2.imwrite('initial_pos_mask.jpg', obs.seefinalmask)
     print ('Initial position', obs.position)
 
-    #obtain initial orientation
+    #obtain initial orientation: from the blob of the car up to 180 deg, a short move forward selects the front
     if obs.orientation == None:
-        pioneer.command((-1, -1))
-        time.sleep(2)
-        pioneer.command((0, 0))
-        obs.get_position()
-        if obs.debug:
-            cv2.imwrite('pos1_mask_for_ort.jpg', obs.seefinalmask)
         pioneer.command((1, 1))
-        time.sleep(2)
+        client.wait(0.5)
         pioneer.command((0, 0))
         obs.get_orientation()
         if obs.debug:
@@ -0,0 +1,319 @@
+#!/usr/bin/env python
+
+import cv2
+import numpy as np
+
+from frames import FramePool
+
+try:
+    from scipy import ndimage
+except ImportError:
+    ndimage = None
+
+# connected components with statistics are available from OpenCV 3.0 on. With OpenCV 2.4, the labelling of scipy
+# (optional) is used instead
+HAVE_CV_COMPONENTS = hasattr(cv2, 'connectedComponentsWithStats')
+HAVE_COMPONENTS = HAVE_CV_COMPONENTS or ndimage is not None
+# number of blobs in a 640x480 mask above which connected components are faster than contours (see
+# benchmark.bench_noisy_masks). Contours cost about 0.2 ms on a clean mask and 1 ms more per 500 blobs, in
+# findContours mostly, which has not changed since OpenCV 2.4. Connected components cost about 2.2 ms (OpenCV) or
+# 2 to 3 ms (scipy labelling, as with OpenCV 2.4) up to a few thousand blobs
+COMPONENTS_CROSSOVER = 1000
+
+
+def find_blobs(mask, components=False, labels=None, scratch=None):
+    '''
+
+    Finds the blobs (8-connected foreground regions) of a binary mask. The outer contours are found and measured
+    together on their concatenated points, i.e. there is no python loop over the contours, which is fastest for a
+    few blobs. With connected components (OpenCV 3.0 on, else scipy, see label_blobs), all blobs are labelled and
+    measured in a single pass over the mask, slower for a few blobs but the cost hardly depends on the number of
+    blobs (see COMPONENTS_CROSSOVER).
+
+    The area of a blob is its number of pixels with connected components, the area enclosed by its outer contour
+    otherwise (smaller by about half the perimeter).
+    :param mask: 8 bit single channel image, foreground is non zero. It is not modified
+    :param components: use connected components if True (HAVE_COMPONENTS must be True), else contours
+    :param labels: optional int32 buffer of the shape of the mask for the labels of the connected components
+    :param scratch: optional 8 bit buffer of the shape of the mask for the copy of the mask findContours modifies
+    :return: areas, float64 array of shape (n,), bounding boxes (x, y, w, h), int array of shape (n, 4),
+    centroids (x, y), float64 array of shape (n, 2)
+
+    '''
+    if components and not HAVE_CV_COMPONENTS:
+        return label_blobs(mask, labels)
+    if components:
+        n, labels, stats, centroids = cv2.connectedComponentsWithStats(mask, labels, connectivity=8)
+        # label 0 is the background
+        return (stats[1:, cv2.CC_STAT_AREA].astype(np.float64), stats[1:, :cv2.CC_STAT_AREA],
+                centroids[1:].astype(np.float64))
+
+    # findContours modifies its input in OpenCV 2.4
+    if scratch is None:
+        scratch = mask.copy()
+    else:
+        np.copyto(scratch, mask)
+    conts = cv2.findContours(scratch, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)[-2]
+    if len(conts) == 0:
+        return np.zeros(0), np.zeros((0, 4), dtype=np.int32), np.zeros((0, 2))
+    lengths = np.array([len(c) for c in conts])
+    starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    points = np.concatenate(conts).reshape(-1, 2).astype(np.float64)
+    # bounding boxes of the points of every contour
+    low = np.minimum.reduceat(points, starts)
+    high = np.maximum.reduceat(points, starts)
+    boxes = np.hstack((low, high - low + 1)).astype(np.int32)
+    # areas and centroids of the contour polygons (shoelace formula), the last point of a contour joins its first
+    following = np.arange(1, len(points) + 1)
+    following[starts + lengths - 1] = starts
+    x, y = points[:, 0], points[:, 1]
+    x1, y1 = x[following], y[following]
+    cross = x * y1 - x1 * y
+    signedareas = np.add.reduceat(cross, starts) / 2.0
+    areas = np.abs(signedareas)
+    centroids = np.empty((len(conts), 2))
+    centroids[:, 0] = np.add.reduceat((x + x1) * cross, starts)
+    centroids[:, 1] = np.add.reduceat((y + y1) * cross, starts)
+    # degenerate polygons (lines, single points) have no area, their centroid is the centre of their box
+    flat = areas == 0
+    centroids[~flat] /= 6.0 * signedareas[~flat, np.newaxis]
+    centroids[flat] = low[flat] + (high[flat] - low[flat]) / 2.0
+    return areas, boxes, centroids
+
+
+def label_blobs(mask, labels=None):
+    '''
+
+    Finds the blobs of a binary mask with the connected components labelling of scipy, for OpenCV 2.4 (see
+    find_blobs). The blobs are measured from their pixels sorted by label, with numpy reductions over all blobs at
+    once.
+    :param mask: 8 bit single channel image, foreground is non zero
+    :param labels: optional int32 buffer of the shape of the mask for the labels
+    :return: areas, bounding boxes (x, y, w, h), centroids (x, y), see find_blobs
+
+    '''
+    if labels is None:
+        labels = np.empty(mask.shape, dtype=np.int32)
+    n = ndimage.label(mask, np.ones((3, 3), dtype=np.int32), labels)
+    if n == 0:
+        return np.zeros(0), np.zeros((0, 4), dtype=np.int32), np.zeros((0, 2))
+    flat = labels.ravel()
+    pixels = np.flatnonzero(flat)
+    blob = flat[pixels]
+    # pixels of every blob together, blobs in label order, labels start at 1
+    order = np.argsort(blob, kind='mergesort')
+    pixels = pixels[order]
+    counts = np.bincount(blob, minlength=n + 1)[1:]
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    y, x = np.divmod(pixels, mask.shape[1])
+    low = np.column_stack((np.minimum.reduceat(x, starts), np.minimum.reduceat(y, starts)))
+    high = np.column_stack((np.maximum.reduceat(x, starts), np.maximum.reduceat(y, starts)))
+    boxes = np.hstack((low, high - low + 1)).astype(np.int32)
+    centroids = np.column_stack((np.add.reduceat(x, starts), np.add.reduceat(y, starts))).astype(np.float64)
+    centroids /= counts[:, np.newaxis]
+    return counts.astype(np.float64), boxes, centroids
+
+
+def largest_blob(areas, minarea=20):
+    '''
+
+    Returns the index of the largest blob, blobs smaller than minarea being noise
+    :param areas: areas of the blobs, see find_blobs
+    :param minarea: minimum area in pixels
+    :return: index of the largest blob, None if there is no blob of at least minarea
+
+    '''
+    if len(areas) == 0:
+        return None
+    index = int(np.argmax(areas))
+    if areas[index] < minarea:
+        return None
+    return index
+
+
+def box_center(box):
+    '''
+
+    Returns the center of a bounding box (x, y, w, h) as integer pixel co-ordinates (x, y)
+
+    '''
+    x, y, w, h = [int(v) for v in box]
+    return (x + w // 2, y + h // 2)
+
+
+def refine_blob(mask, box, scale):
+    '''
+
+    Measures a blob found in a downscaled mask on the full resolution grid: the patch of the mask around the blob is
+    upsampled (bilinear) and thresholded at half, so that its outline has the precision of a full resolution pixel
+    instead of scale pixels, and measured with moments.
+    :param mask: 8 bit binary mask, downscaled by scale
+    :param box: bounding box (x, y, w, h) of the blob in the mask
+    :param scale: ratio of the full resolution to the resolution of the mask
+    :return: bounding box (x, y, w, h) and centroid (x, y) in full resolution pixels, orientation of the major axis
+    of the blob in degrees w.r.t. +X axis in the image (-90 to 90, a blob has no front), None for a round blob
+
+    '''
+    x, y, w, h = [int(v) for v in box]
+    # one pixel of margin, the interpolation spreads the blob by up to half a pixel
+    x0, y0 = max(x - 1, 0), max(y - 1, 0)
+    x1, y1 = min(x + w + 1, mask.shape[1]), min(y + h + 1, mask.shape[0])
+    patch = cv2.resize(mask[y0:y1, x0:x1], ((x1 - x0) * scale, (y1 - y0) * scale), interpolation=cv2.INTER_LINEAR)
+    _, patch = cv2.threshold(patch, 127, 255, cv2.THRESH_BINARY)
+    # the blob is the largest one in the patch, other blobs cut by the patch border are ignored
+    areas, boxes, centroids = find_blobs(patch)
+    index = largest_blob(areas, 1)
+    if index is None:
+        return (x * scale, y * scale, w * scale, h * scale), ((x + w / 2.0) * scale, (y + h / 2.0) * scale), None
+    bx, by, bw, bh = [int(v) for v in boxes[index]]
+    patch = patch[by:by + bh, bx:bx + bw]
+    m = cv2.moments(patch, True)
+    if m['m00'] == 0:
+        centroid = (bw / 2.0, bh / 2.0)
+    else:
+        centroid = (m['m10'] / m['m00'], m['m01'] / m['m00'])
+    offset = (x0 * scale + bx, y0 * scale + by)
+    return ((offset[0], offset[1], bw, bh), (offset[0] + centroid[0], offset[1] + centroid[1]), blob_axis(m))
+
+
+def blob_axis(m):
+    '''
+
+    Returns the orientation of the major axis of a blob from its moments (cv2.moments) in degrees w.r.t. +X axis in
+    the image (-90 to 90), None if the blob is round or empty
+
+    '''
+    if m['m00'] == 0:
+        return None
+    mu20, mu02, mu11 = m['mu20'] / m['m00'], m['mu02'] / m['m00'], m['mu11'] / m['m00']
+    if abs(mu20 - mu02) < 1e-9 and abs(mu11) < 1e-9:
+        return None
+    return 0.5 * np.degrees(np.arctan2(2.0 * mu11, mu20 - mu02))
+
+
+def box_axis(mask, box):
+    '''
+
+    Returns the orientation of the major axis of the foreground pixels of a mask inside a bounding box (x, y, w, h)
+    in degrees w.r.t. +X axis in the image (-90 to 90), None if they are round or there are none (see blob_axis)
+
+    '''
+    x, y, w, h = [int(v) for v in box]
+    return blob_axis(cv2.moments(mask[y:y + h, x:x + w], True))
+
+
+def heading(axis, motion=None, reference=None, minmotion=2.0):
+    '''
+
+    Returns the heading along the major axis of a blob: of the two directions of the axis, the one closest to a
+    reference heading (the last one: an object turns less than 90 deg between two images, whichever way it drives),
+    else, without reference, the one closest to the direction of motion if the object moved at least minmotion
+    pixels (it is assumed to drive forward), else the axis itself
+    :param axis: orientation of the axis in degrees (-90 to 90), see blob_axis
+    :param motion: displacement (dx, dy) of the object in pixels, None if unknown
+    :param reference: heading in degrees, None if unknown
+    :return: heading in degrees w.r.t. +X axis in the image (-180 to 180)
+
+    '''
+    if reference is None and motion is not None and np.hypot(motion[0], motion[1]) >= minmotion:
+        reference = np.degrees(np.arctan2(motion[1], motion[0]))
+    if reference is None:
+        return axis
+    # difference to the reference in (-180, 180]
+    difference = (axis - reference + 180.0) % 360.0 - 180.0
+    if abs(difference) > 90.0:
+        axis = axis + 180.0 if axis < 0 else axis - 180.0
+    return axis
+
+
+class MaskFilter(object):
+    '''
+
+    This class runs the segmentation stage of an observer: downscaling of the images, and the filters turning the
+    foreground mask of the background subtractor into the final mask the blobs are found in (threshold, hole filling,
+    closing). Every step writes into work buffers owned by the filter, allocated on first use for the frame size and
+    reused for every frame, in place where possible, so that no image is allocated per frame at steady state.
+
+    The blobs are found with contours, or with connected components while the previous mask had many blobs (noise
+    stays for several frames, e.g. under lighting changes), whichever is faster (see COMPONENTS_CROSSOVER).
+
+    '''
+
+    def __init__(self, threshold=None, fillholes=False, kernel=None, iterations=2):
+        self.threshold = threshold # foreground pixels are above threshold in the mask (e.g. to drop shadows, 127 with MOG2), None for binary masks
+        self.fillholes = fillholes # if True, holes enclosed by foreground are filled (flood fill of the background from the top left corner)
+        self.kernel = kernel # structuring element of the closing, None for no closing
+        self.iterations = iterations # number of iterations of the closing
+        self.pyramidpools = [] # buffers of the downscaled images, one per level
+        self.foregroundpool = FramePool(size=1) # buffer of the foreground mask of the background subtractor
+        self.finalpool = FramePool(size=1) # buffer of the final mask
+        self.floodpool = FramePool(size=1) # buffer of the flood filled mask
+        self.floodmaskpool = FramePool(size=1) # buffer of the mask of floodFill, 2 pixels wider and taller
+        self.labelspool = FramePool(size=1) # buffer of the labels of the connected components
+        self.scratchpool = FramePool(size=1) # buffer of the copy of the mask for findContours
+        self.blobcount = 0 # number of blobs in the last mask, selects contours or connected components for the next one
+
+    def downscale(self, img, levels):
+        '''
+
+        Halves an image levels times (gaussian pyramid), returns the image itself for 0 levels
+        :return: downscaled image, valid until the next call
+
+        '''
+        while len(self.pyramidpools) < levels:
+            self.pyramidpools.append(FramePool(size=1))
+        for i in range(levels):
+            shape = ((img.shape[0] + 1) // 2, (img.shape[1] + 1) // 2) + img.shape[2:]
+            img = cv2.pyrDown(img, self.pyramidpools[i].get(shape, img.dtype))
+        return img
+
+    def subtract(self, fgbg, img, levels, learningrate):
+        '''
+
+        Applies a background subtractor to an image downscaled levels times (see downscale)
+        :return: foreground mask, valid until the next call
+
+        '''
+        img = self.downscale(img, levels)
+        return fgbg.apply(img, self.foregroundpool.get(img.shape[:2]), learningrate)
+
+    def apply(self, mask):
+        '''
+
+        Filters a foreground mask, the mask itself is not modified
+        :param mask: 8 bit single channel foreground mask
+        :return: final mask, valid until the next call
+
+        '''
+        final = self.finalpool.get(mask.shape)
+        if self.threshold is not None:
+            cv2.threshold(mask, self.threshold, 255, cv2.THRESH_BINARY, final)
+        else:
+            np.copyto(final, mask)
+        if self.fillholes:
+            # flood fill the background from the top left corner, enclosed holes remain black. The inverted result
+            # holds the holes only, OR-ed into the mask it fills them
+            flood = self.floodpool.get(mask.shape)
+            np.copyto(flood, final)
+            floodmask = self.floodmaskpool.get((mask.shape[0] + 2, mask.shape[1] + 2))
+            floodmask.fill(0)
+            cv2.floodFill(flood, floodmask, (0, 0), 255)
+            cv2.bitwise_not(flood, flood)
+            cv2.bitwise_or(final, flood, final)
+        if self.kernel is not None:
+            cv2.morphologyEx(final, cv2.MORPH_CLOSE, self.kernel, final, iterations=self.iterations)
+        return final
+
+    def find_blobs(self, mask):
+        '''
+
+        Finds the blobs of a mask (see find_blobs) with the work buffers of the filter, with connected components if
+        the previous mask had at least COMPONENTS_CROSSOVER blobs, else with contours
+
+        '''
+        if HAVE_COMPONENTS and self.blobcount >= COMPONENTS_CROSSOVER:
+            blobs = find_blobs(mask, True, labels=self.labelspool.get(mask.shape, np.int32))
+        else:
+            blobs = find_blobs(mask, False, scratch=self.scratchpool.get(mask.shape))
+        self.blobcount = len(blobs[0])
+        return blobs
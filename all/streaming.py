@@ -0,0 +1,268 @@
+#!/usr/bin/env python
+
+import time
+
+import numpy as np
+
+import vrep
+
+
+class Stream(object):
+    '''
+
+    One quantity streamed from the simulator: the function reading it in a given operation mode, the latest valid
+    value and when the first valid value arrived
+
+    '''
+
+    def __init__(self, read, view=False):
+        self.read = read # read(operationMode) returns (return code, value)
+        self.view = view # if True, values are views on the remote api buffer and are not kept
+        self.value = None # latest valid value, None until the first one arrived (always None for views)
+        self.copy = None # copy of the latest view, to tell a new value from the same one read again
+        self.subscribed = time.time() # wall clock time at which streaming was requested
+        self.firstvalid = None # wall clock time at which the first valid value was read
+        self.time = None # simulation time in ms of the last reply received when the latest value was first read
+        self.serial = 0 # number of different values read, identifies the latest value
+
+    def ready(self):
+        return self.firstvalid is not None
+
+    def update(self, value):
+        '''
+
+        Records a value read from the buffer, returns True if it differs from the previous one
+
+        '''
+        if self.view:
+            if self.copy is not None and self.copy.shape == value.shape and np.array_equal(self.copy, value):
+                return False
+            if self.copy is None or self.copy.shape != value.shape or self.copy.dtype != value.dtype:
+                self.copy = np.empty(value.shape, dtype=value.dtype)
+            np.copyto(self.copy, value)
+        else:
+            if self.serial > 0 and equal(self.value, value):
+                return False
+            self.value = value
+        self.serial += 1
+        return True
+
+
+def equal(a, b):
+    '''
+
+    Compares two values of a stream: numbers, numpy arrays, and lists or tuples of them
+
+    '''
+    if isinstance(a, np.ndarray) or isinstance(b, np.ndarray):
+        return np.shape(a) == np.shape(b) and np.array_equal(a, b)
+    if isinstance(a, (list, tuple)) and isinstance(b, (list, tuple)):
+        return len(a) == len(b) and all(equal(x, y) for x, y in zip(a, b))
+    return a == b
+
+
+class StreamManager(object):
+    '''
+
+    This class registers the quantities read from vrep in streaming mode (simx_opmode_streaming) and serves them
+    from the local input buffer of the remote api (simx_opmode_buffer), i.e. without round trip to the server.
+    It keeps track of the arrival of the first valid reply of every stream, so that callers wait exactly until data
+    is available instead of sleeping a fixed time, and numbers the different values of every stream (see serial).
+
+    The subscribe functions are idempotent and return the key of the stream, which is used with latest() and
+    wait(). Use get_manager to obtain the manager of a client, so that all objects sharing a connection share the
+    streams.
+
+    '''
+
+    def __init__(self, clientID):
+        self.ID = clientID
+        self.streams = {} # key -> Stream
+        self.step = None # in synchronous mode, function executing one simulation step, used by wait()
+
+    def subscribe(self, key, read, view=False):
+        '''
+
+        Starts streaming of a quantity, if not already done
+        :param key: key identifying the stream
+        :param read: read(operationMode) returning (return code, value)
+        :param view: True if the values are views on the remote api buffer, which the next remote api call may
+        overwrite or free: they are never returned after the read that produced them (see latest)
+        :return: key
+
+        '''
+        if key not in self.streams:
+            self.streams[key] = Stream(read, view)
+            read(vrep.simx_opmode_streaming)
+        return key
+
+    def subscribe_image(self, sensorhandle, options=0):
+        '''
+
+        Streams the image of a vision sensor. The value is a view on the remote api buffer (see
+        vrep.simxGetVisionSensorImageArray), valid until the next remote api call, so it must be consumed (or copied)
+        right away. latest() returns None instead of the previous image when the read fails.
+
+        '''
+        def read(mode):
+            ret, res, img = vrep.simxGetVisionSensorImageArray(self.ID, sensorhandle, options, mode, copy=False)
+            return ret, img
+        return self.subscribe(('image', sensorhandle, options), read, view=True)
+
+    def subscribe_depth(self, sensorhandle):
+        '''
+
+        Streams the depth buffer of a vision sensor. The value is a view on the remote api buffer (see
+        vrep.simxGetVisionSensorDepthBufferArray), valid until the next remote api call, so it must be consumed (or
+        copied) right away. latest() returns None instead of the previous buffer when the read fails.
+
+        '''
+        def read(mode):
+            ret, res, depth = vrep.simxGetVisionSensorDepthBufferArray(self.ID, sensorhandle, mode, copy=False)
+            return ret, depth
+        return self.subscribe(('depth', sensorhandle), read, view=True)
+
+    def subscribe_vision(self, sensorhandle):
+        '''
+
+        Streams the results of the filters of a vision sensor (see vrep.simxReadVisionSensorArray), e.g. the blobs of
+        a blob detection filter. The value is (detection state, list of packets of auxiliary values).
+
+        '''
+        def read(mode):
+            ret, detectionstate, packets = vrep.simxReadVisionSensorArray(self.ID, sensorhandle, mode)
+            return ret, (detectionstate, packets)
+        return self.subscribe(('vision', sensorhandle), read)
+
+    def subscribe_pose(self, objecthandle, relativeto=-1):
+        '''
+
+        Streams the position and orientation (euler angles) of an object. The value is (position, orientation).
+
+        '''
+        def read(mode):
+            ret1, position = vrep.simxGetObjectPosition(self.ID, objecthandle, relativeto, mode)
+            ret2, orientation = vrep.simxGetObjectOrientation(self.ID, objecthandle, relativeto, mode)
+            return ret1 | ret2, (position, orientation)
+        return self.subscribe(('pose', objecthandle, relativeto), read)
+
+    def subscribe_joint(self, jointhandle):
+        '''
+
+        Streams the position of a joint (angle in rad for revolute joints)
+
+        '''
+        def read(mode):
+            return vrep.simxGetJointPosition(self.ID, jointhandle, mode)
+        return self.subscribe(('joint', jointhandle), read)
+
+    def subscribe_velocity(self, objecthandle):
+        '''
+
+        Streams the velocity of an object. The value is (linear velocity, angular velocity).
+
+        '''
+        def read(mode):
+            ret, linear, angular = vrep.simxGetObjectVelocity(self.ID, objecthandle, mode)
+            return ret, (linear, angular)
+        return self.subscribe(('velocity', objecthandle), read)
+
+    def unsubscribe(self, key):
+        '''
+
+        Stops streaming of a quantity on the server
+
+        '''
+        stream = self.streams.pop(key, None)
+        if stream is not None:
+            stream.read(vrep.simx_opmode_discontinue)
+
+    def latest(self, key):
+        '''
+
+        Reads the latest reply of a stream from the local input buffer, non-blocking
+        :return: return code of the buffer read, latest valid value (from this read if the return code is
+        simx_return_ok, else the previous one; None if no valid value arrived yet, and for streams of views when the
+        read failed, the previous view may not be valid anymore)
+
+        '''
+        stream = self.streams[key]
+        ret, value = stream.read(vrep.simx_opmode_buffer)
+        if ret == vrep.simx_return_ok:
+            if stream.update(value):
+                # simulation time of the last message received (local call). It is the same for all streams of the
+                # connection, it does not identify the value
+                stream.time = vrep.simxGetLastCmdTime(self.ID)
+            if stream.firstvalid is None:
+                stream.firstvalid = time.time()
+            return ret, value
+        return ret, stream.value
+
+    def timestamp(self, key):
+        '''
+
+        Returns the simulation time in ms of the last message received from the server when the latest value of a
+        stream was first read, i.e. about when it was produced. Use serial to identify the value.
+
+        '''
+        return self.streams[key].time
+
+    def serial(self, key):
+        '''
+
+        Returns the number of different values read from a stream so far, which identifies the latest value: polling
+        faster than the simulator produces new values returns the same value and serial. The values are compared
+        with the previous one of the same stream (a copy for the streams of views), so reads of other streams do not
+        change it. A value equal to the previous one (e.g. the image of a scene at rest) is not a new value.
+
+        '''
+        return self.streams[key].serial
+
+    def ready(self, key):
+        '''
+
+        Returns True if a valid value of the stream has arrived
+
+        '''
+        return self.streams[key].ready()
+
+    def wait(self, keys=None, timeout=5.0, period=0.005):
+        '''
+
+        Waits until a first valid value of all given streams (all streams if None) has arrived, stepping the
+        simulation meanwhile in synchronous mode
+        :param timeout: maximum time to wait in s
+        :param period: time between two polls of the input buffer in s
+        :return: True if all streams are ready, False on timeout
+
+        '''
+        if keys is None:
+            keys = list(self.streams.keys())
+        deadline = time.time() + timeout
+        while True:
+            for key in keys:
+                if not self.streams[key].ready():
+                    self.latest(key)
+            if all(self.streams[key].ready() for key in keys):
+                return True
+            if time.time() > deadline:
+                return False
+            if self.step is not None:
+                # in synchronous mode nothing arrives unless the simulation is stepped
+                self.step()
+            else:
+                time.sleep(period)
+
+
+managers = {} # clientID -> StreamManager
+
+
+def get_manager(clientID):
+    '''
+
+    Returns the stream manager of a client, created on first use
+
+    '''
+    if clientID not in managers:
+        managers[clientID] = StreamManager(clientID)
+    return managers[clientID]
@@ -0,0 +1,45 @@
+import itertools
+import os
+import sys
+
+import pytest
+
+# the modules of the package import each other by their plain names (implicit relative imports of python 2)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import vrep
+import vrepfake
+
+ports = itertools.count(19900) # ports of the fake simulators of the tests, below those of benchmark.py
+
+
+@pytest.fixture
+def fakeserver():
+    '''
+
+    Fake simulator (see vrepfake) advancing one step per image read, with the fake backend selected
+    :return: port of the simulator, FakeSimulator
+
+    '''
+    vrep.useBackend('fake')
+    sim = vrepfake.FakeSimulator(realtime=False)
+    port = next(ports)
+    vrepfake.addSimulator(port, sim)
+    yield port, sim
+    vrep.useBackend('remote')
+
+
+@pytest.fixture
+def fakesim(fakeserver):
+    '''
+
+    Connection to a fake simulator, with the simulation started
+    :return: clientID, FakeSimulator
+
+    '''
+    port, sim = fakeserver
+    clientID = vrep.simxStart('127.0.0.1', port, True, True, 5000, 5)
+    vrep.simxStartSimulation(clientID, vrep.simx_opmode_oneshot_wait)
+    yield clientID, sim
+    vrep.simxStopSimulation(clientID, vrep.simx_opmode_oneshot_wait)
+    vrep.simxFinish(clientID)
@@ -0,0 +1,35 @@
+import sys
+
+import pytest
+
+import vrep
+
+# async/await, see aiovrep.py
+pytestmark = pytest.mark.skipif(sys.version_info < (3, 5), reason='aiovrep needs python 3.5')
+
+
+def run(coroutine):
+    import asyncio
+    return asyncio.new_event_loop().run_until_complete(coroutine)
+
+
+def test_handles_and_requests(fakesim):
+    from aiovrep import AsyncVrep
+    clientID, sim = fakesim
+    aio = AsyncVrep(clientID, period=0.0)
+    assert run(aio.handle('Pioneer_p3dx')) == (vrep.simx_return_ok, sim.names['Pioneer_p3dx'])
+    assert aio.handles.loaded
+    ret, handle = run(aio.handle('Missing'))
+    assert ret == vrep.simx_return_remote_error_flag
+    ret, position = run(aio.request(vrep.simxGetObjectPosition, sim.names['Pioneer_p3dx'], -1))
+    assert ret == vrep.simx_return_ok and position[:2] == [0.0, 0.0]
+
+
+def test_drive_to(fakesim):
+    from aiovrep import AsyncVrep, drive_to
+    clientID, sim = fakesim
+    sim.realtime = True
+    sim.dt = 0.01
+    aio = AsyncVrep(clientID, period=0.001)
+    position = run(drive_to(aio, 'Pioneer_p3dx', (0.3, 0.0), tolerance=0.05))
+    assert abs(position[0] - 0.3) < 0.05 and abs(position[1]) < 0.05
@@ -0,0 +1,31 @@
+import numpy as np
+
+from blobs import BlobSource, parse_blobs
+
+
+def test_parse_blobs():
+    packet = [2, 8] + list(range(8)) + list(range(10, 18)) + [99]
+    blobs = parse_blobs(np.array(packet, dtype=np.float32))
+    # values beyond the 6 of every blob, and after the last blob, are dropped
+    assert blobs.dtype == np.float32
+    assert blobs.tolist() == [list(range(6)), list(range(10, 16))]
+    assert parse_blobs([0, 6]).shape == (0, 6)
+    assert parse_blobs([]).shape == (0, 6)
+
+
+def test_position_of_the_largest_blob(fakesim):
+    clientID, sim = fakesim
+    sim.poses[0] = [0.5, 0.25, np.radians(30.0)]
+    source = BlobSource(clientID, sim.visionhandle)
+    assert source.resolution == (640, 480)
+    position, found = source.get_position()
+    assert found and source.frameid == 1
+    # the first image row is the bottom of the scene, positions have their origin at the top left
+    expected = (320 + 0.5 * sim.ppm, 240 - 0.25 * sim.ppm)
+    assert abs(position[0] - expected[0]) <= 1 and abs(position[1] - expected[1]) <= 1
+    assert np.isclose(source.axis, -30.0)
+    # the scene is at rest, the blobs of the next step are the same
+    source.get_position()
+    assert source.frameid == 1
+    sim.poses[0, :2] = 100.0
+    assert source.get_position() == (None, False)
@@ -0,0 +1,73 @@
+import threading
+
+import vrep
+from car import VrepCar
+from client import VrepClient, batch, pauses
+
+
+def test_batch_pauses_once_when_nested(monkeypatch):
+    calls = []
+    monkeypatch.setattr(vrep, 'simxPauseCommunication', lambda clientID, enable: calls.append((clientID, enable)))
+    with batch(7):
+        with batch(7):
+            with batch(8):
+                pass
+        assert calls == [(7, True), (8, True), (8, False)]
+    assert calls[-1] == (7, False) and len(calls) == 4
+    assert 7 not in pauses
+
+
+def test_batch_nesting_across_threads(monkeypatch):
+    calls = []
+    monkeypatch.setattr(vrep, 'simxPauseCommunication', lambda clientID, enable: calls.append(enable))
+    entered = threading.Event()
+    release = threading.Event()
+
+    def command():
+        with batch(9):
+            entered.set()
+            release.wait(5)
+    thread = threading.Thread(target=command)
+    thread.start()
+    entered.wait(5)
+    # the block of this thread nests in the one of the other thread, which outlives it
+    with batch(9):
+        pass
+    assert calls == [True]
+    release.set()
+    thread.join()
+    assert calls == [True, False]
+    assert 9 not in pauses
+
+
+def test_car_commands_share_a_packet(fakesim):
+    clientID, sim = fakesim
+    car = VrepCar(clientID, 'Pioneer_p3dx_leftMotor', 'Pioneer_p3dx_rightMotor')
+    car.command((1.0, 2.0))
+    assert sim.wheels[0].tolist() == [1.0, 2.0]
+    with batch(clientID):
+        car.command_v_w(1.0, 0.5)
+        # queued until the outermost block exits
+        assert sim.wheels[0].tolist() == [1.0, 2.0]
+    assert sim.wheels[0].tolist() == [0.5, 1.5]
+
+
+def test_lockstep(fakeserver):
+    port, sim = fakeserver
+    client = VrepClient(port=port, synchronous=True)
+    clientID = client.start()
+    try:
+        assert sim.synchronous and sim.running and client.dt == sim.dt
+        assert client.step() == 50 and sim.steps == 1
+        client.wait(0.2)
+        assert sim.steps == 5
+        # reads do not advance the simulation, the first streamed image is waited for by stepping
+        _, sensor = vrep.simxGetObjectHandle(clientID, 'Vision_sensor', vrep.simx_opmode_oneshot_wait)
+        key = client.streams.subscribe_image(sensor)
+        assert client.streams.wait([key], timeout=1.0)
+        assert sim.steps == 6
+        vrep.simxGetVisionSensorImageArray(clientID, sensor, 0, vrep.simx_opmode_oneshot_wait)
+        assert sim.steps == 6
+    finally:
+        client.stop()
+    assert not sim.running
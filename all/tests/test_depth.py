@@ -0,0 +1,48 @@
+import numpy as np
+
+from depth import DepthProjector, DepthSource
+
+
+def test_projection_of_the_clipping_planes():
+    projector = DepthProjector(np.radians(90.0), 0.5, 4.5)
+    w, h = 4, 2
+    near = projector.project(np.zeros((h, w), dtype=np.float32))
+    far = projector.project(np.ones((h, w), dtype=np.float32))
+    assert near.shape == (w * h, 3) and near.dtype == np.float32
+    assert np.allclose(near[:, 2], 0.5) and np.allclose(far[:, 2], 4.5)
+    # points of a pixel are on a ray through the origin
+    assert np.allclose(far, 9.0 * near, atol=1e-5)
+
+
+def test_rays_of_the_pixel_centers():
+    # 90 deg over the larger dimension: the image spans x in [-z, z]
+    projector = DepthProjector(np.radians(90.0), 1.0, 2.0)
+    points = projector.project(np.zeros((2, 4), dtype=np.float32)).reshape(2, 4, 3)
+    # x decreases from the left to the right column, y increases from the bottom (first) to the top row
+    assert np.allclose(points[0, :, 0], [0.75, 0.25, -0.25, -0.75])
+    assert np.allclose(points[:, 0, 1], [-0.25, 0.25])
+
+
+def test_rays_are_cached_per_resolution():
+    projector = DepthProjector(1.0, 0.1, 10.0)
+    rays = projector.get_rays((4, 2))
+    assert projector.get_rays([4, 2]) is rays
+    assert projector.get_rays((2, 4)) is not rays
+    out = np.empty((8, 3), dtype=np.float32)
+    assert projector.project(np.full((2, 4), 0.5, dtype=np.float32), out=out) is out
+
+
+def test_obstacles_of_the_fake_scene(fakesim):
+    clientID, sim = fakesim
+    # the depth buffer of a stream arrives with the next simulation step, without image reads stepping it
+    sim.realtime = True
+    source = DepthSource(clientID, sim.visionhandle)
+    points = source.get_pointcloud()
+    assert points.shape == (640 * 480, 3)
+    # the floor, at the height of the vision sensor
+    assert np.allclose(np.median(points[:, 2]), sim.height, atol=1e-3)
+    obstacles = source.get_obstacles(sim.height - 0.1)
+    # the roof of the car, about its size
+    assert np.allclose(obstacles[:, 2], sim.height - sim.carsize[2], atol=1e-3)
+    area = sim.carsize[0] * sim.carsize[1] * sim.ppm ** 2
+    assert abs(len(obstacles) - area) < 0.1 * area
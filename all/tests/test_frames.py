@@ -0,0 +1,64 @@
+import numpy as np
+
+from frames import FramePool, bgr_to_vrep, vrep_to_bgr, vrep_to_gray
+
+
+def test_pool_rotates_through_its_buffers():
+    pool = FramePool(size=3)
+    frames = [pool.get((4, 5, 3)) for i in range(6)]
+    assert all(f.shape == (4, 5, 3) and f.dtype == np.uint8 for f in frames)
+    assert len(set(id(f) for f in frames[:3])) == 3
+    # the ring starts over, a buffer is not handed out again before size further calls
+    assert [f is g for f, g in zip(frames[:3], frames[3:])] == [True, True, True]
+
+
+def test_pool_reallocates_on_a_new_shape_or_dtype():
+    pool = FramePool(size=2)
+    first = pool.get((4, 5, 3))
+    other = pool.get((2, 2))
+    assert other.shape == (2, 2) and other is not first
+    assert pool.get((2, 2), np.float32).dtype == np.float32
+    assert pool.get([2, 2], np.float32).shape == (2, 2)
+
+
+def vrep_image(h=4, w=5):
+    # rgb image with bottom-left origin, every pixel distinct
+    return np.arange(h * w * 3, dtype=np.uint8).reshape(h, w, 3)
+
+
+def test_vrep_to_bgr_view():
+    image = vrep_image()
+    bgr = vrep_to_bgr(image)
+    assert np.may_share_memory(bgr, image)
+    assert np.array_equal(bgr, image[::-1, :, ::-1])
+
+
+def test_vrep_to_bgr_into_buffers():
+    image = vrep_image()
+    out = np.zeros_like(image)
+    scratch = np.zeros_like(image)
+    bgr = vrep_to_bgr(image, out, scratch)
+    assert bgr is out
+    assert bgr.flags['C_CONTIGUOUS']
+    # the first row of the result is the last one of the vision sensor image, red and blue swapped
+    assert np.array_equal(bgr, image[::-1, :, ::-1])
+    assert bgr[0, 0].tolist() == [image[-1, 0, 2], image[-1, 0, 1], image[-1, 0, 0]]
+
+
+def test_vrep_to_gray():
+    image = np.arange(12, dtype=np.uint8).reshape(3, 4, 1)
+    assert np.array_equal(vrep_to_gray(image), image[::-1, :, 0])
+    out = np.zeros((3, 4), dtype=np.uint8)
+    assert vrep_to_gray(image, out) is out
+    assert np.array_equal(out, image[::-1, :, 0])
+
+
+def test_bgr_to_vrep_inverts_vrep_to_bgr():
+    image = vrep_image()
+    bgr = vrep_to_bgr(image, np.empty_like(image))
+    assert np.array_equal(bgr_to_vrep(bgr), image)
+    out = np.empty_like(image)
+    assert bgr_to_vrep(bgr, out, np.empty_like(image)) is out
+    assert np.array_equal(out, image)
+    grey = np.arange(12, dtype=np.uint8).reshape(3, 4)
+    assert np.array_equal(bgr_to_vrep(grey), grey[::-1])
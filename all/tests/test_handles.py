@@ -0,0 +1,55 @@
+import vrep
+from handles import HandleRegistry, get_registry
+
+
+def record_calls(monkeypatch, name):
+    # counts the calls of a remote api function
+    calls = []
+    function = getattr(vrep, name)
+
+    def recorded(*args):
+        calls.append(args)
+        return function(*args)
+    monkeypatch.setattr(vrep, name, recorded)
+    return calls
+
+
+def test_all_handles_in_one_call(fakesim, monkeypatch):
+    clientID, sim = fakesim
+    bulk = record_calls(monkeypatch, 'simxGetObjectGroupDataArray')
+    single = record_calls(monkeypatch, 'simxGetObjectHandle')
+    registry = HandleRegistry(clientID)
+    for name in ['Vision_sensor', 'Pioneer_p3dx', 'Pioneer_p3dx_leftMotor', 'Pioneer_p3dx_rightMotor']:
+        assert registry.get(name) == (vrep.simx_return_ok, sim.names[name])
+    assert len(bulk) == 1 and single == []
+
+
+def test_fallback_to_single_lookups(fakesim, monkeypatch):
+    clientID, sim = fakesim
+    single = record_calls(monkeypatch, 'simxGetObjectHandle')
+    registry = HandleRegistry(clientID)
+    registry.load()
+    # an object added to the scene after the bulk read
+    handle = sim.add_object('Cuboid', 'cuboid', 0)
+    assert registry.get('Cuboid') == (vrep.simx_return_ok, handle)
+    assert registry.get('Cuboid') == (vrep.simx_return_ok, handle)
+    assert len(single) == 1
+    ret, handle = registry.get('Missing')
+    assert ret == vrep.simx_return_remote_error_flag and 'Missing' not in registry.handles
+
+
+def test_fallback_when_the_bulk_read_fails(fakesim, monkeypatch):
+    clientID, sim = fakesim
+    monkeypatch.setattr(vrep, 'simxGetObjectGroupDataArray', lambda *args: (vrep.simx_return_timeout_flag, [], [],
+                                                                            [], []))
+    single = record_calls(monkeypatch, 'simxGetObjectHandle')
+    registry = HandleRegistry(clientID)
+    assert registry.get('Vision_sensor') == (vrep.simx_return_ok, sim.visionhandle)
+    assert registry.loaded and len(single) == 1
+    registry.invalidate()
+    assert not registry.loaded and registry.handles == {}
+
+
+def test_one_registry_per_client():
+    assert get_registry(100) is get_registry(100)
+    assert get_registry(101) is not get_registry(100)
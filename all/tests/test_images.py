@@ -0,0 +1,63 @@
+import numpy as np
+
+from images import ImageReader
+
+
+class SimulationReader(ImageReader):
+    # image source of the vision sensor of a fake simulator
+    def __init__(self, clientID, visionhandle):
+        self.ID = clientID
+        self.visionhandle = visionhandle
+        self.setup_images()
+
+
+class Capture(object):
+    # video capture returning frames with a frame counter as pixel value
+    def __init__(self):
+        self.count = 0
+        self.frames = []
+
+    def read(self, frame=None):
+        if frame is None:
+            frame = np.empty((4, 5, 3), dtype=np.uint8)
+        frame[...] = self.count
+        self.count += 1
+        self.frames.append(frame)
+        return True, frame
+
+
+def test_simulation_images(fakesim):
+    clientID, sim = fakesim
+    reader = SimulationReader(clientID, sim.visionhandle)
+    image = reader.read_simulation()
+    assert image.shape == (480, 640, 3) and reader.frameid == 1
+    bgr = reader.convert_simulation(image)
+    assert bgr is reader.img and np.array_equal(bgr, image[::-1, :, ::-1])
+    # the scene is at rest: the same image is not read again
+    assert reader.read_simulation() is None and reader.frameid == 1
+    sim.wheels[...] = 5.0
+    assert reader.read_simulation() is not None and reader.frameid == 2
+
+
+def test_grayscale_switch(fakesim):
+    clientID, sim = fakesim
+    reader = SimulationReader(clientID, sim.visionhandle)
+    reader.convert_simulation(reader.read_simulation())
+    reader.grayscale = True
+    grey = reader.read_simulation()
+    assert grey is not None and grey.shape == (480, 640, 1)
+    # the colour stream is stopped, the grey one numbers its own images
+    assert ('image', sim.visionhandle) not in sim.streams and reader.frameid == 1
+    assert reader.convert_simulation(grey).shape == (480, 640)
+
+
+def test_capture_into_the_frame_pool():
+    reader = SimulationReader(None, None)
+    reader.cap = Capture()
+    first = reader.read_capture()
+    assert reader.frameid == 0
+    frames = [reader.read_capture() for i in range(3)]
+    assert reader.frameid == 3 and frames[-1][0, 0, 0] == 3
+    # the frames after the first one are read into the buffers of the pool
+    assert all(f is g for f, g in zip(frames, reader.cap.frames[1:]))
+    assert frames[0] is not frames[1] and first is not frames[0]
@@ -0,0 +1,59 @@
+import json
+
+import instrumentation
+import vrep
+from instrumentation import CallStats, Instrumentation
+
+
+def test_enable_and_disable_restore_the_functions(fakesim):
+    clientID, sim = fakesim
+    original = vrep.simxGetObjectHandle
+    instrumented = Instrumentation()
+    instrumented.enable()
+    try:
+        assert vrep.simxGetObjectHandle is not original
+        assert vrep.simxGetObjectHandle.__name__ == 'simxGetObjectHandle'
+        vrep.simxGetObjectHandle(clientID, 'Vision_sensor', vrep.simx_opmode_oneshot_wait)
+        vrep.simxGetObjectHandle(clientID, 'Missing', vrep.simx_opmode_oneshot_wait)
+        vrep.simxGetLastCmdTime(clientID)
+    finally:
+        instrumented.disable()
+    assert vrep.simxGetObjectHandle is original
+    stats = instrumented.stats['simxGetObjectHandle']
+    assert stats.count == 2 and sum(stats.histogram) == 2
+    assert stats.returncodes == {vrep.simx_return_ok: 1, vrep.simx_return_remote_error_flag: 1}
+    assert stats.errors() == 1
+    # the name and the operation mode are sent, the return code and the handle returned
+    assert stats.bytesout == len('Vision_sensor') + len('Missing') + 8 and stats.bytesin == 16
+    # functions without return code
+    assert instrumented.stats['simxGetLastCmdTime'].returncodes == {None: 1}
+
+
+def test_module_functions(fakesim, tmpdir):
+    clientID, sim = fakesim
+    original = vrep.simxGetPingTime
+    instrumented = instrumentation.enable()
+    try:
+        vrep.simxGetPingTime(clientID)
+        # enabling again replaces the previous instrumentation
+        assert instrumentation.enable() is not instrumented
+        assert vrep.simxGetPingTime.__name__ == 'simxGetPingTime'
+        vrep.simxGetPingTime(clientID)
+    finally:
+        again = instrumentation.disable()
+    assert vrep.simxGetPingTime is original
+    assert again.stats['simxGetPingTime'].count == 1
+    filename = str(tmpdir.join('stats.json'))
+    data = again.dump(filename)
+    with open(filename) as f:
+        assert json.load(f) == json.loads(json.dumps(data))
+    assert 'simxGetPingTime' in again.summary()
+
+
+def test_latency_percentiles():
+    stats = CallStats('simxGetPingTime')
+    for latency in [1e-6] * 98 + [1e-3, 2e-3]:
+        stats.add(latency, vrep.simx_return_ok, 0, 0)
+    assert stats.percentile(50) <= 2e-6
+    assert 1e-3 <= stats.percentile(99.5) <= 2e-3
+    assert stats.percentile(100) == 2e-3
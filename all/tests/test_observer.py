@@ -0,0 +1,27 @@
+import cv2
+import numpy as np
+import pytest
+
+from observer import VrepObserver
+
+# the observers record their debug video with the OpenCV 2.4 api
+pytestmark = pytest.mark.skipif(not hasattr(cv2, 'cv'), reason='needs OpenCV 2.4')
+
+
+def test_orientation_from_server_blobs(fakesim, monkeypatch, tmpdir):
+    monkeypatch.chdir(str(tmpdir)) # video.avi of the observer
+    clientID, sim = fakesim
+    observer = VrepObserver(clientID, 'Vision_sensor')
+    observer.serverblobs = True
+    # heading 150 deg anticlockwise in the scene, -150 deg in the image (y axis downward)
+    sim.poses[0, 2] = np.radians(150.0)
+    position, found = observer.get_position()
+    assert found and observer.orientation is None
+    # the blob axis has no front, the motion of the car selects it
+    sim.wheels[...] = 5.0
+    assert abs(observer.get_orientation() + 150.0) < 1.0
+    # then the last heading does, also when the car drives backward
+    sim.wheels[...] = -5.0
+    for i in range(3):
+        assert abs(observer.get_orientation() + 150.0) < 1.0
+    assert observer.position[0] > position[0]
@@ -0,0 +1,22 @@
+import numpy as np
+
+from observerv2 import ImageSource
+
+
+def test_grayscale_switch(fakesim):
+    clientID, sim = fakesim
+    source = ImageSource('simulation', ID=clientID, visionsensor_name='Vision_sensor')
+    image = source.grab_image()
+    assert image.shape == (480, 640, 3) and image.flags['C_CONTIGUOUS']
+    assert tuple(image[240, 320]) == sim.carcolour[::-1]
+    rgbkey = source.imagekey
+    source.grayscale = True
+    grey = source.grab_image()
+    assert grey.shape == (480, 640) and grey[240, 320] == sim.luminance(sim.carcolour)
+    # the colour stream is stopped on the server, the grey one numbers its own images
+    assert ('image', sim.visionhandle) not in sim.streams and ('image_bw', sim.visionhandle) in sim.streams
+    assert source.imagekey != rgbkey and source.frameid == 1
+    source.contiguous = False
+    source.grayscale = False
+    view = source.grab_image()
+    assert not view.flags['C_CONTIGUOUS'] and np.array_equal(view, image)
@@ -0,0 +1,55 @@
+import vrep
+from pacing import Pacer
+
+
+class FakeClock(object):
+    # simulation time of the last reply, as returned by simxGetLastCmdTime
+    def __init__(self):
+        self.simtime = 0
+
+    def __call__(self, clientID):
+        return self.simtime
+
+
+def test_poll_counts_new_and_missed_steps(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(vrep, 'simxGetLastCmdTime', clock)
+    pacer = Pacer(0, dt=0.05)
+    assert pacer.poll()
+    assert not pacer.poll()
+    clock.simtime = 50
+    assert pacer.poll() and pacer.missed == 0
+    assert pacer.period is not None
+    # two steps went by unprocessed
+    clock.simtime = 200
+    assert pacer.poll() and pacer.missed == 2
+    # restart of the simulation
+    clock.simtime = 0
+    assert pacer.poll() and pacer.missed == 2
+
+
+def test_wait(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(vrep, 'simxGetLastCmdTime', clock)
+    pacer = Pacer(0, dt=0.05, pollperiod=0.001)
+    assert pacer.wait()
+    assert not pacer.wait(timeout=0.01)
+    clock.simtime = 50
+    assert pacer.wait(timeout=0.01)
+    assert pacer.rate() > 0
+
+
+def test_smoothing():
+    pacer = Pacer(0, smoothing=0.5)
+    assert pacer.smooth(None, 2.0) == 2.0
+    assert pacer.smooth(2.0, 4.0) == 3.0
+    assert pacer.rate() is None
+
+
+def test_pacing_of_the_fake_simulator(fakesim):
+    clientID, sim = fakesim
+    pacer = Pacer(clientID, dt=sim.dt)
+    assert pacer.ping() == 0.0
+    assert pacer.poll() and not pacer.poll()
+    sim.step(3)
+    assert pacer.wait(timeout=0.1) and pacer.missed == 2
@@ -0,0 +1,27 @@
+import numpy as np
+
+from pool import ClientPool, aggregate, drive
+from vrepfake import FakeSimulator
+
+
+def test_ports():
+    assert ClientPool.ports(3, first=20000) == [('127.0.0.1', 20000), ('127.0.0.1', 20001), ('127.0.0.1', 20002)]
+
+
+def test_aggregate():
+    summary = aggregate([({'a': 1}, [1.0, 3.0]), ({'a': 2}, [[0.0, 1.0], [2.0, 1.0]])])
+    params, mean, std, lo, hi = summary[0]
+    assert params == {'a': 1} and (mean, std, lo, hi) == (2.0, 1.0, 1.0, 3.0)
+    params, mean, std, lo, hi = summary[1]
+    assert mean.tolist() == [1.0, 1.0] and std.tolist() == [1.0, 0.0]
+
+
+def test_sweep_on_fake_instances():
+    # ports of the fake simulators of the tests, one simulator per worker process
+    pool = ClientPool(ClientPool.ports(2, first=19950), synchronous=True, fake=True, simulator=FakeSimulator)
+    results = pool.sweep(drive, {'u': [(1, 1), (2, 2)], 'duration': [0.5]}, repeat=2)
+    assert [params['u'] for params, values in results] == [(1, 1), (2, 2)]
+    for params, values in results:
+        # every episode starts from the initial scene, the car drives straight along x for 10 steps
+        distance = FakeSimulator.wheelradius * params['u'][0] * 0.5
+        assert np.allclose(values, [[distance, 0.0]] * 2)
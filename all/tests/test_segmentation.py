@@ -0,0 +1,180 @@
+import cv2
+import numpy as np
+import pytest
+
+import segmentation
+from segmentation import MaskFilter, blob_axis, box_axis, box_center, find_blobs, heading, label_blobs, largest_blob, \
+    refine_blob
+
+
+def rectangles(shape=(60, 80)):
+    # mask with three blobs: two rectangles and a single pixel
+    mask = np.zeros(shape, dtype=np.uint8)
+    mask[10:20, 5:25] = 255
+    mask[30:50, 40:46] = 255
+    mask[55, 70] = 255
+    return mask
+
+
+def noise(shape=(120, 160), seed=0):
+    return (np.random.RandomState(seed).rand(*shape) > 0.7).astype(np.uint8) * 255
+
+
+def sort_blobs(blobs):
+    # blobs in the order of their bounding boxes, the order of the labels differs between the implementations
+    areas, boxes, centroids = blobs
+    order = np.lexsort(np.asarray(boxes).T[::-1])
+    return areas[order], boxes[order], centroids[order]
+
+
+def test_contours():
+    mask = rectangles()
+    original = mask.copy()
+    areas, boxes, centroids = sort_blobs(find_blobs(mask))
+    assert np.array_equal(mask, original)
+    assert boxes.tolist() == [[5, 10, 20, 10], [40, 30, 6, 20], [70, 55, 1, 1]]
+    # areas enclosed by the outer contours, through the centres of the border pixels
+    assert areas.tolist() == [19 * 9, 5 * 19, 0]
+    assert np.allclose(centroids, [[14.5, 14.5], [42.5, 39.5], [70, 55]])
+    assert [len(a) for a in find_blobs(np.zeros((5, 5), dtype=np.uint8))] == [0, 0, 0]
+
+
+@pytest.mark.skipif(not segmentation.HAVE_COMPONENTS, reason='needs OpenCV 3 or scipy')
+def test_components():
+    areas, boxes, centroids = sort_blobs(find_blobs(rectangles(), True))
+    assert boxes.tolist() == [[5, 10, 20, 10], [40, 30, 6, 20], [70, 55, 1, 1]]
+    # areas are pixel counts
+    assert areas.tolist() == [200, 120, 1]
+    assert np.allclose(centroids, [[14.5, 14.5], [42.5, 39.5], [70, 55]])
+    labels = np.empty((60, 80), dtype=np.int32)
+    areas, boxes, centroids = find_blobs(np.zeros((60, 80), dtype=np.uint8), True, labels=labels)
+    assert len(areas) == 0 and boxes.shape == (0, 4)
+
+
+@pytest.mark.skipif(segmentation.ndimage is None, reason='needs scipy')
+def test_label_blobs_matches_opencv():
+    mask = noise()
+    labelled = sort_blobs(label_blobs(mask))
+    assert len(labelled[0]) > 100
+    assert int(labelled[0].sum()) == np.count_nonzero(mask)
+    if segmentation.HAVE_CV_COMPONENTS:
+        # 8-connected blobs, measured as by OpenCV
+        for a, b in zip(labelled, sort_blobs(find_blobs(mask, True))):
+            assert np.allclose(a, b)
+
+
+@pytest.mark.skipif(segmentation.ndimage is None, reason='needs scipy')
+def test_components_with_scipy(monkeypatch):
+    # OpenCV 2.4 has no connected components
+    monkeypatch.setattr(segmentation, 'HAVE_CV_COMPONENTS', False)
+    areas, boxes, centroids = sort_blobs(find_blobs(rectangles(), True))
+    assert areas.tolist() == [200, 120, 1]
+    assert boxes.tolist() == [[5, 10, 20, 10], [40, 30, 6, 20], [70, 55, 1, 1]]
+
+
+def test_largest_blob():
+    assert largest_blob(np.array([5.0, 30.0, 25.0])) == 1
+    assert largest_blob(np.array([5.0, 10.0])) is None
+    assert largest_blob(np.array([5.0, 10.0]), minarea=10) == 1
+    assert largest_blob(np.zeros(0)) is None
+    assert box_center((10, 20, 5, 6)) == (12, 23)
+
+
+def car(shape=(240, 320), center=(150.0, 100.0), size=(60, 30), angle=30.0):
+    # mask of a rotated rectangle, angle in degrees clockwise in the image (y axis downward)
+    mask = np.zeros(shape, dtype=np.uint8)
+    boxpoints = cv2.boxPoints if hasattr(cv2, 'boxPoints') else cv2.cv.BoxPoints # OpenCV 2.4
+    corners = np.array(boxpoints((center, size, angle)))
+    cv2.fillConvexPoly(mask, np.rint(corners).astype(np.int32), 255)
+    return mask
+
+
+def test_refine_blob():
+    mask = car()
+    scale = 4
+    small = cv2.resize(mask, (mask.shape[1] // scale, mask.shape[0] // scale), interpolation=cv2.INTER_AREA)
+    _, small = cv2.threshold(small, 127, 255, cv2.THRESH_BINARY)
+    areas, boxes, centroids = find_blobs(small)
+    box, centroid, axis = refine_blob(small, boxes[largest_blob(areas)], scale)
+    # the full resolution measurements, up to a fraction of the downscaling
+    fullbox = find_blobs(mask)[1][0]
+    assert np.abs(np.array(box) - fullbox).max() <= scale / 2
+    assert np.hypot(centroid[0] - 150.0, centroid[1] - 100.0) <= 1.0
+    assert abs(axis - 30.0) <= 2.0
+    # without blob in the patch, the box of the downscaled mask is scaled
+    empty = np.zeros_like(small)
+    assert refine_blob(empty, (2, 3, 4, 5), scale) == ((8, 12, 16, 20), (16.0, 22.0), None)
+
+
+def test_blob_axis():
+    assert abs(blob_axis(cv2.moments(car(angle=-45.0), True)) + 45.0) < 0.5
+    assert abs(abs(blob_axis(cv2.moments(car(angle=90.0), True))) - 90.0) < 0.5
+    square = np.zeros((20, 20), dtype=np.uint8)
+    square[5:15, 5:15] = 1
+    assert blob_axis(cv2.moments(square, True)) is None
+    assert blob_axis(cv2.moments(np.zeros((4, 4), dtype=np.uint8), True)) is None
+
+
+def subtractor():
+    if hasattr(cv2, 'createBackgroundSubtractorMOG2'):
+        return cv2.createBackgroundSubtractorMOG2(history=2, varThreshold=2, detectShadows=True)
+    return cv2.BackgroundSubtractorMOG2(history=2, varThreshold=2, bShadowDetection=True) # OpenCV 2.4
+
+
+def test_mask_filter_reuses_its_buffers():
+    maskfilter = MaskFilter(threshold=100, fillholes=True, kernel=np.ones((3, 3), dtype=np.uint8))
+    fgbg = subtractor()
+    background = np.full((120, 160, 3), 100, dtype=np.uint8)
+    maskfilter.subtract(fgbg, background, 1, 0.5)
+    buffers = None
+    for i in range(4):
+        img = background.copy()
+        img[20:40, 30 + 10 * i:60 + 10 * i] = 250
+        mask = maskfilter.subtract(fgbg, img, 1, 0.5)
+        final = maskfilter.apply(mask)
+        assert mask.shape == final.shape == (60, 80)
+        areas, boxes, centroids = maskfilter.find_blobs(final)
+        assert largest_blob(areas) is not None
+        # every stage writes into the same buffers on every frame
+        current = [m.__array_interface__['data'][0] for m in (maskfilter.downscale(img, 1), mask, final)]
+        assert buffers is None or current == buffers
+        buffers = current
+
+
+def test_mask_filter_fills_holes_and_closes():
+    mask = np.zeros((40, 40), dtype=np.uint8)
+    mask[10:30, 10:30] = 255
+    mask[15:25, 15:25] = 0 # hole
+    final = MaskFilter(fillholes=True).apply(mask)
+    assert np.count_nonzero(final) == 400
+    # the mask is not modified
+    assert mask[20, 20] == 0
+    mask[15:25, 15:25] = 255
+    mask[10:30, 20] = 0 # crack, open to the background
+    assert np.count_nonzero(MaskFilter(fillholes=True).apply(mask)) == 380
+    closed = MaskFilter(kernel=np.ones((3, 3), dtype=np.uint8), iterations=1).apply(mask)
+    assert np.count_nonzero(closed) == 400
+
+
+def test_box_axis():
+    mask = car(angle=-30.0)
+    box = find_blobs(mask)[1][0]
+    assert abs(box_axis(mask, box) + 30.0) < 1.0
+    # only the pixels inside the box count
+    mask[:10, :10] = 255
+    assert abs(box_axis(mask, box) + 30.0) < 1.0
+
+
+def test_heading():
+    # the axis alone does not tell the front of the object
+    assert heading(30.0) == 30.0
+    assert heading(30.0, motion=(1.0, 0.5)) == 30.0
+    # driving forward
+    assert heading(30.0, motion=(-10.0, -6.0)) == -150.0
+    # the last heading selects the direction closest to it, also when the object drives backward
+    assert heading(30.0, motion=(10.0, 6.0), reference=-160.0) == -150.0
+    assert heading(-80.0, reference=95.0) == 100.0
+    # continuous across the ends of the axis range and across +-180 deg
+    assert heading(89.0, reference=-89.0) == -91.0
+    assert heading(-89.0, reference=-91.0) == -89.0
+    assert heading(5.0, reference=179.0) == -175.0
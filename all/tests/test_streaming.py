@@ -0,0 +1,118 @@
+import numpy as np
+import pytest
+
+import vrep
+from streaming import StreamManager, get_manager
+
+
+class FakeRead(object):
+    # read function of a stream, returning the given replies to the buffer reads and recording the operation modes
+    def __init__(self, *replies):
+        self.replies = list(replies)
+        self.modes = []
+
+    def __call__(self, mode):
+        self.modes.append(mode)
+        if mode != vrep.simx_opmode_buffer or not self.replies:
+            return vrep.simx_return_novalue_flag, None
+        return self.replies.pop(0)
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    # the last command time is read from the remoteApi library
+    monkeypatch.setattr(vrep, 'simxGetLastCmdTime', lambda clientID: 1234)
+    return StreamManager(0)
+
+
+def test_subscribe_is_idempotent(manager):
+    read = FakeRead()
+    assert manager.subscribe('key', read) == 'key'
+    assert manager.subscribe('key', FakeRead()) == 'key'
+    assert manager.streams['key'].read is read
+    assert read.modes == [vrep.simx_opmode_streaming]
+    manager.unsubscribe('key')
+    assert read.modes[-1] == vrep.simx_opmode_discontinue
+    assert 'key' not in manager.streams
+    manager.unsubscribe('key')
+    assert len(read.modes) == 2
+
+
+def test_latest_keeps_the_last_valid_value(manager):
+    read = FakeRead((vrep.simx_return_novalue_flag, None), (vrep.simx_return_ok, [1.0, 2.0]),
+                    (vrep.simx_return_timeout_flag, None))
+    manager.subscribe('pose', read)
+    assert manager.latest('pose') == (vrep.simx_return_novalue_flag, None)
+    assert not manager.ready('pose')
+    assert manager.latest('pose') == (vrep.simx_return_ok, [1.0, 2.0])
+    assert manager.ready('pose') and manager.timestamp('pose') == 1234
+    # a failed read returns the previous value with the return code of the read
+    assert manager.latest('pose') == (vrep.simx_return_timeout_flag, [1.0, 2.0])
+
+
+def test_latest_never_returns_a_stale_view(manager):
+    buffer = np.arange(6, dtype=np.uint8)
+    read = FakeRead((vrep.simx_return_ok, buffer), (vrep.simx_return_novalue_flag, None))
+    manager.subscribe('image', read, view=True)
+    ret, image = manager.latest('image')
+    assert image is buffer
+    # the view may have been overwritten or freed by the next remote api call
+    assert manager.latest('image') == (vrep.simx_return_novalue_flag, None)
+
+
+def test_wait(manager):
+    manager.subscribe('a', FakeRead((vrep.simx_return_novalue_flag, None), (vrep.simx_return_ok, 1)))
+    manager.subscribe('b', FakeRead((vrep.simx_return_ok, 2)))
+    assert manager.wait(timeout=1.0, period=0.0)
+    assert manager.ready('a') and manager.ready('b')
+    manager.subscribe('never', FakeRead())
+    assert not manager.wait(['never'], timeout=0.01, period=0.001)
+
+
+def test_one_manager_per_client():
+    assert get_manager(100) is get_manager(100)
+    assert get_manager(101) is not get_manager(100)
+
+
+def test_serial_counts_different_values_per_stream(manager):
+    manager.subscribe('a', FakeRead((vrep.simx_return_ok, (1, [2.0])), (vrep.simx_return_ok, (1, [2.0])),
+                                    (vrep.simx_return_novalue_flag, None), (vrep.simx_return_ok, (1, [3.0]))))
+    manager.subscribe('b', FakeRead((vrep.simx_return_ok, 5)))
+    assert manager.serial('a') == 0
+    manager.latest('a')
+    manager.latest('b')
+    manager.latest('a')
+    # an equal value, or a value of another stream, is no new value
+    assert manager.serial('a') == 1 and manager.serial('b') == 1
+    manager.latest('a')
+    assert manager.serial('a') == 1
+    manager.latest('a')
+    assert manager.serial('a') == 2
+
+
+def test_serial_of_views(manager):
+    buffer = np.zeros((2, 3), dtype=np.uint8)
+    read = FakeRead(*[(vrep.simx_return_ok, buffer)] * 3)
+    manager.subscribe('image', read, view=True)
+    manager.latest('image')
+    # the buffer is overwritten in place by the remote api, the stream compares with a copy of the previous view
+    manager.latest('image')
+    assert manager.serial('image') == 1
+    buffer[1, 2] = 1
+    manager.latest('image')
+    assert manager.serial('image') == 2
+
+
+def test_serial_of_the_images_of_the_fake_simulator(fakesim):
+    clientID, sim = fakesim
+    manager = StreamManager(clientID)
+    _, sensor = vrep.simxGetObjectHandle(clientID, 'Vision_sensor', vrep.simx_opmode_oneshot_wait)
+    key = manager.subscribe_image(sensor)
+    assert manager.wait([key], timeout=1.0)
+    # the scene is at rest, every read steps the simulation but renders the same image
+    manager.latest(key)
+    assert manager.serial(key) == 1
+    sim.wheels[...] = 5.0
+    manager.latest(key)
+    manager.latest(key)
+    assert manager.serial(key) == 3
@@ -0,0 +1,43 @@
+import numpy as np
+
+from tracking import RoiTracker
+
+
+def frame(i, shape=(120, 160)):
+    # grey floor with a bright car of 20x10 pixels driving 3 pixels per frame to the right
+    img = np.full(shape, 100, dtype=np.uint8)
+    x = 20 + 3 * i
+    img[50:60, x:x + 20] = 200
+    return img, (x, 50, 20, 10)
+
+
+def test_tracking_in_a_window():
+    tracker = RoiTracker(refreshperiod=5, learningrate=0.02)
+    empty = np.full((120, 160), 100, dtype=np.uint8)
+    for i in range(tracker.warmup - 1):
+        assert tracker.learn(empty, None) is None
+    # the blob of the background subtractor seeds the tracking once the background image is learned
+    img, box = frame(2)
+    assert tracker.track(img) is None
+    assert tuple(tracker.learn(img, box)) == box
+    for i in range(3, 8):
+        img, box = frame(i)
+        assert tuple(tracker.track(img)) == box
+        # the window follows the predicted position and is much smaller than the frame
+        x0, y0, x1, y1 = tracker.window
+        assert x0 <= box[0] and box[0] + box[2] <= x1 and (x1 - x0) * (y1 - y0) < img.size / 4
+    assert np.allclose(tracker.velocity, [3, 0])
+    # a full frame search is due after refreshperiod frames
+    assert tracker.track(frame(8)[0]) is None
+
+
+def test_lost_object():
+    tracker = RoiTracker(warmup=1)
+    img, box = frame(0)
+    tracker.learn(img, box)
+    empty = np.full(img.shape, 100, dtype=np.uint8)
+    assert tracker.track(empty) is None
+    assert tracker.box is None
+    # frames of another size are not tracked
+    tracker.learn(img, box)
+    assert tracker.track(np.full((60, 80), 100, dtype=np.uint8)) is None
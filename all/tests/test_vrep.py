@@ -0,0 +1,240 @@
+import ctypes as ct
+
+import numpy as np
+import pytest
+
+import vrep
+
+
+def cfunction(monkeypatch, name, function):
+    # replaces a function of the remoteApi library by a python function with the same ctypes prototype, so that the
+    # decoding of its results in vrep.py runs without the library
+    c = getattr(vrep, name)
+    prototype = getattr(c, 'prototype', type(c))
+    callback = prototype(function)
+    monkeypatch.setattr(vrep, name, callback)
+    return callback
+
+
+def address(array):
+    return array.__array_interface__['data'][0]
+
+
+def test_image_array_wraps_the_c_buffer(monkeypatch):
+    w, h = 4, 3
+    data = (ct.c_byte * (w * h * 3))(*[i % 128 for i in range(w * h * 3)])
+
+    def get_image(clientID, handle, resolution, image, options, mode):
+        resolution[0] = w
+        resolution[1] = h
+        image[0] = ct.cast(data, ct.POINTER(ct.c_byte))
+        return vrep.simx_return_ok
+    cfunction(monkeypatch, 'c_GetVisionSensorImage', get_image)
+
+    ret, reso, view = vrep.simxGetVisionSensorImageArray(0, 1, 0, vrep.simx_opmode_buffer, copy=False)
+    assert ret == vrep.simx_return_ok
+    assert reso == [w, h]
+    assert view.shape == (h, w, 3) and view.dtype == np.uint8
+    assert address(view) == ct.addressof(data)
+    assert view.ravel().tolist() == [i % 128 for i in range(w * h * 3)]
+
+    ret, reso, copy = vrep.simxGetVisionSensorImageArray(0, 1, 0, vrep.simx_opmode_buffer)
+    assert address(copy) != ct.addressof(data)
+    assert np.array_equal(copy, view)
+
+    out = np.zeros((h, w, 3), dtype=np.uint8)
+    ret, reso, image = vrep.simxGetVisionSensorImageArray(0, 1, 0, vrep.simx_opmode_buffer, out=out)
+    assert image is out
+    assert np.array_equal(out, view)
+
+
+def test_image_array_grey(monkeypatch):
+    data = (ct.c_byte * 6)(*range(6))
+
+    def get_image(clientID, handle, resolution, image, options, mode):
+        resolution[0] = 3
+        resolution[1] = 2
+        image[0] = ct.cast(data, ct.POINTER(ct.c_byte))
+        return vrep.simx_return_ok
+    cfunction(monkeypatch, 'c_GetVisionSensorImage', get_image)
+
+    ret, reso, image = vrep.simxGetVisionSensorImageArray(0, 1, 1, vrep.simx_opmode_buffer)
+    assert image.shape == (2, 3, 1)
+    assert image.ravel().tolist() == list(range(6))
+
+
+def test_image_array_no_value(monkeypatch):
+    cfunction(monkeypatch, 'c_GetVisionSensorImage', lambda *args: vrep.simx_return_novalue_flag)
+    ret, reso, image = vrep.simxGetVisionSensorImageArray(0, 1, 0, vrep.simx_opmode_buffer)
+    assert ret == vrep.simx_return_novalue_flag
+    assert reso == [] and image is None
+
+
+def test_depth_buffer_array(monkeypatch):
+    data = (ct.c_float * 6)(*[0.5, 0.25, 1.0, 0.0, 0.75, 0.125])
+
+    def get_depth(clientID, handle, resolution, buffer, mode):
+        resolution[0] = 3
+        resolution[1] = 2
+        buffer[0] = ct.cast(data, ct.POINTER(ct.c_float))
+        return vrep.simx_return_ok
+    cfunction(monkeypatch, 'c_GetVisionSensorDepthBuffer', get_depth)
+
+    ret, reso, view = vrep.simxGetVisionSensorDepthBufferArray(0, 1, vrep.simx_opmode_buffer, copy=False)
+    assert reso == [3, 2]
+    assert view.shape == (2, 3) and view.dtype == np.float32
+    assert address(view) == ct.addressof(data)
+    assert view.tolist() == [[0.5, 0.25, 1.0], [0.0, 0.75, 0.125]]
+    out = np.zeros((2, 3), dtype=np.float32)
+    ret, reso, depth = vrep.simxGetVisionSensorDepthBufferArray(0, 1, vrep.simx_opmode_buffer, out=out)
+    assert depth is out and np.array_equal(out, view)
+
+
+@pytest.mark.parametrize('values', [[], [0], [1, -2, 2147483647, -2147483648], list(range(-500, 500))])
+def test_pack_unpack_ints(values):
+    packed = vrep.simxPackInts(values)
+    assert bytes(packed) == np.array(values, dtype='<i4').tobytes()
+    assert bytes(vrep.simxPackInts(tuple(values))) == bytes(packed)
+    assert bytes(vrep.simxPackInts(np.array(values, dtype=np.int64))) == bytes(packed)
+    assert vrep.simxUnpackInts(packed) == values
+    assert vrep.simxUnpackIntsArray(packed).tolist() == values
+
+
+def test_pack_unpack_floats():
+    values = [0.0, 1.5, -2.25, 1e-3, 3.0e8]
+    packed = vrep.simxPackFloats(values)
+    expected = np.array(values, dtype=np.float32)
+    assert bytes(packed) == expected.tobytes()
+    assert bytes(vrep.simxPackFloats(expected)) == bytes(packed)
+    assert vrep.simxUnpackFloats(packed) == expected.tolist()
+    assert np.array_equal(vrep.simxUnpackFloatsArray(packed), expected)
+
+
+def test_unpack_array_shares_the_packed_data():
+    packed = bytearray(vrep.simxPackInts([1, 2, 3]) + b'\x07')
+    array = vrep.simxUnpackIntsArray(packed)
+    # a trailing partial value is ignored, as in simxUnpackInts
+    assert array.tolist() == [1, 2, 3]
+    packed[0:4] = vrep.simxPackInts([9])
+    assert array[0] == 9
+
+
+def test_group_data_array(monkeypatch):
+    handles = (ct.c_int * 3)(10, 11, 12)
+    ints = (ct.c_int * 6)(1, 2, 3, 4, 5, 6)
+    floats = (ct.c_float * 3)(0.5, 1.5, 2.5)
+    # strings one after the other, each with its null character, the empty one too; the block is followed by
+    # unrelated memory
+    strings = ct.create_string_buffer(b'Pioneer_p3dx\0\0Vision_sensor\0garbage', 40)
+
+    def get_group_data(clientID, objectType, dataType, handlesC, handlesP, intC, intP, floatC, floatP, stringC,
+                       stringP, mode):
+        handlesC[0] = 3
+        handlesP[0] = ct.cast(handles, ct.POINTER(ct.c_int))
+        intC[0] = 6
+        intP[0] = ct.cast(ints, ct.POINTER(ct.c_int))
+        floatC[0] = 3
+        floatP[0] = ct.cast(floats, ct.POINTER(ct.c_float))
+        stringC[0] = 3
+        stringP[0] = ct.cast(strings, ct.POINTER(ct.c_char))
+        return vrep.simx_return_ok
+    cfunction(monkeypatch, 'c_GetObjectGroupData', get_group_data)
+
+    ret, h, i, f, s = vrep.simxGetObjectGroupDataArray(0, vrep.sim_appobj_object_type, 0,
+                                                        vrep.simx_opmode_oneshot_wait)
+    assert ret == vrep.simx_return_ok
+    assert h.dtype == np.int32 and h.tolist() == [10, 11, 12]
+    # flat, as in simxGetObjectGroupData
+    assert i.shape == (6,) and i.tolist() == [1, 2, 3, 4, 5, 6]
+    assert f.shape == (3,) and f.tolist() == [0.5, 1.5, 2.5]
+    assert list(s) == ['Pioneer_p3dx', '', 'Vision_sensor']
+    # copies, valid after the C buffers change
+    handles[0] = 99
+    assert h[0] == 10
+
+
+def test_group_data_array_no_values(monkeypatch):
+    cfunction(monkeypatch, 'c_GetObjectGroupData', lambda *args: vrep.simx_return_remote_error_flag)
+    ret, h, i, f, s = vrep.simxGetObjectGroupDataArray(0, vrep.sim_appobj_object_type, 0,
+                                                        vrep.simx_opmode_oneshot_wait)
+    assert ret == vrep.simx_return_remote_error_flag
+    assert len(h) == len(i) == len(f) == len(s) == 0
+
+
+def test_library_is_loaded_on_first_call(monkeypatch, tmpdir):
+    # the module is imported without library, the first call searches it at the configured path first
+    path = str(tmpdir.join('remoteApi.so'))
+    monkeypatch.setattr(vrep, 'libsimx', None)
+    monkeypatch.setattr(vrep, 'libsimxPath', None)
+    vrep.setLibraryPath(path)
+    try:
+        vrep.loadLibrary()
+    except OSError as e:
+        assert path in str(e)
+    else:
+        pytest.skip('a remoteApi library is installed next to vrep.py or in the working directory')
+    with pytest.raises(OSError):
+        vrep.simxGetPingTime(0)
+
+
+def set_image_recorder(monkeypatch):
+    # records the address and the bytes of the image passed to the library
+    calls = []
+
+    def set_image(clientID, handle, image, size, options, mode):
+        calls.append((ct.cast(image, ct.c_void_p).value, ct.string_at(image, size)))
+        return vrep.simx_return_ok
+    cfunction(monkeypatch, 'c_SetVisionSensorImage', set_image)
+    return calls
+
+
+def test_set_image_passes_arrays_without_copy(monkeypatch):
+    calls = set_image_recorder(monkeypatch)
+    image = np.arange(2 * 3 * 3, dtype=np.uint8).reshape(2, 3, 3)
+    assert vrep.simxSetVisionSensorImage(0, 1, image, 0, vrep.simx_opmode_oneshot) == vrep.simx_return_ok
+    assert calls[-1] == (address(image), image.tobytes())
+    # a strided view is made contiguous first
+    vrep.simxSetVisionSensorImage(0, 1, image[::-1], 0, vrep.simx_opmode_oneshot)
+    assert calls[-1][1] == image[::-1].tobytes()
+
+
+def test_set_image_bytes_and_sequences(monkeypatch):
+    calls = set_image_recorder(monkeypatch)
+    vrep.simxSetVisionSensorImage(0, 1, b'\x01\x02\xff', 1, vrep.simx_opmode_oneshot)
+    assert calls[-1][1] == b'\x01\x02\xff'
+    vrep.simxSetVisionSensorImage(0, 1, bytearray(b'\x03\x04'), 1, vrep.simx_opmode_oneshot)
+    assert calls[-1][1] == b'\x03\x04'
+    # sequences of signed bytes, as returned by simxGetVisionSensorImage
+    vrep.simxSetVisionSensorImage(0, 1, [1, -1, 5], 1, vrep.simx_opmode_oneshot)
+    assert calls[-1][1] == b'\x01\xff\x05'
+
+
+def test_set_image_rejects_other_dtypes(monkeypatch):
+    calls = set_image_recorder(monkeypatch)
+    with pytest.raises(ValueError):
+        vrep.simxSetVisionSensorImage(0, 1, np.ones((2, 2, 3), dtype=np.float32), 0, vrep.simx_opmode_oneshot)
+    assert calls == []
+
+
+def test_read_vision_sensor_array(monkeypatch):
+    # packet 0: 15 image statistics, packet 1: a blob detection filter with 2 blobs of 6 values
+    counts = (ct.c_int * 3)(2, 15, 14)
+    values = (ct.c_float * 29)(*range(29))
+    released = []
+
+    def read_vision_sensor(clientID, handle, state, auxValues, auxValuesCount, mode):
+        state[0] = 1
+        auxValues[0] = ct.cast(values, ct.POINTER(ct.c_float))
+        auxValuesCount[0] = ct.cast(counts, ct.POINTER(ct.c_int))
+        return vrep.simx_return_ok
+    cfunction(monkeypatch, 'c_ReadVisionSensor', read_vision_sensor)
+    cfunction(monkeypatch, 'c_ReleaseBuffer', lambda buffer: released.append(buffer) or 0)
+
+    ret, state, packets = vrep.simxReadVisionSensorArray(0, 1, vrep.simx_opmode_buffer)
+    assert ret == vrep.simx_return_ok and state is True
+    assert [p.tolist() for p in packets] == [list(range(15)), list(range(15, 29))]
+    assert all(p.dtype == np.float32 for p in packets)
+    # both C buffers are released, the packets are copies
+    assert len(released) == 2
+    values[20] = -1
+    assert packets[1][5] == 20
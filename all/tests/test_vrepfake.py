@@ -0,0 +1,93 @@
+import numpy as np
+
+import vrep
+import vrepfake
+
+
+def test_backend_switch():
+    remote = vrep.simxStart
+    vrep.useBackend('fake')
+    try:
+        assert vrep.simxStart is vrepfake.simxStart
+        assert vrep.simxGetVisionSensorImageArray is vrepfake.simxGetVisionSensorImageArray
+    finally:
+        vrep.useBackend('remote')
+    assert vrep.simxStart is remote
+
+
+def test_streaming_replies_from_the_next_step(fakesim):
+    clientID, sim = fakesim
+    ret, handle = vrep.simxGetObjectHandle(clientID, 'Vision_sensor', vrep.simx_opmode_oneshot_wait)
+    assert ret == vrep.simx_return_ok
+    # the first streaming call only registers the stream, as in vrep
+    ret, reso, image = vrep.simxGetVisionSensorImageArray(clientID, handle, 0, vrep.simx_opmode_streaming)
+    assert ret == vrep.simx_return_novalue_flag and image is None
+    ret, reso, image = vrep.simxGetVisionSensorImageArray(clientID, handle, 0, vrep.simx_opmode_buffer)
+    assert ret == vrep.simx_return_ok
+    assert reso == [640, 480] and image.shape == (480, 640, 3) and image.dtype == np.uint8
+    ret, handle = vrep.simxGetObjectHandle(clientID, 'Missing', vrep.simx_opmode_oneshot_wait)
+    assert ret == vrep.simx_return_remote_error_flag
+
+
+def test_rendering_of_the_car(fakesim):
+    clientID, sim = fakesim
+    ret, handle = vrep.simxGetObjectHandle(clientID, 'Vision_sensor', vrep.simx_opmode_oneshot_wait)
+    ret, reso, image = vrep.simxGetVisionSensorImageArray(clientID, handle, 0, vrep.simx_opmode_oneshot_wait)
+    # the car starts at the origin, below the vision sensor
+    assert tuple(image[240, 320]) == sim.carcolour
+    assert tuple(image[0, 0]) == sim.floorcolour
+    ret, reso, grey = vrep.simxGetVisionSensorImageArray(clientID, handle, 1, vrep.simx_opmode_oneshot_wait)
+    assert grey.shape == (480, 640, 1)
+    assert grey[240, 320, 0] == sim.luminance(sim.carcolour)
+    ret, reso, depth = vrep.simxGetVisionSensorDepthBufferArray(clientID, handle, vrep.simx_opmode_oneshot_wait)
+    assert depth.shape == (480, 640) and depth.dtype == np.float32
+    # the roof of the car is closer to the sensor than the floor
+    assert depth[240, 320] < depth[0, 0]
+
+
+def test_car_kinematics(fakesim):
+    clientID, sim = fakesim
+    ret, sensor = vrep.simxGetObjectHandle(clientID, 'Vision_sensor', vrep.simx_opmode_oneshot_wait)
+    ret, car = vrep.simxGetObjectHandle(clientID, 'Pioneer_p3dx', vrep.simx_opmode_oneshot_wait)
+    ret, left = vrep.simxGetObjectHandle(clientID, 'Pioneer_p3dx_leftMotor', vrep.simx_opmode_oneshot_wait)
+    ret, right = vrep.simxGetObjectHandle(clientID, 'Pioneer_p3dx_rightMotor', vrep.simx_opmode_oneshot_wait)
+    vrep.simxSetJointTargetVelocity(clientID, left, 2.0, vrep.simx_opmode_oneshot)
+    vrep.simxSetJointTargetVelocity(clientID, right, 2.0, vrep.simx_opmode_oneshot)
+    # without realtime, the simulation advances one step per image read
+    for i in range(10):
+        vrep.simxGetVisionSensorImageArray(clientID, sensor, 0, vrep.simx_opmode_oneshot_wait)
+    ret, position = vrep.simxGetObjectPosition(clientID, car, -1, vrep.simx_opmode_oneshot_wait)
+    assert np.allclose(position[:2], [sim.wheelradius * 2.0 * 10 * sim.dt, 0.0])
+
+    # turning on the spot, the car stays where it is
+    vrep.simxSetJointTargetVelocity(clientID, left, -1.0, vrep.simx_opmode_oneshot)
+    vrep.simxSetJointTargetVelocity(clientID, right, 1.0, vrep.simx_opmode_oneshot)
+    sim.step(4)
+    ret, turned = vrep.simxGetObjectPosition(clientID, car, -1, vrep.simx_opmode_oneshot_wait)
+    assert np.allclose(turned, position)
+    w = 2 * sim.wheelradius / sim.axle
+    assert np.isclose(sim.poses[0, 2], w * 4 * sim.dt)
+
+
+def test_stop_restores_the_scene(fakesim):
+    clientID, sim = fakesim
+    sim.wheels[...] = 1.0
+    sim.step(5)
+    vrep.simxStopSimulation(clientID, vrep.simx_opmode_oneshot_wait)
+    assert np.array_equal(sim.poses, sim.initialposes) and sim.steps == 0
+
+
+def test_injected_images(fakesim):
+    clientID, sim = fakesim
+    w, h = sim.resolution
+    image = np.zeros((h, w, 3), dtype=np.uint8)
+    image[:, :, 2] = 255
+    vrep.simxSetVisionSensorImage(clientID, sim.visionhandle, image, 0, vrep.simx_opmode_oneshot)
+    # the image set replaces the rendered scene, as for a passive vision sensor
+    sim.step()
+    ret, reso, rgb = vrep.simxGetVisionSensorImageArray(clientID, sim.visionhandle, 0, vrep.simx_opmode_oneshot_wait)
+    assert np.array_equal(rgb, image)
+    ret, reso, grey = vrep.simxGetVisionSensorImageArray(clientID, sim.visionhandle, 1, vrep.simx_opmode_oneshot_wait)
+    assert (grey == sim.luminance((0, 0, 255))).all()
+    assert vrep.simxSetVisionSensorImage(clientID, sim.visionhandle, image[:10], 0,
+                                         vrep.simx_opmode_oneshot) == vrep.simx_return_remote_error_flag
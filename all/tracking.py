@@ -0,0 +1,162 @@
+#!/usr/bin/env python
+
+import cv2
+import numpy as np
+
+from segmentation import box_axis, find_blobs, largest_blob
+
+
+class RoiTracker(object):
+    '''
+
+    This class tracks the foreground object(car) in a window around its predicted position, once it has been found
+    in a full frame, so that the observer only processes a small part of every image at steady state.
+
+    The background subtractor of the observer needs every pixel of every frame, hence within the window the
+    foreground is the difference to a background image instead: a running average of the frames with the same
+    learning rate, i.e. objects at rest fade into it as they do into the background model. It is updated with the
+    full frames and, in between, with the windows. The window is centered on the position predicted from the
+    velocity of the object (pixels per frame) and sized from the bounding box of its last blob plus the distance it
+    moves per frame. Tracking starts once warmup full frames were averaged into the background image.
+
+    The position of the object is the bounding box of its blob in the difference image, in the windows and on the
+    full frames as well (the blob of the background subtractor only seeds the tracking), so that it does not jump
+    between both. track() returns None whenever a full frame search is needed: nothing tracked yet, the object lost
+    (no blob in the window, or a blob extending outside of a window grown twice) and every refreshperiod frames, so
+    that the background model and the background image keep learning.
+
+    '''
+
+    def __init__(self, margin=1.5, threshold=30, minarea=20, refreshperiod=10, learningrate=0.1, warmup=10):
+        self.margin = margin # window size relative to the size of the last blob
+        self.threshold = threshold # minimum difference to the background image of a foreground pixel
+        self.minarea = minarea # blobs smaller than minarea pixels are noise
+        self.refreshperiod = refreshperiod # number of frames tracked in a window between two full frame searches
+        self.learningrate = learningrate # weight of a frame in the background image
+        self.warmup = warmup # number of full frames averaged into the background image before tracking starts
+        self.learned = 0 # number of full frames learned
+        self.background = None # running average of the full frames (float32)
+        self.background8 = None # background image as 8 bit image, compared with the windows
+        self.box = None # bounding box (x, y, w, h) of the last blob found, None if not tracking
+        self.velocity = np.zeros(2) # motion of the center of the bounding box in pixels per frame
+        self.tracked = 0 # number of frames tracked in a window since the last full frame search
+        self.kernel = np.ones((3, 3), dtype=np.uint8) # structuring element closing the window mask
+        self.window = None # last window (x0, y0, x1, y1) searched, for debug
+        self.axis = None # orientation of the major axis of the last blob found in degrees (-90 to 90), see segmentation.blob_axis
+
+    def learn(self, img, box):
+        '''
+
+        Updates the background image after a full frame search of the observer and finds the whole object around the
+        blob of the observer (or around its last position if tracking)
+        :param img: the full frame
+        :param box: bounding box (x, y, w, h) of the largest blob of the observer, None if not found
+        :return: bounding box (x, y, w, h) of the object, None if not tracking
+
+        '''
+        if self.background is None or self.background.shape != img.shape:
+            self.background = img.astype(np.float32)
+            self.learned = 0
+        else:
+            # plain average of the first frames, so that objects moving meanwhile fade out of the background image
+            rate = max(self.learningrate, 1.0 / (self.learned + 1))
+            cv2.accumulateWeighted(img, self.background, rate)
+        self.learned += 1
+        self.background8 = cv2.convertScaleAbs(self.background, self.background8)
+        self.tracked = 0
+        if self.learned < self.warmup:
+            return None
+        if self.box is None and box is not None:
+            self.box = np.array(box, dtype=np.int64)
+        if self.box is None:
+            return None
+        box = self.locate(img)
+        self.move(box)
+        return box
+
+    def move(self, box):
+        if box is None:
+            self.box = None
+            self.velocity[...] = 0.0
+            return
+        box = np.array(box, dtype=np.int64)
+        if self.box is not None:
+            self.velocity = (box[:2] + box[2:] / 2.0) - (self.box[:2] + self.box[2:] / 2.0)
+        self.box = box
+
+    def get_window(self, shape, grow=1.0):
+        '''
+
+        Returns the window (x0, y0, x1, y1) to search the object in the next frame, clipped to the frame
+        :param grow: factor applied to the size of the window
+
+        '''
+        x, y, w, h = self.box
+        center = np.array([x + w / 2.0, y + h / 2.0]) + self.velocity
+        half = grow * (self.margin * max(w, h) / 2.0 + np.abs(self.velocity) + 2)
+        x0, y0 = np.maximum(center - half, 0).astype(int)
+        x1, y1 = np.minimum(center + half, (shape[1], shape[0])).astype(int)
+        return x0, y0, x1, y1
+
+    def search(self, img, window):
+        '''
+
+        Finds the largest blob differing from the background image in a window of the frame
+        :return: bounding box (x, y, w, h) in the window, None if there is none, False if it touches the border of
+        the window (not of the frame) and may extend outside of it
+
+        '''
+        x0, y0, x1, y1 = window
+        if x1 - x0 < 2 or y1 - y0 < 2:
+            return None
+        diff = cv2.absdiff(img[y0:y1, x0:x1], self.background8[y0:y1, x0:x1])
+        if diff.ndim == 3:
+            diff = diff.max(axis=2)
+        _, mask = cv2.threshold(diff, self.threshold, 255, cv2.THRESH_BINARY)
+        mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, self.kernel)
+        areas, boxes, centroids = find_blobs(mask)
+        index = largest_blob(areas, self.minarea)
+        if index is None:
+            return None
+        bx, by, bw, bh = [int(v) for v in boxes[index]]
+        if ((bx == 0 and x0 > 0) or (by == 0 and y0 > 0) or (bx + bw == x1 - x0 and x1 < img.shape[1])
+                or (by + bh == y1 - y0 and y1 < img.shape[0])):
+            return False
+        self.axis = box_axis(mask, (bx, by, bw, bh))
+        return bx, by, bw, bh
+
+    def track(self, img):
+        '''
+
+        Finds the object in a window around its predicted position
+        :param img: the full frame, same layout as the frames passed to learn()
+        :return: bounding box (x, y, w, h) in the frame, None if a full frame search is needed
+
+        '''
+        if self.box is None or self.background8 is None or self.background8.shape != img.shape:
+            return None
+        if self.tracked >= self.refreshperiod:
+            return None
+        box = self.locate(img)
+        self.move(box)
+        if box is not None:
+            self.tracked += 1
+            # the background image learns the window searched
+            x0, y0, x1, y1 = self.window
+            background = self.background[y0:y1, x0:x1]
+            background *= 1.0 - self.learningrate
+            background += self.learningrate * img[y0:y1, x0:x1]
+            self.background8[y0:y1, x0:x1] = cv2.convertScaleAbs(background)
+        return box
+
+    def locate(self, img):
+        # searches the predicted window, then a larger one if the object extends outside of it
+        for grow in (1.0, 2.0):
+            x0, y0, x1, y1 = self.window = self.get_window(img.shape, grow)
+            found = self.search(img, self.window)
+            if found is not False:
+                break
+        if found is None or found is False:
+            return None
+        bx, by, bw, bh = found
+        return (x0 + bx, y0 + by, bw, bh)
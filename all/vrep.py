@@ -26,138 +26,185 @@
 #
 # This file was automatically created for V-REP release V3.3.2 on August 29th 2016
 
+import os
 import platform
 import struct
 import sys
 import ctypes as ct
+import numpy as np
 from vrepConst import *
 
 #load library
+#The library is loaded when the first API function is called, so that this module can be imported (and e.g. the
+#file or camera based observers can run) on machines without the remoteApi library. The library is searched at the
+#path given by the environment variable VREP_REMOTEAPI_LIB or by setLibraryPath, then next to "vrep.py" and
+#finally in the current working directory.
 libsimx = None
-try:
-    if platform.system() =='cli':
-        libsimx = ct.CDLL("./remoteApi.dll")
-    elif platform.system() =='Windows':
-        libsimx = ct.CDLL("./remoteApi.dll") 
-    elif platform.system() == 'Darwin':
-        libsimx = ct.CDLL("./remoteApi.dylib")
-    else:
-        libsimx = ct.CDLL("./remoteApi.so")
-except:
-    print ('----------------------------------------------------')
-    print ('The remoteApi library could not be loaded. Make sure')
-    print ('it is located in the same folder as "vrep.py", or')
-    print ('appropriately adjust the file "vrep.py"')
-    print ('----------------------------------------------------')
-    print ('')
+libsimxPath = os.environ.get('VREP_REMOTEAPI_LIB')
+
+def setLibraryPath(path):
+    '''
+    Sets the path of the remoteApi library. Must be called before the first API function is called.
+    '''
+    global libsimxPath
+    libsimxPath = path
+
+def loadLibrary():
+    '''
+    Loads the remoteApi library (once) and returns it
+    '''
+    global libsimx
+    if libsimx is None:
+        if platform.system() =='cli' or platform.system() =='Windows':
+            name = "remoteApi.dll"
+        elif platform.system() == 'Darwin':
+            name = "remoteApi.dylib"
+        else:
+            name = "remoteApi.so"
+        candidates = [os.path.join(os.path.dirname(os.path.abspath(__file__)), name), os.path.join(".", name)]
+        if libsimxPath:
+            candidates.insert(0, libsimxPath)
+        for path in candidates:
+            try:
+                libsimx = ct.CDLL(path)
+                break
+            except OSError:
+                pass
+        else:
+            print ('----------------------------------------------------')
+            print ('The remoteApi library could not be loaded. Make sure')
+            print ('it is located in the same folder as "vrep.py", or')
+            print ('set its path in the environment variable')
+            print ('VREP_REMOTEAPI_LIB')
+            print ('----------------------------------------------------')
+            print ('')
+            raise OSError('remoteApi library not found in %s' % candidates)
+    return libsimx
+
+class _Prototype(object):
+    '''
+    ctypes prototype of a remoteApi function, bound to the library when it is called for the first time. The bound
+    function then replaces the prototype in the module namespace, so that later calls go to ctypes directly.
+    '''
+
+    def __init__(self, prototype, name):
+        self.prototype = prototype
+        self.name = name
+        self.function = None
+
+    def __call__(self, *args):
+        if self.function is None:
+            self.function = self.prototype((self.name, loadLibrary()))
+            globals()['c_' + self.name[4:]] = self.function
+        return self.function(*args)
 
 #ctypes wrapper prototypes 
-c_GetJointPosition          = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)(("simxGetJointPosition", libsimx))
-c_SetJointPosition          = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_float, ct.c_int32)(("simxSetJointPosition", libsimx))
-c_GetJointMatrix            = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)(("simxGetJointMatrix", libsimx))
-c_SetSphericalJointMatrix   = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)(("simxSetSphericalJointMatrix", libsimx))
-c_SetJointTargetVelocity    = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_float, ct.c_int32)(("simxSetJointTargetVelocity", libsimx))
-c_SetJointTargetPosition    = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_float, ct.c_int32)(("simxSetJointTargetPosition", libsimx))
-c_GetJointForce             = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)(("simxGetJointForce", libsimx))
-c_SetJointForce             = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_float, ct.c_int32)(("simxSetJointForce", libsimx))
-c_ReadForceSensor           = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_ubyte), ct.POINTER(ct.c_float), ct.POINTER(ct.c_float), ct.c_int32)(("simxReadForceSensor", libsimx))
-c_BreakForceSensor          = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32)(("simxBreakForceSensor", libsimx))
-c_ReadVisionSensor          = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_ubyte), ct.POINTER(ct.POINTER(ct.c_float)), ct.POINTER(ct.POINTER(ct.c_int32)), ct.c_int32)(("simxReadVisionSensor", libsimx))
-c_GetObjectHandle           = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_int32), ct.c_int32)(("simxGetObjectHandle", libsimx))
-c_GetVisionSensorImage      = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_byte)), ct.c_ubyte, ct.c_int32)(("simxGetVisionSensorImage", libsimx))
-c_SetVisionSensorImage      = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_byte), ct.c_int32, ct.c_ubyte, ct.c_int32)(("simxSetVisionSensorImage", libsimx))
-c_GetVisionSensorDepthBuffer= ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_float)), ct.c_int32)(("simxGetVisionSensorDepthBuffer", libsimx))
-c_GetObjectChild            = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.c_int32)(("simxGetObjectChild", libsimx))
-c_GetObjectParent           = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.c_int32)(("simxGetObjectParent", libsimx))
-c_ReadProximitySensor       = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_ubyte), ct.POINTER(ct.c_float), ct.POINTER(ct.c_int32), ct.POINTER(ct.c_float), ct.c_int32)(("simxReadProximitySensor", libsimx))
-c_LoadModel                 = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.c_ubyte, ct.POINTER(ct.c_int32), ct.c_int32)(("simxLoadModel", libsimx))
-c_LoadUI                    = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.c_ubyte, ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_int32)), ct.c_int32)(("simxLoadUI", libsimx))
-c_LoadScene                 =  ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.c_ubyte, ct.c_int32)(("simxLoadScene", libsimx))
-c_StartSimulation           = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32)(("simxStartSimulation", libsimx))
-c_PauseSimulation           = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32)(("simxPauseSimulation", libsimx))
-c_StopSimulation            = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32)(("simxStopSimulation", libsimx))
-c_GetUIHandle               = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_int32), ct.c_int32)(("simxGetUIHandle", libsimx))
-c_GetUISlider               = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.c_int32)(("simxGetUISlider", libsimx))
-c_SetUISlider               = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.c_int32, ct.c_int32)(("simxSetUISlider", libsimx))
-c_GetUIEventButton          = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.POINTER(ct.c_int32), ct.c_int32)(("simxGetUIEventButton", libsimx))
-c_GetUIButtonProperty       = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.c_int32)(("simxGetUIButtonProperty", libsimx))
-c_SetUIButtonProperty       = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.c_int32, ct.c_int32)(("simxSetUIButtonProperty", libsimx))
-c_AddStatusbarMessage       = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.c_int32)(("simxAddStatusbarMessage", libsimx))
-c_AuxiliaryConsoleOpen      = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.POINTER(ct.c_int32), ct.POINTER(ct.c_float), ct.POINTER(ct.c_float), ct.POINTER(ct.c_int32), ct.c_int32)(("simxAuxiliaryConsoleOpen", libsimx))
-c_AuxiliaryConsoleClose     = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32)(("simxAuxiliaryConsoleClose", libsimx))
-c_AuxiliaryConsolePrint     = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_char), ct.c_int32)(("simxAuxiliaryConsolePrint", libsimx))
-c_AuxiliaryConsoleShow      = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_ubyte, ct.c_int32)(("simxAuxiliaryConsoleShow", libsimx))
-c_GetObjectOrientation      = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)(("simxGetObjectOrientation", libsimx))
-c_GetObjectPosition         = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)(("simxGetObjectPosition", libsimx))
-c_SetObjectOrientation      = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)(("simxSetObjectOrientation", libsimx))
-c_SetObjectPosition         = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)(("simxSetObjectPosition", libsimx))
-c_SetObjectParent           = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.c_ubyte, ct.c_int32)(("simxSetObjectParent", libsimx))
-c_SetUIButtonLabel          = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_char), ct.c_int32)(("simxSetUIButtonLabel", libsimx))
-c_GetLastErrors             = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_char)), ct.c_int32)(("simxGetLastErrors", libsimx))
-c_GetArrayParameter         = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)(("simxGetArrayParameter", libsimx))
-c_SetArrayParameter         = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)(("simxSetArrayParameter", libsimx))
-c_GetBooleanParameter       = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_ubyte), ct.c_int32)(("simxGetBooleanParameter", libsimx))
-c_SetBooleanParameter       = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_ubyte, ct.c_int32)(("simxSetBooleanParameter", libsimx))
-c_GetIntegerParameter       = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.c_int32)(("simxGetIntegerParameter", libsimx))
-c_SetIntegerParameter       = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.c_int32)(("simxSetIntegerParameter", libsimx))
-c_GetFloatingParameter      = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)(("simxGetFloatingParameter", libsimx))
-c_SetFloatingParameter      = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_float, ct.c_int32)(("simxSetFloatingParameter", libsimx))
-c_GetStringParameter        = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.POINTER(ct.c_char)), ct.c_int32)(("simxGetStringParameter", libsimx))
-c_GetCollisionHandle        = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_int32), ct.c_int32)(("simxGetCollisionHandle", libsimx))
-c_GetDistanceHandle         = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_int32), ct.c_int32)(("simxGetDistanceHandle", libsimx))
-c_GetCollectionHandle       = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_int32), ct.c_int32)(("simxGetCollectionHandle", libsimx))
-c_ReadCollision             = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_ubyte), ct.c_int32)(("simxReadCollision", libsimx))
-c_ReadDistance              = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)(("simxReadDistance", libsimx))
-c_RemoveObject              = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32)(("simxRemoveObject", libsimx))
-c_RemoveModel               = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32)(("simxRemoveModel", libsimx))
-c_RemoveUI                  = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32)(("simxRemoveUI", libsimx))
-c_CloseScene                = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32)(("simxCloseScene", libsimx))
-c_GetObjects                = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_int32)), ct.c_int32)(("simxGetObjects", libsimx))
-c_DisplayDialog             = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_char), ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_float), ct.POINTER(ct.c_float), ct.POINTER(ct.c_int32), ct.POINTER(ct.c_int32), ct.c_int32)(("simxDisplayDialog", libsimx))
-c_EndDialog                 = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32)(("simxEndDialog", libsimx))
-c_GetDialogInput            = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.POINTER(ct.c_char)), ct.c_int32)(("simxGetDialogInput", libsimx))
-c_GetDialogResult           = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.c_int32)(("simxGetDialogResult", libsimx))
-c_CopyPasteObjects          = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_int32), ct.c_int32, ct.POINTER(ct.POINTER(ct.c_int32)), ct.POINTER(ct.c_int32), ct.c_int32)(("simxCopyPasteObjects", libsimx))
-c_GetObjectSelection        = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.POINTER(ct.c_int32)), ct.POINTER(ct.c_int32), ct.c_int32)(("simxGetObjectSelection", libsimx))
-c_SetObjectSelection        = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_int32), ct.c_int32, ct.c_int32)(("simxSetObjectSelection", libsimx))
-c_ClearFloatSignal          = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.c_int32)(("simxClearFloatSignal", libsimx))
-c_ClearIntegerSignal        = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.c_int32)(("simxClearIntegerSignal", libsimx))
-c_ClearStringSignal         = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.c_int32)(("simxClearStringSignal", libsimx))
-c_GetFloatSignal            = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_float), ct.c_int32)(("simxGetFloatSignal", libsimx))
-c_GetIntegerSignal          = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_int32), ct.c_int32)(("simxGetIntegerSignal", libsimx))
-c_GetStringSignal           = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.POINTER(ct.c_ubyte)), ct.POINTER(ct.c_int32), ct.c_int32)(("simxGetStringSignal", libsimx))
-c_SetFloatSignal            = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.c_float, ct.c_int32)(("simxSetFloatSignal", libsimx))
-c_SetIntegerSignal          = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.c_int32, ct.c_int32)(("simxSetIntegerSignal", libsimx))
-c_SetStringSignal           = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_ubyte), ct.c_int32, ct.c_int32)(("simxSetStringSignal", libsimx))
-c_AppendStringSignal        = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_ubyte), ct.c_int32, ct.c_int32)(("simxAppendStringSignal", libsimx))
-c_WriteStringStream         = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_ubyte), ct.c_int32, ct.c_int32)(("simxWriteStringStream", libsimx))
-c_GetObjectFloatParameter   = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)(("simxGetObjectFloatParameter", libsimx))
-c_SetObjectFloatParameter   = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.c_float, ct.c_int32)(("simxSetObjectFloatParameter", libsimx))
-c_GetObjectIntParameter     = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.c_int32)(("simxGetObjectIntParameter", libsimx))
-c_SetObjectIntParameter     = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.c_int32, ct.c_int32)(("simxSetObjectIntParameter", libsimx))
-c_GetModelProperty          = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.c_int32)(("simxGetModelProperty", libsimx))
-c_SetModelProperty          = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.c_int32)(("simxSetModelProperty", libsimx))
-c_Start                     = ct.CFUNCTYPE(ct.c_int32,ct.POINTER(ct.c_char), ct.c_int32, ct.c_ubyte, ct.c_ubyte, ct.c_int32, ct.c_int32)(("simxStart", libsimx))
-c_Finish                    = ct.CFUNCTYPE(None, ct.c_int32)(("simxFinish", libsimx))
-c_GetPingTime               = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_int32))(("simxGetPingTime", libsimx))
-c_GetLastCmdTime            = ct.CFUNCTYPE(ct.c_int32,ct.c_int32)(("simxGetLastCmdTime", libsimx))
-c_SynchronousTrigger        = ct.CFUNCTYPE(ct.c_int32,ct.c_int32)(("simxSynchronousTrigger", libsimx))
-c_Synchronous               = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_ubyte)(("simxSynchronous", libsimx))
-c_PauseCommunication        = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_ubyte)(("simxPauseCommunication", libsimx))
-c_GetInMessageInfo          = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32))(("simxGetInMessageInfo", libsimx))
-c_GetOutMessageInfo         = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32))(("simxGetOutMessageInfo", libsimx))
-c_GetConnectionId           = ct.CFUNCTYPE(ct.c_int32,ct.c_int32)(("simxGetConnectionId", libsimx))
-c_CreateBuffer              = ct.CFUNCTYPE(ct.POINTER(ct.c_ubyte), ct.c_int32)(("simxCreateBuffer", libsimx))
-c_ReleaseBuffer             = ct.CFUNCTYPE(None, ct.c_void_p)(("simxReleaseBuffer", libsimx))
-c_TransferFile              = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_char), ct.c_int32, ct.c_int32)(("simxTransferFile", libsimx))
-c_EraseFile                 = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.c_int32)(("simxEraseFile", libsimx))
-c_GetAndClearStringSignal   = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.POINTER(ct.c_ubyte)), ct.POINTER(ct.c_int32), ct.c_int32)(("simxGetAndClearStringSignal", libsimx))
-c_ReadStringStream          = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.POINTER(ct.c_ubyte)), ct.POINTER(ct.c_int32), ct.c_int32)(("simxReadStringStream", libsimx))
-c_CreateDummy               = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_float, ct.POINTER(ct.c_ubyte), ct.POINTER(ct.c_int32), ct.c_int32)(("simxCreateDummy", libsimx))
-c_Query                     = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_ubyte), ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.POINTER(ct.c_ubyte)), ct.POINTER(ct.c_int32), ct.c_int32)(("simxQuery", libsimx))
-c_GetObjectGroupData        = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_int32)), ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_int32)), ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_float)), ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_char)), ct.c_int32)(("simxGetObjectGroupData", libsimx))
-c_GetObjectVelocity         = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.POINTER(ct.c_float), ct.c_int32)(("simxGetObjectVelocity", libsimx))
-c_CallScriptFunction        = ct.CFUNCTYPE(ct.c_int32,ct.c_int32,ct.POINTER(ct.c_char),ct.c_int32,ct.POINTER(ct.c_char),ct.c_int32,ct.POINTER(ct.c_int32),ct.c_int32,ct.POINTER(ct.c_float),ct.c_int32,ct.POINTER(ct.c_char),ct.c_int32,ct.POINTER(ct.c_ubyte),ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_int32)),ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_float)),ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_char)),ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_ubyte)),ct.c_int32)(("simxCallScriptFunction", libsimx))
+c_GetJointPosition          = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32), "simxGetJointPosition")
+c_SetJointPosition          = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_float, ct.c_int32), "simxSetJointPosition")
+c_GetJointMatrix            = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32), "simxGetJointMatrix")
+c_SetSphericalJointMatrix   = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32), "simxSetSphericalJointMatrix")
+c_SetJointTargetVelocity    = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_float, ct.c_int32), "simxSetJointTargetVelocity")
+c_SetJointTargetPosition    = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_float, ct.c_int32), "simxSetJointTargetPosition")
+c_GetJointForce             = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32), "simxGetJointForce")
+c_SetJointForce             = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_float, ct.c_int32), "simxSetJointForce")
+c_ReadForceSensor           = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_ubyte), ct.POINTER(ct.c_float), ct.POINTER(ct.c_float), ct.c_int32), "simxReadForceSensor")
+c_BreakForceSensor          = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32), "simxBreakForceSensor")
+c_ReadVisionSensor          = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_ubyte), ct.POINTER(ct.POINTER(ct.c_float)), ct.POINTER(ct.POINTER(ct.c_int32)), ct.c_int32), "simxReadVisionSensor")
+c_GetObjectHandle           = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_int32), ct.c_int32), "simxGetObjectHandle")
+c_GetVisionSensorImage      = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_byte)), ct.c_ubyte, ct.c_int32), "simxGetVisionSensorImage")
+c_SetVisionSensorImage      = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_byte), ct.c_int32, ct.c_ubyte, ct.c_int32), "simxSetVisionSensorImage")
+c_GetVisionSensorDepthBuffer= _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_float)), ct.c_int32), "simxGetVisionSensorDepthBuffer")
+c_GetObjectChild            = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.c_int32), "simxGetObjectChild")
+c_GetObjectParent           = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.c_int32), "simxGetObjectParent")
+c_ReadProximitySensor       = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_ubyte), ct.POINTER(ct.c_float), ct.POINTER(ct.c_int32), ct.POINTER(ct.c_float), ct.c_int32), "simxReadProximitySensor")
+c_LoadModel                 = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.c_ubyte, ct.POINTER(ct.c_int32), ct.c_int32), "simxLoadModel")
+c_LoadUI                    = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.c_ubyte, ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_int32)), ct.c_int32), "simxLoadUI")
+c_LoadScene                 =  _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.c_ubyte, ct.c_int32), "simxLoadScene")
+c_StartSimulation           = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32), "simxStartSimulation")
+c_PauseSimulation           = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32), "simxPauseSimulation")
+c_StopSimulation            = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32), "simxStopSimulation")
+c_GetUIHandle               = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_int32), ct.c_int32), "simxGetUIHandle")
+c_GetUISlider               = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.c_int32), "simxGetUISlider")
+c_SetUISlider               = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.c_int32, ct.c_int32), "simxSetUISlider")
+c_GetUIEventButton          = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.POINTER(ct.c_int32), ct.c_int32), "simxGetUIEventButton")
+c_GetUIButtonProperty       = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.c_int32), "simxGetUIButtonProperty")
+c_SetUIButtonProperty       = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.c_int32, ct.c_int32), "simxSetUIButtonProperty")
+c_AddStatusbarMessage       = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.c_int32), "simxAddStatusbarMessage")
+c_AuxiliaryConsoleOpen      = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.POINTER(ct.c_int32), ct.POINTER(ct.c_float), ct.POINTER(ct.c_float), ct.POINTER(ct.c_int32), ct.c_int32), "simxAuxiliaryConsoleOpen")
+c_AuxiliaryConsoleClose     = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32), "simxAuxiliaryConsoleClose")
+c_AuxiliaryConsolePrint     = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_char), ct.c_int32), "simxAuxiliaryConsolePrint")
+c_AuxiliaryConsoleShow      = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_ubyte, ct.c_int32), "simxAuxiliaryConsoleShow")
+c_GetObjectOrientation      = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32), "simxGetObjectOrientation")
+c_GetObjectPosition         = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32), "simxGetObjectPosition")
+c_SetObjectOrientation      = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32), "simxSetObjectOrientation")
+c_SetObjectPosition         = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32), "simxSetObjectPosition")
+c_SetObjectParent           = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.c_ubyte, ct.c_int32), "simxSetObjectParent")
+c_SetUIButtonLabel          = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_char), ct.c_int32), "simxSetUIButtonLabel")
+c_GetLastErrors             = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_char)), ct.c_int32), "simxGetLastErrors")
+c_GetArrayParameter         = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32), "simxGetArrayParameter")
+c_SetArrayParameter         = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32), "simxSetArrayParameter")
+c_GetBooleanParameter       = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_ubyte), ct.c_int32), "simxGetBooleanParameter")
+c_SetBooleanParameter       = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_ubyte, ct.c_int32), "simxSetBooleanParameter")
+c_GetIntegerParameter       = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.c_int32), "simxGetIntegerParameter")
+c_SetIntegerParameter       = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.c_int32), "simxSetIntegerParameter")
+c_GetFloatingParameter      = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32), "simxGetFloatingParameter")
+c_SetFloatingParameter      = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_float, ct.c_int32), "simxSetFloatingParameter")
+c_GetStringParameter        = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.POINTER(ct.c_char)), ct.c_int32), "simxGetStringParameter")
+c_GetCollisionHandle        = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_int32), ct.c_int32), "simxGetCollisionHandle")
+c_GetDistanceHandle         = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_int32), ct.c_int32), "simxGetDistanceHandle")
+c_GetCollectionHandle       = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_int32), ct.c_int32), "simxGetCollectionHandle")
+c_ReadCollision             = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_ubyte), ct.c_int32), "simxReadCollision")
+c_ReadDistance              = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32), "simxReadDistance")
+c_RemoveObject              = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32), "simxRemoveObject")
+c_RemoveModel               = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32), "simxRemoveModel")
+c_RemoveUI                  = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32), "simxRemoveUI")
+c_CloseScene                = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32), "simxCloseScene")
+c_GetObjects                = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_int32)), ct.c_int32), "simxGetObjects")
+c_DisplayDialog             = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_char), ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_float), ct.POINTER(ct.c_float), ct.POINTER(ct.c_int32), ct.POINTER(ct.c_int32), ct.c_int32), "simxDisplayDialog")
+c_EndDialog                 = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32), "simxEndDialog")
+c_GetDialogInput            = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.POINTER(ct.c_char)), ct.c_int32), "simxGetDialogInput")
+c_GetDialogResult           = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.c_int32), "simxGetDialogResult")
+c_CopyPasteObjects          = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_int32), ct.c_int32, ct.POINTER(ct.POINTER(ct.c_int32)), ct.POINTER(ct.c_int32), ct.c_int32), "simxCopyPasteObjects")
+c_GetObjectSelection        = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.POINTER(ct.c_int32)), ct.POINTER(ct.c_int32), ct.c_int32), "simxGetObjectSelection")
+c_SetObjectSelection        = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_int32), ct.c_int32, ct.c_int32), "simxSetObjectSelection")
+c_ClearFloatSignal          = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.c_int32), "simxClearFloatSignal")
+c_ClearIntegerSignal        = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.c_int32), "simxClearIntegerSignal")
+c_ClearStringSignal         = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.c_int32), "simxClearStringSignal")
+c_GetFloatSignal            = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_float), ct.c_int32), "simxGetFloatSignal")
+c_GetIntegerSignal          = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_int32), ct.c_int32), "simxGetIntegerSignal")
+c_GetStringSignal           = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.POINTER(ct.c_ubyte)), ct.POINTER(ct.c_int32), ct.c_int32), "simxGetStringSignal")
+c_SetFloatSignal            = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.c_float, ct.c_int32), "simxSetFloatSignal")
+c_SetIntegerSignal          = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.c_int32, ct.c_int32), "simxSetIntegerSignal")
+c_SetStringSignal           = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_ubyte), ct.c_int32, ct.c_int32), "simxSetStringSignal")
+c_AppendStringSignal        = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_ubyte), ct.c_int32, ct.c_int32), "simxAppendStringSignal")
+c_WriteStringStream         = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_ubyte), ct.c_int32, ct.c_int32), "simxWriteStringStream")
+c_GetObjectFloatParameter   = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32), "simxGetObjectFloatParameter")
+c_SetObjectFloatParameter   = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.c_float, ct.c_int32), "simxSetObjectFloatParameter")
+c_GetObjectIntParameter     = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.c_int32), "simxGetObjectIntParameter")
+c_SetObjectIntParameter     = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.c_int32, ct.c_int32), "simxSetObjectIntParameter")
+c_GetModelProperty          = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.c_int32), "simxGetModelProperty")
+c_SetModelProperty          = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.c_int32), "simxSetModelProperty")
+c_Start                     = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.POINTER(ct.c_char), ct.c_int32, ct.c_ubyte, ct.c_ubyte, ct.c_int32, ct.c_int32), "simxStart")
+c_Finish                    = _Prototype(ct.CFUNCTYPE(None, ct.c_int32), "simxFinish")
+c_GetPingTime               = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_int32)), "simxGetPingTime")
+c_GetLastCmdTime            = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32), "simxGetLastCmdTime")
+c_SynchronousTrigger        = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32), "simxSynchronousTrigger")
+c_Synchronous               = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_ubyte), "simxSynchronous")
+c_PauseCommunication        = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_ubyte), "simxPauseCommunication")
+c_GetInMessageInfo          = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32)), "simxGetInMessageInfo")
+c_GetOutMessageInfo         = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32)), "simxGetOutMessageInfo")
+c_GetConnectionId           = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32), "simxGetConnectionId")
+c_CreateBuffer              = _Prototype(ct.CFUNCTYPE(ct.POINTER(ct.c_ubyte), ct.c_int32), "simxCreateBuffer")
+c_ReleaseBuffer             = _Prototype(ct.CFUNCTYPE(None, ct.c_void_p), "simxReleaseBuffer")
+c_TransferFile              = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_char), ct.c_int32, ct.c_int32), "simxTransferFile")
+c_EraseFile                 = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.c_int32), "simxEraseFile")
+c_GetAndClearStringSignal   = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.POINTER(ct.c_ubyte)), ct.POINTER(ct.c_int32), ct.c_int32), "simxGetAndClearStringSignal")
+c_ReadStringStream          = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.POINTER(ct.c_ubyte)), ct.POINTER(ct.c_int32), ct.c_int32), "simxReadStringStream")
+c_CreateDummy               = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_float, ct.POINTER(ct.c_ubyte), ct.POINTER(ct.c_int32), ct.c_int32), "simxCreateDummy")
+c_Query                     = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_ubyte), ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.POINTER(ct.c_ubyte)), ct.POINTER(ct.c_int32), ct.c_int32), "simxQuery")
+c_GetObjectGroupData        = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_int32)), ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_int32)), ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_float)), ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_char)), ct.c_int32), "simxGetObjectGroupData")
+c_GetObjectVelocity         = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.POINTER(ct.c_float), ct.c_int32), "simxGetObjectVelocity")
+c_CallScriptFunction        = _Prototype(ct.CFUNCTYPE(ct.c_int32,ct.c_int32,ct.POINTER(ct.c_char),ct.c_int32,ct.POINTER(ct.c_char),ct.c_int32,ct.POINTER(ct.c_int32),ct.c_int32,ct.POINTER(ct.c_float),ct.c_int32,ct.POINTER(ct.c_char),ct.c_int32,ct.POINTER(ct.c_ubyte),ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_int32)),ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_float)),ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_char)),ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_ubyte)),ct.c_int32), "simxCallScriptFunction")
 
 #API functions
 def simxGetJointPosition(clientID, jointHandle, operationMode):
@@ -276,6 +323,34 @@ def simxReadVisionSensor(clientID, sensorHandle, operationMode):
 
     return ret, bool(detectionState.value!=0), auxValues2 
 
+def simxReadVisionSensorArray(clientID, sensorHandle, operationMode):
+    '''
+    Same as simxReadVisionSensor, but every packet of auxiliary values is returned as a float32 numpy array, split
+    out of a single copy of the C buffer instead of slicing it value by value (e.g. the packet of a blob detection
+    filter: blob count, values per blob, then the values of every blob).
+    '''
+
+    detectionState = ct.c_ubyte()
+    auxValues      = ct.POINTER(ct.c_float)()
+    auxValuesCount = ct.POINTER(ct.c_int)()
+    ret = c_ReadVisionSensor(clientID, sensorHandle, ct.byref(detectionState), ct.byref(auxValues), ct.byref(auxValuesCount), operationMode)
+
+    packets = []
+    if ret == 0:
+        n = auxValuesCount[0]
+        counts = np.ctypeslib.as_array(auxValuesCount, shape=(n + 1,))[1:].astype(np.intp)
+        total = int(counts.sum())
+        values = np.zeros(0, dtype=np.float32)
+        if total > 0:
+            values = np.ctypeslib.as_array(auxValues, shape=(total,)).copy()
+        packets = np.split(values, np.cumsum(counts)[:-1]) if n > 0 else []
+
+        #free C buffers
+        c_ReleaseBuffer(auxValues)
+        c_ReleaseBuffer(auxValuesCount)
+
+    return ret, bool(detectionState.value!=0), packets
+
 def simxGetObjectHandle(clientID, objectName, operationMode):
     '''
     Please have a look at the function description/documentation in the V-REP user manual
@@ -307,13 +382,58 @@ def simxGetVisionSensorImage(clientID, sensorHandle, options, operationMode):
             reso.append(resolution[i])
     return ret, reso, image
 
+def simxGetVisionSensorImageArray(clientID, sensorHandle, options, operationMode, copy=True, out=None):
+    '''
+    Same as simxGetVisionSensorImage, but the image is returned as a uint8 numpy array of shape
+    (resolution[1], resolution[0], bytesPerPixel) that wraps the C buffer directly, i.e. without
+    any per-pixel python work. The image is as delivered by V-REP: rgb (or grey if bit 0 of options
+    is set), first row is the bottom of the image.
+
+    The C buffer is allocated and owned by the remoteApi library: it must not be released with
+    simxReleaseBuffer and it is only valid until the next call for the same sensor. With copy=False the
+    returned array is a view on that buffer and has to be consumed (or copied) before the next call.
+    If a caller-owned array is given as out (uint8, matching shape), the image is copied into it and
+    out is returned, no memory is allocated. copy is ignored in that case.
+    '''
+
+    resolution = (ct.c_int*2)()
+    c_image  = ct.POINTER(ct.c_byte)()
+    bytesPerPixel = 3
+    if (options & 1) != 0:
+        bytesPerPixel = 1
+    ret = c_GetVisionSensorImage(clientID, sensorHandle, resolution, ct.byref(c_image), options, operationMode)
+
+    reso = []
+    image = None
+    if (ret == 0):
+        reso = [resolution[0], resolution[1]]
+        image = np.ctypeslib.as_array(c_image, shape=(resolution[1], resolution[0], bytesPerPixel)).view(np.uint8)
+        if out is not None:
+            np.copyto(out, image)
+            image = out
+        elif copy:
+            image = image.copy()
+    return ret, reso, image
+
 def simxSetVisionSensorImage(clientID, sensorHandle, image, options, operationMode):
     '''
     Please have a look at the function description/documentation in the V-REP user manual
+    Besides a sequence of pixel values (list, tuple..), image can be a uint8 numpy array, bytes or a bytearray
+    holding the image as bytes in the vision sensor layout (rgb or grey, first row is the bottom of the image, see
+    frames.bgr_to_vrep). It is then passed to the library without element-wise copy. Arrays of other types raise a
+    ValueError, they are not converted (e.g. float images in [0, 1] would become black).
     '''
-    size = len(image)
-    image_bytes  = (ct.c_byte*size)(*image)
-    return c_SetVisionSensorImage(clientID, sensorHandle, image_bytes, size, options, operationMode)
+    if isinstance(image, np.ndarray):
+        if image.dtype != np.uint8:
+            raise ValueError('image must be a uint8 array, got %s' % image.dtype)
+        buf = np.ascontiguousarray(image) # no copy for contiguous images
+    elif isinstance(image, (bytes, bytearray)):
+        buf = np.frombuffer(image, dtype=np.uint8)
+    else:
+        size = len(image)
+        image_bytes  = (ct.c_byte*size)(*image)
+        return c_SetVisionSensorImage(clientID, sensorHandle, image_bytes, size, options, operationMode)
+    return c_SetVisionSensorImage(clientID, sensorHandle, buf.ctypes.data_as(ct.POINTER(ct.c_byte)), buf.size, options, operationMode)
 
 def simxGetVisionSensorDepthBuffer(clientID, sensorHandle, operationMode):
     '''
@@ -332,6 +452,30 @@ def simxGetVisionSensorDepthBuffer(clientID, sensorHandle, operationMode):
             reso.append(resolution[i])
     return ret, reso, buffer
 
+def simxGetVisionSensorDepthBufferArray(clientID, sensorHandle, operationMode, copy=True, out=None):
+    '''
+    Same as simxGetVisionSensorDepthBuffer, but the depth buffer is returned as a float32 numpy array of shape
+    (resolution[1], resolution[0]) wrapping the C buffer, without per-element python work. Values are in [0, 1]
+    between the near and far clipping planes, first row is the bottom of the image.
+
+    As for simxGetVisionSensorImageArray, the C buffer is owned by the remoteApi library and only valid until the
+    next call for the same sensor: copy=False returns a view on it, out receives a copy into a caller-owned array.
+    '''
+    c_buffer  = ct.POINTER(ct.c_float)()
+    resolution = (ct.c_int*2)()
+    ret = c_GetVisionSensorDepthBuffer(clientID, sensorHandle, resolution, ct.byref(c_buffer), operationMode)
+    reso = []
+    buffer = None
+    if (ret == 0):
+        reso = [resolution[0], resolution[1]]
+        buffer = np.ctypeslib.as_array(c_buffer, shape=(resolution[1], resolution[0]))
+        if out is not None:
+            np.copyto(out, buffer)
+            buffer = out
+        elif copy:
+            buffer = buffer.copy()
+    return ret, reso, buffer
+
 def simxGetObjectChild(clientID, parentObjectHandle, childIndex, operationMode):
     '''
     Please have a look at the function description/documentation in the V-REP user manual
@@ -959,8 +1103,7 @@ def simxGetStringSignal(clientID, signalName, operationMode):
 
     a = bytearray()
     if ret == 0:
-        for i in range(signalLength.value):
-            a.append(signalValue[i])
+        a = bytearray(ct.string_at(signalValue, signalLength.value))
     if sys.version_info[0] != 3:
         a=str(a)
 
@@ -979,8 +1122,7 @@ def simxGetAndClearStringSignal(clientID, signalName, operationMode):
 
     a = bytearray()
     if ret == 0:
-        for i in range(signalLength.value):
-            a.append(signalValue[i])
+        a = bytearray(ct.string_at(signalValue, signalLength.value))
     if sys.version_info[0] != 3:
         a=str(a)
 
@@ -999,8 +1141,7 @@ def simxReadStringStream(clientID, signalName, operationMode):
 
     a = bytearray()
     if ret == 0:
-        for i in range(signalLength.value):
-            a.append(signalValue[i])
+        a = bytearray(ct.string_at(signalValue, signalLength.value))
     if sys.version_info[0] != 3:
         a=str(a)
 
@@ -1034,16 +1175,16 @@ def simxSetStringSignal(clientID, signalName, signalValue, operationMode):
         if type(signalName) is str:
             signalName=signalName.encode('utf-8')
         if type(signalValue) is bytearray:
-            sigV  = (ct.c_ubyte*len(signalValue))(*signalValue)
+            sigV  = (ct.c_ubyte*len(signalValue)).from_buffer_copy(signalValue)
         if type(signalValue) is str:
             signalValue=signalValue.encode('utf-8')
-            sigV  = (ct.c_ubyte*len(signalValue))(*signalValue)
+            sigV  = (ct.c_ubyte*len(signalValue)).from_buffer_copy(signalValue)
     else:
         if type(signalValue) is bytearray:
-            sigV = (ct.c_ubyte*len(signalValue))(*signalValue)
+            sigV = (ct.c_ubyte*len(signalValue)).from_buffer_copy(signalValue)
         if type(signalValue) is str:
             signalValue=bytearray(signalValue)
-            sigV = (ct.c_ubyte*len(signalValue))(*signalValue)
+            sigV = (ct.c_ubyte*len(signalValue)).from_buffer_copy(signalValue)
     sigV=ct.cast(sigV,ct.POINTER(ct.c_ubyte)) # IronPython needs this
     return c_SetStringSignal(clientID, signalName, sigV, len(signalValue), operationMode)
 
@@ -1057,16 +1198,16 @@ def simxAppendStringSignal(clientID, signalName, signalValue, operationMode):
         if type(signalName) is str:
             signalName=signalName.encode('utf-8')
         if type(signalValue) is bytearray:
-            sigV  = (ct.c_ubyte*len(signalValue))(*signalValue)
+            sigV  = (ct.c_ubyte*len(signalValue)).from_buffer_copy(signalValue)
         if type(signalValue) is str:
             signalValue=signalValue.encode('utf-8')
-            sigV  = (ct.c_ubyte*len(signalValue))(*signalValue)
+            sigV  = (ct.c_ubyte*len(signalValue)).from_buffer_copy(signalValue)
     else:
         if type(signalValue) is bytearray:
-            sigV = (ct.c_ubyte*len(signalValue))(*signalValue)
+            sigV = (ct.c_ubyte*len(signalValue)).from_buffer_copy(signalValue)
         if type(signalValue) is str:
             signalValue=bytearray(signalValue)
-            sigV = (ct.c_ubyte*len(signalValue))(*signalValue)
+            sigV = (ct.c_ubyte*len(signalValue)).from_buffer_copy(signalValue)
     sigV=ct.cast(sigV,ct.POINTER(ct.c_ubyte)) # IronPython needs this
     return c_AppendStringSignal(clientID, signalName, sigV, len(signalValue), operationMode)
 
@@ -1080,16 +1221,16 @@ def simxWriteStringStream(clientID, signalName, signalValue, operationMode):
         if type(signalName) is str:
             signalName=signalName.encode('utf-8')
         if type(signalValue) is bytearray:
-            sigV  = (ct.c_ubyte*len(signalValue))(*signalValue)
+            sigV  = (ct.c_ubyte*len(signalValue)).from_buffer_copy(signalValue)
         if type(signalValue) is str:
             signalValue=signalValue.encode('utf-8')
-            sigV  = (ct.c_ubyte*len(signalValue))(*signalValue)
+            sigV  = (ct.c_ubyte*len(signalValue)).from_buffer_copy(signalValue)
     else:
         if type(signalValue) is bytearray:
-            sigV = (ct.c_ubyte*len(signalValue))(*signalValue)
+            sigV = (ct.c_ubyte*len(signalValue)).from_buffer_copy(signalValue)
         if type(signalValue) is str:
             signalValue=bytearray(signalValue)
-            sigV = (ct.c_ubyte*len(signalValue))(*signalValue)
+            sigV = (ct.c_ubyte*len(signalValue)).from_buffer_copy(signalValue)
     sigV=ct.cast(sigV,ct.POINTER(ct.c_ubyte)) # IronPython needs this
     return c_WriteStringStream(clientID, signalName, sigV, len(signalValue), operationMode)
 
@@ -1268,24 +1409,23 @@ def simxQuery(clientID, signalName, signalValue, retSignalName, timeOutInMs):
         if type(retSignalName) is str:
             retSignalName=retSignalName.encode('utf-8')
         if type(signalValue) is bytearray:
-            sigV  = (ct.c_ubyte*len(signalValue))(*signalValue)
+            sigV  = (ct.c_ubyte*len(signalValue)).from_buffer_copy(signalValue)
         if type(signalValue) is str:
             signalValue=signalValue.encode('utf-8')
-            sigV  = (ct.c_ubyte*len(signalValue))(*signalValue)
+            sigV  = (ct.c_ubyte*len(signalValue)).from_buffer_copy(signalValue)
     else:
         if type(signalValue) is bytearray:
-            sigV = (ct.c_ubyte*len(signalValue))(*signalValue)
+            sigV = (ct.c_ubyte*len(signalValue)).from_buffer_copy(signalValue)
         if type(signalValue) is str:
             signalValue=bytearray(signalValue)
-            sigV = (ct.c_ubyte*len(signalValue))(*signalValue)
+            sigV = (ct.c_ubyte*len(signalValue)).from_buffer_copy(signalValue)
     sigV=ct.cast(sigV,ct.POINTER(ct.c_ubyte)) # IronPython needs this
 
     ret = c_Query(clientID, signalName, sigV, len(signalValue), retSignalName, ct.byref(retSignalValue), ct.byref(retSignalLength), timeOutInMs)
 
     a = bytearray()
     if ret == 0:
-        for i in range(retSignalLength.value):
-            a.append(retSignalValue[i])
+        a = bytearray(ct.string_at(retSignalValue, retSignalLength.value))
     if sys.version_info[0] != 3:
         a=str(a)
 
@@ -1335,6 +1475,50 @@ def simxGetObjectGroupData(clientID, objectType, dataType, operationMode):
  
     return ret, handles, intData, floatData, stringData
 
+def simxGetObjectGroupDataArray(clientID, objectType, dataType, operationMode):
+    '''
+    Same as simxGetObjectGroupData, but decodes the reply in bulk: handles are returned as an int32 numpy array,
+    int data and float data as flat int32 and float32 numpy arrays (values of all handles one after the other, as
+    in simxGetObjectGroupData, the number of values per handle depends on dataType), and the string data is read
+    in one block and split at the null characters instead of a python loop over every byte (only the end of the
+    block is found string by string, with a C strlen each). All arrays are copies, they stay valid after the next
+    call.
+    '''
+
+    handles = np.zeros(0, dtype=np.int32)
+    intData = np.zeros(0, dtype=np.int32)
+    floatData = np.zeros(0, dtype=np.float32)
+    stringData = []
+    handlesC = ct.c_int()
+    handlesP = ct.POINTER(ct.c_int)()
+    intDataC = ct.c_int()
+    intDataP = ct.POINTER(ct.c_int)()
+    floatDataC = ct.c_int()
+    floatDataP = ct.POINTER(ct.c_float)()
+    stringDataC = ct.c_int()
+    stringDataP = ct.POINTER(ct.c_char)()
+    ret = c_GetObjectGroupData(clientID, objectType, dataType, ct.byref(handlesC), ct.byref(handlesP), ct.byref(intDataC), ct.byref(intDataP), ct.byref(floatDataC), ct.byref(floatDataP), ct.byref(stringDataC), ct.byref(stringDataP), operationMode)
+
+    if ret == 0:
+        n = handlesC.value
+        if n > 0:
+            handles = np.ctypeslib.as_array(handlesP, shape=(n,)).astype(np.int32)
+        if intDataC.value > 0:
+            intData = np.ctypeslib.as_array(intDataP, shape=(intDataC.value,)).astype(np.int32)
+        if floatDataC.value > 0:
+            floatData = np.ctypeslib.as_array(floatDataP, shape=(floatDataC.value,)).copy()
+        if stringDataC.value > 0:
+            # the length of the block is not returned: it ends at the null character of its last string, found by
+            # walking the strings (strlen in C), then the block is read at once and split at the null characters
+            start = end = ct.cast(stringDataP, ct.c_void_p).value
+            for i in range(stringDataC.value):
+                end += len(ct.string_at(end)) + 1
+            stringData = ct.string_at(start, end - start - 1).split(b'\0')
+            if sys.version_info[0] == 3:
+                stringData = [str(a,'utf-8') for a in stringData]
+
+    return ret, handles, intData, floatData, stringData
+
 def simxCallScriptFunction(clientID, scriptDescription, options, functionName, inputInts, inputFloats, inputStrings, inputBuffer, operationMode):
     '''
     Please have a look at the function description/documentation in the V-REP user manual
@@ -1347,16 +1531,16 @@ def simxCallScriptFunction(clientID, scriptDescription, options, functionName, i
         if type(functionName) is str:
             functionName=functionName.encode('utf-8')
         if type(inputBuffer) is bytearray:
-            inputBufferV  = (ct.c_ubyte*len(inputBuffer))(*inputBuffer)
+            inputBufferV  = (ct.c_ubyte*len(inputBuffer)).from_buffer_copy(inputBuffer)
         if type(inputBuffer) is str:
             inputBuffer=inputBuffer.encode('utf-8')
-            inputBufferV  = (ct.c_ubyte*len(inputBuffer))(*inputBuffer)
+            inputBufferV  = (ct.c_ubyte*len(inputBuffer)).from_buffer_copy(inputBuffer)
     else:
         if type(inputBuffer) is bytearray:
-            inputBufferV = (ct.c_ubyte*len(inputBuffer))(*inputBuffer)
+            inputBufferV = (ct.c_ubyte*len(inputBuffer)).from_buffer_copy(inputBuffer)
         if type(inputBuffer) is str:
             inputBuffer=bytearray(inputBuffer)
-            inputBufferV = (ct.c_ubyte*len(inputBuffer))(*inputBuffer)
+            inputBufferV = (ct.c_ubyte*len(inputBuffer)).from_buffer_copy(inputBuffer)
     inputBufferV=ct.cast(inputBufferV,ct.POINTER(ct.c_ubyte)) # IronPython needs this
 
     c_inInts  = (ct.c_int*len(inputInts))(*inputInts)
@@ -1434,49 +1618,80 @@ def simxGetObjectVelocity(clientID, objectHandle, operationMode):
 def simxPackInts(intList):
     '''
     Please have a look at the function description/documentation in the V-REP user manual
+    Lists and tuples are packed with a single struct call, array.array and numpy arrays with a single numpy call.
     '''
-    
+
+    if isinstance(intList, (list, tuple)):
+        s=struct.pack('<%di' % len(intList), *intList)
+    else:
+        s=np.asarray(intList, dtype='<i4').tobytes()
     if sys.version_info[0] == 3:
-        s=bytes()
-        for i in range(len(intList)):
-            s=s+struct.pack('<i',intList[i])
         s=bytearray(s)
-    else:
-        s=''
-        for i in range(len(intList)):
-            s+=struct.pack('<i',intList[i])
     return s
 
 def simxUnpackInts(intsPackedInString):
     '''
     Please have a look at the function description/documentation in the V-REP user manual
     '''
-    b=[]
-    for i in range(int(len(intsPackedInString)/4)):
-        b.append(struct.unpack('<i',intsPackedInString[4*i:4*(i+1)])[0])
-    return b
+    n=int(len(intsPackedInString)/4)
+    return list(struct.unpack('<%di' % n, bytes(intsPackedInString[:4*n])))
+
+def simxUnpackIntsArray(intsPackedInString):
+    '''
+    Same as simxUnpackInts, but returns an int32 numpy array sharing the memory of the packed data (no copy).
+    The array is read-only if the packed data is immutable (bytes, str).
+    '''
+    return np.frombuffer(intsPackedInString, dtype='<i4', count=int(len(intsPackedInString)/4))
 
 def simxPackFloats(floatList):
     '''
     Please have a look at the function description/documentation in the V-REP user manual
+    Lists and tuples are packed with a single struct call, array.array and numpy arrays with a single numpy call.
     '''
 
+    if isinstance(floatList, (list, tuple)):
+        s=struct.pack('<%df' % len(floatList), *floatList)
+    else:
+        s=np.asarray(floatList, dtype='<f4').tobytes()
     if sys.version_info[0] == 3:
-        s=bytes()
-        for i in range(len(floatList)):
-            s=s+struct.pack('<f',floatList[i])
         s=bytearray(s)
-    else:
-        s=''
-        for i in range(len(floatList)):
-            s+=struct.pack('<f',floatList[i])
     return s
 
 def simxUnpackFloats(floatsPackedInString):
     '''
     Please have a look at the function description/documentation in the V-REP user manual
     '''
-    b=[]
-    for i in range(int(len(floatsPackedInString)/4)):
-        b.append(struct.unpack('<f',floatsPackedInString[4*i:4*(i+1)])[0])
-    return b
+    n=int(len(floatsPackedInString)/4)
+    return list(struct.unpack('<%df' % n, bytes(floatsPackedInString[:4*n])))
+
+def simxUnpackFloatsArray(floatsPackedInString):
+    '''
+    Same as simxUnpackFloats, but returns a float32 numpy array sharing the memory of the packed data (no copy).
+    The array is read-only if the packed data is immutable (bytes, str).
+    '''
+    return np.frombuffer(floatsPackedInString, dtype='<f4', count=int(len(floatsPackedInString)/4))
+
+#backend selection
+#useBackend('fake') replaces the API functions implemented by vrepfake (in-process simulator, see "vrepfake.py") with
+#those, for runs without V-REP. useBackend('remote') restores the remoteApi ones. The environment variable
+#VREP_BACKEND=fake selects the fake backend on import.
+remoteFunctions = {}
+
+def useBackend(name):
+    '''
+    Selects the backend of the API functions: 'remote' (remoteApi library) or 'fake' (vrepfake)
+    '''
+    import vrepfake
+    if not remoteFunctions:
+        for function in vrepfake.__all__:
+            remoteFunctions[function] = globals()[function]
+    if name == 'fake':
+        for function in vrepfake.__all__:
+            globals()[function] = getattr(vrepfake, function)
+    elif name == 'remote':
+        globals().update(remoteFunctions)
+    else:
+        raise ValueError('Unknown backend %s' % name)
+
+if os.environ.get('VREP_BACKEND') == 'fake':
+    useBackend('fake')
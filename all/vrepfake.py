@@ -0,0 +1,654 @@
+#!/usr/bin/env python
+
+# In-process stand-in for the part of the V-REP remote API used by this project, for runs without simulator (CI,
+# offline benchmarks). The functions have the signatures and return values of the ones in vrep.py. They are used
+# instead of the remoteApi ones after vrep.useBackend('fake') or with the environment variable VREP_BACKEND=fake.
+#
+# Every port connected to with simxStart is backed by a FakeSimulator: a scene with differential drive cars (numpy
+# kinematic model) seen from above by a vision sensor (synthetic renderer).
+
+import math
+import time
+
+import numpy as np
+
+from vrepConst import *
+
+__all__ = ['simxStart', 'simxFinish', 'simxGetObjectHandle', 'simxStartSimulation', 'simxStopSimulation',
+           'simxGetVisionSensorImage', 'simxGetVisionSensorImageArray', 'simxGetVisionSensorDepthBuffer',
+           'simxGetVisionSensorDepthBufferArray', 'simxGetObjectFloatParameter', 'simxSetJointTargetVelocity',
+           'simxGetObjectPosition', 'simxGetObjectOrientation', 'simxGetJointPosition', 'simxGetObjectVelocity',
+           'simxPauseCommunication', 'simxSynchronous', 'simxSynchronousTrigger', 'simxGetPingTime',
+           'simxGetLastCmdTime', 'simxGetFloatingParameter', 'simxGetInMessageInfo', 'simxGetOutMessageInfo',
+           'simxGetObjectGroupData', 'simxGetObjectGroupDataArray', 'simxSetVisionSensorImage',
+           'simxGetObjectIntParameter', 'simxReadVisionSensor', 'simxReadVisionSensorArray']
+
+
+class FakeSimulator(object):
+    '''
+
+    This class simulates a scene with differential drive cars (Pioneer p3dx like) on a floor, seen from above by a
+    perspective vision sensor looking down at the origin.
+
+    Cars are named like in vrep: the first one 'Pioneer_p3dx' with joints 'Pioneer_p3dx_leftMotor' and
+    'Pioneer_p3dx_rightMotor', the next ones with the suffixes '#0', '#1'.. The poses of all cars are stored in one
+    array and integrated together. The image x axis is the world x axis and, as in vrep, the first image row is the
+    bottom of the image (smallest world y).
+
+    With realtime=True the simulation advances with the wall clock while it is running, as vrep does. With
+    realtime=False it advances one time step whenever an image is read, so a closed loop runs at full speed with a
+    fresh frame on every read. In synchronous mode (simxSynchronous) it only advances on simxSynchronousTrigger.
+
+    '''
+
+    wheelradius = 0.0975 # m
+    axle = 0.331 # distance between the wheels in m
+    carsize = (0.455, 0.381, 0.2) # length, width, height in m
+    carcolour = (200, 30, 30) # rgb
+    floorcolour = (110, 110, 110) # rgb
+
+    def __init__(self, cars=1, carname='Pioneer_p3dx', visionsensor_name='Vision_sensor', resolution=(640, 480),
+                 perspective_angle=60.0, height=4.33, dt=0.05, realtime=True):
+        self.dt = dt # simulation time step in s
+        self.realtime = realtime
+        self.resolution = tuple(resolution) # (w, h) of the vision sensor
+        self.perspective_angle = math.radians(perspective_angle) # applies to the larger image dimension
+        self.height = height # height of the vision sensor above the floor in m
+        self.near = 0.01 # near clipping plane in m
+        self.far = 10.0 # far clipping plane in m
+        # pixels per meter on the floor
+        self.ppm = max(self.resolution) / (2.0 * self.height * math.tan(self.perspective_angle / 2.0))
+
+        self.running = False
+        self.synchronous = False # lockstep mode, the simulation advances one step per trigger only
+        self.simtime = 0.0 # simulation time in s
+        self.steps = 0 # number of simulation steps since start
+        self.lastwall = None # wall clock time up to which the simulation was advanced
+
+        # objects: handle -> (kind, index), names: name -> handle
+        self.objects = {}
+        self.names = {}
+        self.visionhandle = self.add_object(visionsensor_name, 'visionsensor', 0)
+        self.initialposes = np.zeros((cars, 3)) # x, y, theta of every car
+        self.initialposes[:, 0] = (np.arange(cars) - (cars - 1) / 2.0) * 2 * self.carsize[0]
+        for i in range(cars):
+            suffix = '' if i == 0 else '#%d' % (i - 1)
+            self.add_object(carname + suffix, 'car', i)
+            self.add_object(carname + '_leftMotor' + suffix, 'leftjoint', i)
+            self.add_object(carname + '_rightMotor' + suffix, 'rightjoint', i)
+        self.poses = self.initialposes.copy()
+        self.wheels = np.zeros((cars, 2)) # target velocities of left and right wheel in rad/s
+        self.wheelangles = np.zeros((cars, 2)) # joint positions of left and right wheel in rad
+
+        # pixel centres on the floor (world co-ordinates), floor image and rendering buffers
+        w, h = self.resolution
+        self.pixelx = ((np.arange(w) + 0.5) - w / 2.0) / self.ppm
+        self.pixely = ((np.arange(h) + 0.5) - h / 2.0) / self.ppm
+        self.background = np.empty((h, w, 3), dtype=np.uint8)
+        self.background[...] = self.floorcolour
+        self.frame = np.empty((h, w, 3), dtype=np.uint8)
+        self.gray = np.empty((h, w, 1), dtype=np.uint8)
+        self.luminancebuffer = np.empty((h, w)) # grey image of injected colour images, as float
+        self.depth = np.empty((h, w), dtype=np.float32)
+        self.renderedstep = None # simulation step of the content of frame, gray and depth
+        self.injected = False # True when frame and gray hold an image set with simxSetVisionSensorImage
+
+        self.streams = {} # (command, handle) -> simulation step at which streaming was requested
+
+    def add_object(self, name, kind, index):
+        handle = len(self.objects) + 1
+        self.objects[handle] = (kind, index)
+        self.names[name] = handle
+        return handle
+
+    def start(self):
+        self.running = True
+        self.lastwall = time.time()
+
+    def stop(self):
+        # as vrep, restore the scene as it was before the simulation
+        self.running = False
+        self.synchronous = False # lockstep mode, the simulation advances one step per trigger only
+        self.simtime = 0.0
+        self.steps = 0
+        self.poses[...] = self.initialposes
+        self.wheels[...] = 0.0
+        self.wheelangles[...] = 0.0
+        self.streams = {}
+        self.renderedstep = None
+        self.injected = False
+
+    def advance(self):
+        '''
+
+        Advances the simulation up to the wall clock (realtime mode), called on every API call
+
+        '''
+        if self.running and self.realtime and not self.synchronous:
+            now = time.time()
+            n = int((now - self.lastwall) / self.dt)
+            if n > 0:
+                self.step(n)
+                self.lastwall += n * self.dt
+
+    def step(self, n=1):
+        '''
+
+        Integrates the differential drive kinematics of all cars over n time steps (exact arcs)
+
+        '''
+        r = self.wheelradius
+        v = r * (self.wheels[:, 0] + self.wheels[:, 1]) / 2.0
+        w = r * (self.wheels[:, 1] - self.wheels[:, 0]) / self.axle
+        t = n * self.dt
+        theta = self.poses[:, 2]
+        straight = np.abs(w) < 1e-9
+        wsafe = np.where(straight, 1.0, w)
+        dx = np.where(straight, v * t * np.cos(theta), v / wsafe * (np.sin(theta + w * t) - np.sin(theta)))
+        dy = np.where(straight, v * t * np.sin(theta), -v / wsafe * (np.cos(theta + w * t) - np.cos(theta)))
+        self.poses[:, 0] += dx
+        self.poses[:, 1] += dy
+        self.poses[:, 2] = np.arctan2(np.sin(theta + w * t), np.cos(theta + w * t))
+        self.wheelangles += self.wheels * t
+        self.steps += n
+        self.simtime += t
+
+    def render(self):
+        '''
+
+        Renders the rgb image, grey image and depth buffer of the vision sensor for the current simulation step
+
+        '''
+        if self.renderedstep == self.steps or self.injected:
+            return
+        np.copyto(self.frame, self.background)
+        floordepth = (self.height - self.near) / (self.far - self.near)
+        cardepth = (self.height - self.carsize[2] - self.near) / (self.far - self.near)
+        self.depth[...] = floordepth
+        self.gray[...] = self.luminance(self.floorcolour)
+        cargray = self.luminance(self.carcolour)
+        length, width = self.carsize[0], self.carsize[1]
+        radius = math.hypot(length, width) / 2.0
+        for x, y, theta in self.poses:
+            # pixels of the bounding box of the car, then mask of the pixels inside the car rectangle
+            c0 = np.searchsorted(self.pixelx, x - radius)
+            c1 = np.searchsorted(self.pixelx, x + radius)
+            r0 = np.searchsorted(self.pixely, y - radius)
+            r1 = np.searchsorted(self.pixely, y + radius)
+            if c0 >= c1 or r0 >= r1:
+                continue
+            dx = self.pixelx[np.newaxis, c0:c1] - x
+            dy = self.pixely[r0:r1, np.newaxis] - y
+            u = dx * math.cos(theta) + dy * math.sin(theta)
+            v = -dx * math.sin(theta) + dy * math.cos(theta)
+            inside = (np.abs(u) <= length / 2.0) & (np.abs(v) <= width / 2.0)
+            self.frame[r0:r1, c0:c1][inside] = self.carcolour
+            self.depth[r0:r1, c0:c1][inside] = cardepth
+            self.gray[r0:r1, c0:c1][inside] = cargray
+        self.renderedstep = self.steps
+
+    def inject(self, image, grey):
+        '''
+
+        Replaces the image of the vision sensor by an image set from the client, as for a passive vision sensor
+        in vrep: it is returned by the image reads from now on, instead of the rendered scene
+
+        '''
+        if grey:
+            self.gray.ravel()[...] = image
+            self.frame[...] = self.gray
+        else:
+            self.frame.ravel()[...] = image
+            # same weights as luminance()
+            np.dot(self.frame, [0.299, 0.587, 0.114], out=self.luminancebuffer)
+            np.rint(self.luminancebuffer, out=self.luminancebuffer)
+            self.gray[:, :, 0] = self.luminancebuffer
+        self.injected = True
+
+    def detect_blobs(self):
+        '''
+
+        Emulates the auxiliary values of a vision sensor with a blob detection filter: packet 0 holds the image
+        statistics every vision sensor returns (minimum, maximum and average of intensity, red, green, blue and depth,
+        in [0, 1]), packet 1 the blob count, the number of values per blob (6) and for every car in view: relative
+        size, orientation in rad, relative position x and y (origin at the bottom left of the image), relative width
+        and height. Blobs are computed from the poses of the cars, an injected image has none.
+        :return: detection state, list of float32 arrays
+
+        '''
+        self.render()
+        # statistics over every 4th pixel of every 4th row, close enough for an emulation
+        channels = np.empty((5,) + self.depth[::4, ::4].shape, dtype=np.float32)
+        channels[0] = self.gray[::4, ::4, 0]
+        channels[1:4] = np.rollaxis(self.frame[::4, ::4], 2)
+        channels[:4] /= 255.0
+        channels[4] = self.depth[::4, ::4]
+        channels = channels.reshape(5, -1)
+        stats = np.concatenate((channels.min(axis=1), channels.max(axis=1), channels.mean(axis=1)))
+        w, h = self.resolution
+        blobs = np.zeros((0, 6), dtype=np.float32)
+        if not self.injected:
+            x = self.poses[:, 0] * self.ppm / w + 0.5
+            y = self.poses[:, 1] * self.ppm / h + 0.5
+            inview = (x >= 0) & (x < 1) & (y >= 0) & (y < 1)
+            n = np.count_nonzero(inview)
+            blobs = np.empty((n, 6), dtype=np.float32)
+            blobs[:, 0] = self.carsize[0] * self.carsize[1] * self.ppm ** 2 / (w * h)
+            # the orientation of a blob is that of its major axis, in (-pi/2, pi/2]
+            blobs[:, 1] = np.pi / 2 - (np.pi / 2 - self.poses[inview, 2]) % np.pi
+            blobs[:, 2] = x[inview]
+            blobs[:, 3] = y[inview]
+            blobs[:, 4] = self.carsize[0] * self.ppm / w
+            blobs[:, 5] = self.carsize[1] * self.ppm / h
+        packet = np.concatenate(([len(blobs), blobs.shape[1]], blobs.ravel())).astype(np.float32)
+        return len(blobs) > 0, [stats.astype(np.float32), packet]
+
+    @staticmethod
+    def luminance(colour):
+        return int(round(0.299 * colour[0] + 0.587 * colour[1] + 0.114 * colour[2]))
+
+    def reply(self, command, handle, operationMode):
+        '''
+
+        Emulates the operation modes for commands reading data. In streaming mode the first call only registers the
+        stream, its replies are in the buffer from the next simulation step on (or right away if the simulation is
+        not running). Blocking and oneshot reads always have a reply.
+        :return: return code of the command
+
+        '''
+        mode = operationMode & 0xff0000
+        key = (command, handle)
+        if mode == simx_opmode_streaming:
+            if key not in self.streams:
+                self.streams[key] = self.steps
+                return simx_return_novalue_flag
+        elif mode == simx_opmode_buffer:
+            if key not in self.streams:
+                return simx_return_novalue_flag
+        elif mode == simx_opmode_discontinue:
+            self.streams.pop(key, None)
+            return simx_return_novalue_flag
+        elif mode == simx_opmode_remove:
+            return simx_return_novalue_flag
+        else:
+            return simx_return_ok
+        if self.running and self.steps <= self.streams[key]:
+            return simx_return_novalue_flag
+        return simx_return_ok
+
+
+simulators = {} # port -> FakeSimulator, created with default settings on first connection if not added before
+clients = {} # clientID -> FakeSimulator
+paused = {} # clientID -> commands queued while communication is paused, applied together when it is resumed
+nextClientID = [0]
+
+
+def addSimulator(port, simulator):
+    '''
+
+    Sets the simulator which the clients connecting to port will be talking to
+
+    '''
+    simulators[port] = simulator
+
+
+def getSimulator(clientID):
+    '''
+
+    Returns the simulator of a connected client (None if not connected)
+
+    '''
+    sim = clients.get(clientID)
+    if sim is not None:
+        sim.advance()
+    return sim
+
+
+def _write_mode(operationMode):
+    # setters in oneshot mode do not wait for the reply, vrep then returns the novalue flag
+    if operationMode & 0xff0000 == simx_opmode_oneshot:
+        return simx_return_novalue_flag
+    return simx_return_ok
+
+
+def _send(clientID, operationMode, apply):
+    # applies a setter, or queues it if communication is paused. A blocking command cannot get its reply while
+    # communication is paused, vrep then times out
+    if clientID in paused:
+        if operationMode & 0xff0000 == simx_opmode_blocking:
+            return simx_return_timeout_flag
+        paused[clientID].append(apply)
+        return simx_return_novalue_flag
+    apply()
+    return _write_mode(operationMode)
+
+
+def simxStart(connectionAddress, connectionPort, waitUntilConnected, doNotReconnectOnceDisconnected, timeOutInMs, commThreadCycleInMs):
+    if connectionPort not in simulators:
+        simulators[connectionPort] = FakeSimulator()
+    clientID = nextClientID[0]
+    nextClientID[0] += 1
+    clients[clientID] = simulators[connectionPort]
+    return clientID
+
+
+def simxFinish(clientID):
+    if clientID == -1:
+        clients.clear()
+        paused.clear()
+    else:
+        clients.pop(clientID, None)
+        paused.pop(clientID, None)
+
+
+def simxGetObjectHandle(clientID, objectName, operationMode):
+    sim = getSimulator(clientID)
+    if sim is None:
+        return simx_return_initialize_error_flag, 0
+    if not isinstance(objectName, str):
+        objectName = objectName.decode('utf-8')
+    if objectName not in sim.names:
+        return simx_return_remote_error_flag, 0
+    return simx_return_ok, sim.names[objectName]
+
+
+def simxGetObjectGroupDataArray(clientID, objectType, dataType, operationMode):
+    empty = (np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.float32), [])
+    sim = getSimulator(clientID)
+    if sim is None:
+        return (simx_return_initialize_error_flag,) + empty
+    if objectType != sim_appobj_object_type or dataType != 0:
+        # only the names of all scene objects are supported
+        return (simx_return_remote_error_flag,) + empty
+    names = sorted(sim.names, key=lambda name: sim.names[name])
+    handles = np.array([sim.names[name] for name in names], dtype=np.int32)
+    return simx_return_ok, handles, empty[1], empty[2], names
+
+
+def simxGetObjectGroupData(clientID, objectType, dataType, operationMode):
+    ret, handles, intData, floatData, stringData = simxGetObjectGroupDataArray(clientID, objectType, dataType,
+                                                                               operationMode)
+    return ret, handles.tolist(), intData.ravel().tolist(), floatData.ravel().tolist(), stringData
+
+
+def simxStartSimulation(clientID, operationMode):
+    sim = getSimulator(clientID)
+    if sim is None:
+        return simx_return_initialize_error_flag
+    sim.start()
+    return _write_mode(operationMode)
+
+
+def simxStopSimulation(clientID, operationMode):
+    sim = getSimulator(clientID)
+    if sim is None:
+        return simx_return_initialize_error_flag
+    sim.stop()
+    return _write_mode(operationMode)
+
+
+def simxGetVisionSensorImageArray(clientID, sensorHandle, options, operationMode, copy=True, out=None):
+    sim = getSimulator(clientID)
+    if sim is None:
+        return simx_return_initialize_error_flag, [], None
+    if sim.objects.get(sensorHandle, (None,))[0] != 'visionsensor':
+        return simx_return_remote_error_flag, [], None
+    if not sim.realtime and not sim.synchronous and sim.running and operationMode & 0xff0000 != simx_opmode_streaming:
+        sim.step()
+    # grey and rgb images are different commands of the remote api, hence different streams
+    ret = sim.reply('image' if (options & 1) == 0 else 'image_bw', sensorHandle, operationMode)
+    if ret != simx_return_ok:
+        return ret, [], None
+    sim.render()
+    image = sim.gray if (options & 1) != 0 else sim.frame
+    if out is not None:
+        np.copyto(out, image)
+        image = out
+    elif copy:
+        image = image.copy()
+    return ret, list(sim.resolution), image
+
+
+def simxGetVisionSensorImage(clientID, sensorHandle, options, operationMode):
+    ret, reso, image = simxGetVisionSensorImageArray(clientID, sensorHandle, options, operationMode, copy=False)
+    if ret != simx_return_ok:
+        return ret, [], []
+    # the remoteApi returns signed bytes
+    return ret, reso, image.view(np.int8).ravel().tolist()
+
+
+def simxReadVisionSensorArray(clientID, sensorHandle, operationMode):
+    sim = getSimulator(clientID)
+    if sim is None:
+        return simx_return_initialize_error_flag, False, []
+    if sim.objects.get(sensorHandle, (None,))[0] != 'visionsensor':
+        return simx_return_remote_error_flag, False, []
+    if not sim.realtime and not sim.synchronous and sim.running and operationMode & 0xff0000 != simx_opmode_streaming:
+        sim.step()
+    ret = sim.reply('vision', sensorHandle, operationMode)
+    if ret != simx_return_ok:
+        return ret, False, []
+    detectionState, packets = sim.detect_blobs()
+    return ret, detectionState, packets
+
+
+def simxReadVisionSensor(clientID, sensorHandle, operationMode):
+    ret, detectionState, packets = simxReadVisionSensorArray(clientID, sensorHandle, operationMode)
+    return ret, detectionState, [packet.tolist() for packet in packets]
+
+
+def simxGetVisionSensorDepthBufferArray(clientID, sensorHandle, operationMode, copy=True, out=None):
+    sim = getSimulator(clientID)
+    if sim is None:
+        return simx_return_initialize_error_flag, [], None
+    if sim.objects.get(sensorHandle, (None,))[0] != 'visionsensor':
+        return simx_return_remote_error_flag, [], None
+    ret = sim.reply('depth', sensorHandle, operationMode)
+    if ret != simx_return_ok:
+        return ret, [], None
+    sim.render()
+    depth = sim.depth
+    if out is not None:
+        np.copyto(out, depth)
+        depth = out
+    elif copy:
+        depth = depth.copy()
+    return ret, list(sim.resolution), depth
+
+
+def simxGetVisionSensorDepthBuffer(clientID, sensorHandle, operationMode):
+    ret, reso, depth = simxGetVisionSensorDepthBufferArray(clientID, sensorHandle, operationMode, copy=False)
+    if ret != simx_return_ok:
+        return ret, [], []
+    return ret, reso, depth.ravel().tolist()
+
+
+def simxSetVisionSensorImage(clientID, sensorHandle, image, options, operationMode):
+    sim = getSimulator(clientID)
+    if sim is None:
+        return simx_return_initialize_error_flag
+    if sim.objects.get(sensorHandle, (None,))[0] != 'visionsensor':
+        return simx_return_remote_error_flag
+    grey = (options & 1) != 0
+    if isinstance(image, np.ndarray):
+        if image.dtype != np.uint8:
+            raise ValueError('image must be a uint8 array, got %s' % image.dtype)
+    elif isinstance(image, (bytes, bytearray)):
+        image = np.frombuffer(image, dtype=np.uint8)
+    else:
+        image = np.array(image, dtype=np.int8).view(np.uint8)
+    w, h = sim.resolution
+    if image.size != w * h * (1 if grey else 3):
+        return simx_return_remote_error_flag
+
+    def apply():
+        sim.inject(image.ravel().view(np.uint8), grey)
+    return _send(clientID, operationMode, apply)
+
+
+def simxGetObjectIntParameter(clientID, objectHandle, parameterID, operationMode):
+    sim = getSimulator(clientID)
+    if sim is None:
+        return simx_return_initialize_error_flag, 0
+    values = {}
+    if sim.objects.get(objectHandle, (None,))[0] == 'visionsensor':
+        values = {sim_visionintparam_resolution_x: sim.resolution[0],
+                  sim_visionintparam_resolution_y: sim.resolution[1]}
+    if parameterID not in values:
+        return simx_return_remote_error_flag, 0
+    return simx_return_ok, values[parameterID]
+
+
+def simxGetObjectFloatParameter(clientID, objectHandle, parameterID, operationMode):
+    sim = getSimulator(clientID)
+    if sim is None:
+        return simx_return_initialize_error_flag, 0.0
+    values = {}
+    if sim.objects.get(objectHandle, (None,))[0] == 'visionsensor':
+        values = {sim_visionfloatparam_perspective_angle: sim.perspective_angle,
+                  sim_visionfloatparam_near_clipping: sim.near,
+                  sim_visionfloatparam_far_clipping: sim.far}
+    if parameterID not in values:
+        return simx_return_remote_error_flag, 0.0
+    return simx_return_ok, values[parameterID]
+
+
+def simxSetJointTargetVelocity(clientID, jointHandle, targetVelocity, operationMode):
+    sim = getSimulator(clientID)
+    if sim is None:
+        return simx_return_initialize_error_flag
+    kind, index = sim.objects.get(jointHandle, (None, None))
+    if kind not in ('leftjoint', 'rightjoint'):
+        return simx_return_remote_error_flag
+    column = 0 if kind == 'leftjoint' else 1
+
+    def apply():
+        sim.wheels[index, column] = targetVelocity
+    return _send(clientID, operationMode, apply)
+
+
+def simxPauseCommunication(clientID, enable):
+    if clientID not in clients:
+        return simx_return_initialize_error_flag
+    if enable:
+        paused.setdefault(clientID, [])
+    else:
+        # the queued commands reach the simulator in one packet, i.e. within the same simulation step
+        for apply in paused.pop(clientID, []):
+            apply()
+    return simx_return_ok
+
+
+def simxSynchronous(clientID, enable):
+    sim = getSimulator(clientID)
+    if sim is None:
+        return simx_return_initialize_error_flag
+    sim.synchronous = bool(enable)
+    sim.lastwall = time.time()
+    return simx_return_ok
+
+
+def simxSynchronousTrigger(clientID):
+    sim = getSimulator(clientID)
+    if sim is None:
+        return simx_return_initialize_error_flag
+    if sim.running and sim.synchronous:
+        sim.step()
+    return simx_return_ok
+
+
+def simxGetPingTime(clientID):
+    if getSimulator(clientID) is None:
+        return simx_return_initialize_error_flag, 0
+    return simx_return_ok, 0
+
+
+def simxGetLastCmdTime(clientID):
+    sim = getSimulator(clientID)
+    if sim is None:
+        return 0
+    # simulation time in ms of the last received reply
+    return int(round(sim.simtime * 1000))
+
+
+def simxGetInMessageInfo(clientID, infoType):
+    # no messages are exchanged with the fake simulator
+    return -1, 0
+
+
+def simxGetOutMessageInfo(clientID, infoType):
+    return -1, 0
+
+
+def simxGetFloatingParameter(clientID, paramIdentifier, operationMode):
+    sim = getSimulator(clientID)
+    if sim is None:
+        return simx_return_initialize_error_flag, 0.0
+    if paramIdentifier != sim_floatparam_simulation_time_step:
+        return simx_return_remote_error_flag, 0.0
+    return simx_return_ok, sim.dt
+
+
+def simxGetObjectPosition(clientID, objectHandle, relativeToObjectHandle, operationMode):
+    sim = getSimulator(clientID)
+    if sim is None:
+        return simx_return_initialize_error_flag, [0.0, 0.0, 0.0]
+    if objectHandle not in sim.objects or relativeToObjectHandle != -1:
+        # only absolute positions are supported
+        return simx_return_remote_error_flag, [0.0, 0.0, 0.0]
+    ret = sim.reply('position', objectHandle, operationMode)
+    kind, index = sim.objects[objectHandle]
+    if kind == 'visionsensor':
+        return ret, [0.0, 0.0, sim.height]
+    x, y, theta = [float(p) for p in sim.poses[index]]
+    if kind == 'car':
+        return ret, [x, y, sim.carsize[2] / 2.0]
+    # wheel joints, on the axle
+    side = 1.0 if kind == 'leftjoint' else -1.0
+    return ret, [x - side * sim.axle / 2.0 * math.sin(theta), y + side * sim.axle / 2.0 * math.cos(theta),
+                 sim.wheelradius]
+
+
+def simxGetObjectOrientation(clientID, objectHandle, relativeToObjectHandle, operationMode):
+    sim = getSimulator(clientID)
+    if sim is None:
+        return simx_return_initialize_error_flag, [0.0, 0.0, 0.0]
+    if objectHandle not in sim.objects or relativeToObjectHandle != -1:
+        # only absolute orientations are supported
+        return simx_return_remote_error_flag, [0.0, 0.0, 0.0]
+    ret = sim.reply('orientation', objectHandle, operationMode)
+    kind, index = sim.objects[objectHandle]
+    if kind == 'visionsensor':
+        # looking down, image x axis along world x
+        return ret, [math.pi, 0.0, 0.0]
+    return ret, [0.0, 0.0, float(sim.poses[index, 2])]
+
+
+def simxGetJointPosition(clientID, jointHandle, operationMode):
+    sim = getSimulator(clientID)
+    if sim is None:
+        return simx_return_initialize_error_flag, 0.0
+    kind, index = sim.objects.get(jointHandle, (None, None))
+    if kind not in ('leftjoint', 'rightjoint'):
+        return simx_return_remote_error_flag, 0.0
+    ret = sim.reply('jointposition', jointHandle, operationMode)
+    angle = sim.wheelangles[index, 0 if kind == 'leftjoint' else 1]
+    # revolute joints without limits report angles in [-pi, pi]
+    return ret, float(math.atan2(math.sin(angle), math.cos(angle)))
+
+
+def simxGetObjectVelocity(clientID, objectHandle, operationMode):
+    sim = getSimulator(clientID)
+    if sim is None:
+        return simx_return_initialize_error_flag, [0.0, 0.0, 0.0], [0.0, 0.0, 0.0]
+    if objectHandle not in sim.objects:
+        return simx_return_remote_error_flag, [0.0, 0.0, 0.0], [0.0, 0.0, 0.0]
+    ret = sim.reply('velocity', objectHandle, operationMode)
+    kind, index = sim.objects[objectHandle]
+    if kind == 'visionsensor' or not sim.running:
+        return ret, [0.0, 0.0, 0.0], [0.0, 0.0, 0.0]
+    left, right = sim.wheels[index]
+    v = sim.wheelradius * (left + right) / 2.0
+    w = sim.wheelradius * (right - left) / sim.axle
+    theta = float(sim.poses[index, 2])
+    return ret, [v * math.cos(theta), v * math.sin(theta), 0.0], [0.0, 0.0, w]